@@ -0,0 +1,52 @@
+import random
+import time
+import argparse
+
+from deap import base, creator, tools
+from nsga_vrp.selection import selNSGA2Fast
+
+
+def makePopulation(size):
+    # Fitness values spread like (vehicles, cost) of a large instance
+    population = []
+    for index in range(size):
+        individual = creator.Individual([index])
+        individual.fitness.values = (random.randint(5, 60), random.uniform(1000, 50000))
+        population.append(individual)
+    return population
+
+
+def timeSelect(select, population, repeat):
+    # Best time of selecting half of the population over a few runs
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        select(population, len(population) // 2)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[200, 800, 2000, 8000], required=False,
+                        help="Number of individuals selected from, which is parents plus offspring")
+    parser.add_argument('--repeat', type=int, default=3, required=False,
+                        help="Number of runs for each size, best one is reported")
+    parser.add_argument('--seed', type=int, default=0, required=False,
+                        help="Random seed of the fitness values")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    creator.create('FitnessMin', base.Fitness, weights=(-1.0, -1.0))
+    creator.create('Individual', list, fitness=creator.FitnessMin)
+
+    print(f"{'size':>8} {'deap (s)':>12} {'fast (s)':>12} {'speedup':>10}")
+    for size in args.sizes:
+        population = makePopulation(size)
+        deap_time = timeSelect(tools.selNSGA2, population, args.repeat)
+        fast_time = timeSelect(selNSGA2Fast, population, args.repeat)
+        print(f"{size:>8} {deap_time:>12.4f} {fast_time:>12.4f} {deap_time / fast_time:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,186 @@
+import sys
+import json
+import time
+import random
+import argparse
+import warnings
+import tracemalloc
+import numpy
+
+from deap import base, creator, tools
+from nsga_vrp.generator import generateInstance
+from nsga_vrp.selection import selNSGA2Fast
+from nsga_vrp.NSGA2_vrp import routeToSubroute, getRouteCost, eval_population_fitness, cxOrderedVrp, \
+    mutationShuffle, nsgaAlgo
+
+
+# Hot paths timed by the suite. The ones working on one individual or pair are timed on a
+#   sample of individuals, the rest on the whole population of every size
+CASES = ('routeToSubroute', 'getRouteCost', 'evalPopulation', 'cxOrderedVrp', 'mutationShuffle',
+         'selNSGA2', 'selNSGA2Fast', 'generation')
+INDIVIDUAL_CASES = ('routeToSubroute', 'getRouteCost', 'cxOrderedVrp', 'mutationShuffle')
+
+# Instances with more customers than this are benchmarked without the distance matrix
+MATRIX_LIMIT = 1000
+
+
+def randomPopulation(num_customers, pop_size, instance=None):
+    # Random routes as individuals, with their fitness when the instance is given
+    population = [creator.Individual(random.sample(range(1, num_customers + 1), num_customers))
+                  for _ in range(pop_size)]
+    if instance is not None:
+        for ind, fit in zip(population, eval_population_fitness(population, instance).tolist()):
+            ind.fitness.values = fit
+    return population
+
+
+def makeCase(case, instance, pop_size, sample):
+    """
+    Inputs: case - one of CASES
+            instance - VrpInstance to run it on
+            pop_size - population size, ignored by the individual cases
+            sample - number of individuals the individual cases go through
+    Outputs: Tuple of (function running the case once, operations done by one run)
+    """
+    num_customers = instance.num_customers
+    if case in INDIVIDUAL_CASES:
+        population = randomPopulation(num_customers, sample)
+        if case == 'routeToSubroute':
+            return lambda: [routeToSubroute(ind, instance) for ind in population], sample
+        if case == 'getRouteCost':
+            return lambda: [getRouteCost(ind, instance) for ind in population], sample
+        if case == 'cxOrderedVrp':
+            pairs = list(zip(population[::2], population[1::2]))
+            return lambda: [cxOrderedVrp(ind1, ind2) for ind1, ind2 in pairs], len(pairs)
+        return lambda: [mutationShuffle(ind, 0.02) for ind in population], sample
+
+    if case == 'evalPopulation':
+        routes = numpy.array(randomPopulation(num_customers, pop_size))
+        return lambda: eval_population_fitness(routes, instance), pop_size
+    if case in ('selNSGA2', 'selNSGA2Fast'):
+        # Parents and offspring together, half of them selected
+        population = randomPopulation(num_customers, 2 * pop_size, instance)
+        select = tools.selNSGA2 if case == 'selNSGA2' else selNSGA2Fast
+        return lambda: select(population, pop_size), 2 * pop_size
+
+    # One generation of the default algorithm, population evaluated beforehand
+    algo = nsgaAlgo(instance, pop_size=pop_size, num_gen=1, verbosity=0)
+    algo.generatingPopFitness()
+    return lambda: algo.runGeneration(algo.generation), 1
+
+
+def measure(run, operations, min_time):
+    """
+    Inputs: run - function running the case once
+            operations - operations done by one run
+            min_time - seconds the case is repeated for, at least one run is made
+    Outputs: Dictionary of operations per second, seconds per run and peak traced memory
+    """
+    runs = 0
+    start = time.perf_counter()
+    while True:
+        run()
+        runs += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+
+    # Memory is traced in a run of its own, tracing slows the run down
+    tracemalloc.start()
+    run()
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {'ops_per_sec': operations * runs / elapsed, 'seconds_per_run': elapsed / runs,
+            'peak_memory_mb': peak_memory / 2 ** 20}
+
+
+def resultKey(result):
+    return result['case'], result['customers'], result['pop_size']
+
+
+def compareBaseline(results, baseline, tolerance):
+    """
+    Inputs: results - list of result dictionaries of this run
+            baseline - list of result dictionaries of the stored run
+            tolerance - fraction of the baseline speed below which a case is a regression
+    Outputs: List of (result, baseline ops per second) of the regressed cases, after
+             printing the speed of every case relative to the baseline
+    """
+    baseline_speeds = {resultKey(result): result['ops_per_sec'] for result in baseline}
+    regressions = []
+    print(f"{'case':>16} {'customers':>10} {'pop':>6} {'ops/sec':>12} {'baseline':>12} {'ratio':>7}")
+    for result in results:
+        baseline_speed = baseline_speeds.get(resultKey(result))
+        if baseline_speed is None:
+            continue
+        ratio = result['ops_per_sec'] / baseline_speed
+        flag = ' REGRESSION' if ratio < tolerance else ''
+        print(f"{result['case']:>16} {result['customers']:>10} {result['pop_size']:>6} "
+              f"{result['ops_per_sec']:>12.1f} {baseline_speed:>12.1f} {ratio:>7.2f}{flag}")
+        if ratio < tolerance:
+            regressions.append((result, baseline_speed))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--customers', type=int, nargs='+', default=[25, 100, 1000, 5000], required=False,
+                        help="Number of customers of the synthetic instances")
+    parser.add_argument('--popSizes', type=int, nargs='+', default=[100, 400, 1000, 4000], required=False,
+                        help="Population sizes of the population cases")
+    parser.add_argument('--cases', type=str, nargs='+', default=list(CASES), required=False, choices=CASES,
+                        help="Hot paths to benchmark")
+    parser.add_argument('--sample', type=int, default=200, required=False,
+                        help="Number of individuals the individual cases go through in one run")
+    parser.add_argument('--minTime', type=float, default=0.5, required=False,
+                        help="Seconds every case is repeated for")
+    parser.add_argument('--seed', type=int, default=0, required=False,
+                        help="Random seed of the instances and populations")
+    parser.add_argument('--output', type=str, default=None, required=False,
+                        help="Json file the results are written to")
+    parser.add_argument('--baseline', type=str, default=None, required=False,
+                        help="Json file of an earlier run to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.75, required=False,
+                        help="Fraction of the baseline speed below which a case counts as regressed")
+    args = parser.parse_args()
+
+    # Every nsgaAlgo of the generation case creates the deap classes again
+    warnings.filterwarnings('ignore', category=RuntimeWarning, module='deap.creator')
+    creator.create('FitnessMin', base.Fitness, weights=(-1.0, -1.0))
+    creator.create('Individual', list, fitness=creator.FitnessMin)
+
+    results = []
+    print(f"{'case':>16} {'customers':>10} {'pop':>6} {'ops/sec':>12} {'s/run':>10} {'peak MB':>9}")
+    for num_customers in args.customers:
+        instance = generateInstance(num_customers, seed=args.seed, matrix=num_customers <= MATRIX_LIMIT)
+        for case in args.cases:
+            # Individual cases do not depend on the population size
+            pop_sizes = [0] if case in INDIVIDUAL_CASES else args.popSizes
+            for pop_size in pop_sizes:
+                random.seed(args.seed)
+                run, operations = makeCase(case, instance, pop_size, args.sample)
+                result = {'case': case, 'customers': num_customers, 'pop_size': pop_size,
+                          **measure(run, operations, args.minTime)}
+                results.append(result)
+                print(f"{case:>16} {num_customers:>10} {pop_size:>6} {result['ops_per_sec']:>12.1f} "
+                      f"{result['seconds_per_run']:>10.4f} {result['peak_memory_mb']:>9.1f}")
+                # Creator classes are put back, nsgaAlgo may have replaced them
+                creator.create('FitnessMin', base.Fitness, weights=(-1.0, -1.0))
+                creator.create('Individual', list, fitness=creator.FitnessMin)
+
+    if args.output:
+        with open(args.output, 'w') as file_object:
+            json.dump({'python': sys.version.split()[0], 'numpy': numpy.__version__, 'results': results},
+                      file_object, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file_object:
+            baseline = json.load(file_object)['results']
+        regressions = compareBaseline(results, baseline, args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} cases slower than {args.tolerance} of the baseline")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+from nsga_vrp.generator import LAYOUTS, DEPOTS, DEMANDS, generateInstance
+from nsga_vrp.utils import writeInstance
+import argparse
+import os
+import numpy
+
+def main():
+
+    # Parsing arguments
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--customers', type=int, default=100, required=False,
+                        help="Number of customers")
+    parser.add_argument('--layout', type=str, default="random", required=False, choices=LAYOUTS,
+                        help="Customers spread uniformly, gathered in clusters, or half of them each way")
+    parser.add_argument('--depot', type=str, default="center", required=False, choices=DEPOTS,
+                        help="Depot in the centre, at the corner or anywhere on the grid")
+    parser.add_argument('--demand', type=str, default="uniform", required=False, choices=DEMANDS,
+                        help="Distribution of the customer demands")
+    parser.add_argument('--tightness', type=float, default=0.9, required=False,
+                        help="Total demand over the capacity of the whole fleet, in (0, 1]")
+    parser.add_argument('--routeSize', type=int, default=10, required=False,
+                        help="Average number of customers served by a vehicle")
+    parser.add_argument('--clusters', type=int, default=None, required=False,
+                        help="Number of cluster centres, about one per 100 customers if not given")
+    parser.add_argument('--gridSize', type=float, default=1000, required=False,
+                        help="Side of the square the places are on")
+    parser.add_argument('--serviceTime', type=float, default=0, required=False,
+                        help="Service time of every customer")
+    parser.add_argument('--seed', type=int, default=None, required=False,
+                        help="Random seed, same seed gives the same instance")
+    parser.add_argument('--rounding', type=str, default=None, required=False, choices=["solomon", "tsplib"],
+                        help="Rounding of distances, Solomon one decimal or TSPLIB nearest integer")
+    parser.add_argument('--matrix', action='store_true',
+                        help="Write the distance matrix, or else distances are computed from coordinates")
+    parser.add_argument('--float32', action='store_true',
+                        help="Compute distances as float32 instead of float64")
+    parser.add_argument('--binary', action='store_true',
+                        help="Write metadata json with binary arrays and memory mappable distance matrix")
+    parser.add_argument('--indent', type=int, default=None, required=False,
+                        help="Indent of the json file, written compact if not given")
+    parser.add_argument('--output', type=str, default=None, required=False,
+                        help="Json file to write, data/json/<instance name>.json if not given")
+
+    args = parser.parse_args()
+
+    instance = generateInstance(args.customers,
+                                layout=args.layout,
+                                depot=args.depot,
+                                demand=args.demand,
+                                tightness=args.tightness,
+                                route_size=args.routeSize,
+                                num_clusters=args.clusters,
+                                grid_size=args.gridSize,
+                                service_time=args.serviceTime,
+                                rounding=args.rounding,
+                                matrix=args.matrix,
+                                dtype=numpy.float32 if args.float32 else numpy.float64,
+                                seed=args.seed)
+    json_file = args.output or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'json',
+                                            f"{instance.instance_name}.json")
+    writeInstance(instance, json_file, indent=args.indent, binary=args.binary)
+    print(f'Write {instance.num_customers} customers to file: {json_file}')
+
+if __name__ == "__main__":
+    main()
@@ -6,11 +6,26 @@ import numpy
 import fnmatch
 import csv
 import array
+import time
 
 from csv import DictWriter
 from json import load, dump
 from deap import base, creator, tools, algorithms, benchmarks
 from deap.benchmarks.tools import diversity, convergence, hypervolume
+from nsga_vrp.instance import VrpInstance, compileInstance, requireInstance, loadBinaryInstance, BINARY_FORMAT
+from nsga_vrp.parallel import EvaluationBackend
+from nsga_vrp.cache import FitnessCache, routeKey
+from nsga_vrp.delta import splitState, swapDeltaState, stateFitness
+from nsga_vrp.split import DECODERS, optimalSplit, eval_fitness_optimal_split
+from nsga_vrp.individual import INDIVIDUALS, ArrayIndividual, populationArray, individualsFromArray
+from nsga_vrp.operators import VARIATIONS, cxOrderedPopulation, mutShufflePopulation
+from nsga_vrp.selection import SELECTIONS, TOURNAMENTS, selNSGA2Fast, selNSGA2Ranked, selTournamentCrowded
+from nsga_vrp.localsearch import LocalSearch
+from nsga_vrp.stopping import StoppingCriteria
+from nsga_vrp.checkpoint import Checkpointer, loadCheckpoint
+from nsga_vrp.reporting import Reporter, SUMMARY, VERBOSE
+from nsga_vrp.timewindows import routeTimeWindows, populationTimeWindows
+from nsga_vrp.timing import PHASES, PhaseTimer, ProfileWindow
 
 
 BASE_DIR = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
@@ -21,52 +36,80 @@ BASE_DIR = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
 def load_instance(json_file):
     """
     Inputs: path to json file
-    Outputs: json file object if it exists, or else returns NoneType
+    Outputs: json file object if it exists, or else returns NoneType.
+             If the json file is the metadata of a binary instance, a VrpInstance
+             with memory mapped distance matrix is returned instead.
     """
     if os.path.exists(path=json_file):
         with io.open(json_file, 'rt', newline='') as file_object:
-            return load(file_object)
+            json_data = load(file_object)
+        if json_data.get('format') == BINARY_FORMAT:
+            return loadBinaryInstance(json_file, json_data)
+        return json_data
     return None
 
 
-# Take a route of given length, divide it into subroute where each subroute is assigned to vehicle
-def routeToSubroute(individual, instance):
+# Find where a route of given length is cut into subroutes, according to vehicle capacity
+def subrouteStarts(individual, instance):
     """
     Inputs: Sequence of customers that a route has
-            Loaded instance problem
-    Outputs: Route that is divided in to subroutes
-             which is assigned to each vechicle.
+            Compiled VrpInstance
+    Outputs: List of positions in the individual at which
+             a new vehicle starts its subroute.
     """
-    route = []
-    sub_route = []
+    starts = []
     vehicle_load = 0
-    last_customer_id = 0
-    vehicle_capacity = instance['vehicle_capacity']
-    
-    for customer_id in individual:
-        # print(customer_id)
-        demand = instance[f"customer_{customer_id}"]["demand"]
-        # print(f"The demand for customer_{customer_id}  is {demand}")
+    vehicle_capacity = instance.vehicle_capacity
+    demands = instance.demands[numpy.asarray(individual, dtype=numpy.intp)].tolist()
+
+    for position, demand in enumerate(demands):
         updated_vehicle_load = vehicle_load + demand
 
-        if(updated_vehicle_load <= vehicle_capacity):
-            sub_route.append(customer_id)
+        if starts and updated_vehicle_load <= vehicle_capacity:
             vehicle_load = updated_vehicle_load
         else:
-            route.append(sub_route)
-            sub_route = [customer_id]
+            starts.append(position)
             vehicle_load = demand
-        
-        last_customer_id = customer_id
 
-    if sub_route != []:
-        route.append(sub_route)
+    return starts
+
+
+# Find where a route is cut into subroutes by the given decoder
+def decodeStarts(individual, instance, decoder='greedy'):
+    """
+    Inputs: Sequence of customers that a route has
+            Compiled VrpInstance
+            Decoder, 'greedy' cuts when capacity would be exceeded,
+                'optimal' cuts for the least total distance
+    Outputs: List of positions in the individual at which
+             a new vehicle starts its subroute.
+    """
+    if decoder == 'greedy':
+        return subrouteStarts(individual, instance)
+    if decoder == 'optimal':
+        return optimalSplit(individual, instance)[0]
+    raise ValueError(f"Unknown decoder {decoder}, expected one of {DECODERS}")
+
+
+# Take a route of given length, divide it into subroute where each subroute is assigned to vehicle
+def routeToSubroute(individual, instance, decoder='greedy'):
+    """
+    Inputs: Sequence of customers that a route has
+            Compiled VrpInstance
+            Decoder used to cut the route, 'greedy' or 'optimal'
+    Outputs: Route that is divided in to subroutes
+             which is assigned to each vechicle.
+    """
+    instance = requireInstance(instance)
+    individual = list(individual)
+    starts = decodeStarts(individual, instance, decoder)
+    ends = starts[1:] + [len(individual)]
 
     # Returning the final route with each list inside for a vehicle
-    return route
+    return [individual[start:end] for start, end in zip(starts, ends)]
 
 
-def printRoute(route, merge=False):
+def printRoute(route, merge=False, output=print):
     route_str = '0'
     sub_route_count = 0
     for sub_route in route:
@@ -77,85 +120,288 @@ def printRoute(route, merge=False):
             route_str = f'{route_str} - {customer_id}'
         sub_route_str = f'{sub_route_str} - 0'
         if not merge:
-            print(f'  Vehicle {sub_route_count}\'s route: {sub_route_str}')
+            output(f'  Vehicle {sub_route_count}\'s route: {sub_route_str}')
         route_str = f'{route_str} - 0'
     if merge:
-        print(route_str)
+        output(route_str)
 
 
 # Calculate the number of vehicles required, given a route
-def getNumVehiclesRequired(individual, instance):
+def getNumVehiclesRequired(individual, instance, decoder='greedy'):
     """
     Inputs: Individual route
-            Json file object loaded instance
+            Compiled VrpInstance
+            Decoder used to cut the route, 'greedy' or 'optimal'
     Outputs: Number of vechiles according to the given problem and the route
     """
-    # Get the route with subroutes divided according to demand
-    updated_route = routeToSubroute(individual, instance)
-    num_of_vehicles = len(updated_route)
+    # Get the positions where subroutes are divided according to demand
+    num_of_vehicles = len(decodeStarts(individual, requireInstance(instance), decoder))
     return num_of_vehicles
 
 
 # Given a route, give its total cost
-def getRouteCost(individual, instance, unit_cost=1):
+def getRouteCost(individual, instance, unit_cost=1, decoder='greedy'):
     """
     Inputs : 
         - Individual route
-        - Problem instance, json file that is loaded
+        - Problem instance, compiled VrpInstance
         - Unit cost for the route (can be petrol etc)
+        - Decoder used to cut the route, 'greedy' or 'optimal'
 
     Outputs:
         - Total cost for the route taken by all the vehicles
     """
-    total_cost = 0
-    updated_route = routeToSubroute(individual, instance)
-
-    for sub_route in updated_route:
-        # Initializing the subroute distance to 0
-        sub_route_distance = 0
-        # Initializing customer id for depot as 0
-        last_customer_id = 0
+    instance = requireInstance(instance)
+    customer_ids = numpy.asarray(individual, dtype=numpy.intp)
+    starts = decodeStarts(customer_ids, instance, decoder)
+    if not starts:
+        return 0
+    ends = starts[1:] + [len(customer_ids)]
+
+    # Subroutes already seen are looked up instead of summing their legs again
+    if instance.subroute_cache is not None:
+        return sum(unit_cost*distance for distance, _ in subrouteDistanceLoads(customer_ids, starts, instance))
+
+    # Previous place for every customer, which is the depot (0) when a new subroute starts
+    previous_ids = numpy.empty_like(customer_ids)
+    previous_ids[1:] = customer_ids[:-1]
+    previous_ids[starts] = 0
+
+    # Gathering every leg of every subroute, and the way back to depot, in one go
+    leg_distances = instance.pairDistances(previous_ids, customer_ids).tolist()
+    return_distances = instance.pairDistances(customer_ids[numpy.asarray(ends, dtype=numpy.intp) - 1], 0).tolist()
 
-        for customer_id in sub_route:
-            # Distance from the last customer id to next one in the given subroute
-            distance = instance["distance_matrix"][last_customer_id][customer_id]
-            sub_route_distance += distance
-            # Update last_customer_id to the new one
-            last_customer_id = customer_id
-        
-        # After adding distances in subroute, adding the route cost from last customer to depot
-        # that is 0
-        sub_route_distance = sub_route_distance + instance["distance_matrix"][last_customer_id][0]
+    total_cost = 0
+    for start, end, return_distance in zip(starts, ends, return_distances):
+        # Distance of the subroute, from depot through its customers and back to depot
+        sub_route_distance = sum(leg_distances[start:end]) + return_distance
 
         # Cost for this particular sub route
         sub_route_transport_cost = unit_cost*sub_route_distance
 
         # Adding this to total cost
         total_cost = total_cost + sub_route_transport_cost
-    
+
     return total_cost
 
 
+# Distance and load of every subroute of a route, through the instance's subroute cache
+def subrouteDistanceLoads(customer_ids, starts, instance):
+    """
+    Inputs: customer_ids - route as int array
+            starts - positions at which the subroutes start
+            instance - compiled VrpInstance with a subroute cache
+    Outputs: List of (distance, load) tuples, one per subroute. Subroutes missing from
+             the cache are walked on the distance matrix and added to it
+    """
+    cache = instance.subroute_cache
+    customers = customer_ids.tolist()
+    ends = starts[1:] + [len(customers)]
+    keys = [cache.key(customers[start:end]) for start, end in zip(starts, ends)]
+    distance_loads = cache.getMany(keys)
+    for index, distance_load in enumerate(distance_loads):
+        if distance_load is None:
+            # From depot through the customers and back to depot
+            start, end = starts[index], ends[index]
+            places = numpy.zeros(end - start + 2, dtype=numpy.intp)
+            places[1:-1] = customer_ids[start:end]
+            distance = float(instance.pairDistances(places[:-1], places[1:]).sum(dtype=numpy.float64))
+            distance_loads[index] = (distance, float(instance.demands[places].sum()))
+            cache.put(keys[index], distance_loads[index])
+    return distance_loads
+
+
+# Get the fitness of a given route, with the subroute costs from the instance's subroute cache
+def eval_fitness_subroute_cache(individual, instance, unit_cost, decoder='greedy'):
+    """
+    Inputs: individual route as a sequence
+            VrpInstance made by withSubrouteCache
+            unit_cost for the distance
+            Decoder used to cut the route, 'greedy' or 'optimal'
+    Outputs: Returns a tuple of (Number of vechicles, Route cost from all the vechicles)
+             same as eval_indvidual_fitness, cutting the route only once
+    """
+    customer_ids = numpy.asarray(individual, dtype=numpy.intp)
+    starts = decodeStarts(customer_ids, instance, decoder)
+    if not starts:
+        return (0, 0)
+    distance_loads = subrouteDistanceLoads(customer_ids, starts, instance)
+    return (len(starts), unit_cost*sum(distance for distance, _ in distance_loads))
+
+
+# Get the fitness of a given route, with the lateness of its time windows as third objective
+def eval_fitness_time_windows(individual, instance, unit_cost, decoder='greedy'):
+    """
+    Inputs: individual route as a sequence
+            Compiled VrpInstance
+            unit_cost for the distance
+            Decoder used to cut the route, 'greedy' or 'optimal'
+    Outputs: Returns a tuple of (Number of vechicles, Route cost from all the vechicles,
+             Lateness of all the vehicles at their customers and back at the depot)
+    """
+    instance = requireInstance(instance)
+    customer_ids = numpy.asarray(individual, dtype=numpy.intp)
+    starts = decodeStarts(customer_ids, instance, decoder)
+    route_distance, _, lateness = routeTimeWindows(customer_ids, starts, instance)
+    return (len(starts), unit_cost*route_distance, lateness)
+
+
 # Get the fitness of a given route
-def eval_indvidual_fitness(individual, instance, unit_cost):
+def eval_indvidual_fitness(individual, instance, unit_cost, decoder='greedy'):
     """
     Inputs: individual route as a sequence
-            Json object that is loaded as file object
+            Compiled VrpInstance
             unit_cost for the distance 
+            Decoder used to cut the route, 'greedy' or 'optimal'
     Outputs: Returns a tuple of (Number of vechicles, Route cost from all the vechicles)
     """
+    instance = requireInstance(instance)
 
     # we have to minimize number of vehicles
     # TO calculate req vechicles for given route
-    vehicles = getNumVehiclesRequired(individual, instance)
+    vehicles = getNumVehiclesRequired(individual, instance, decoder)
 
     # we also have to minimize route cost for all the vehicles
-    route_cost = getRouteCost(individual, instance, unit_cost)
+    route_cost = getRouteCost(individual, instance, unit_cost, decoder)
 
     return (vehicles, route_cost)
 
 
 
+# Get the fitness of a given route, splitting it only once
+def eval_fitness_single_pass(individual, instance, unit_cost):
+    """
+    Inputs: individual route as a sequence
+            Compiled VrpInstance
+            unit_cost for the distance
+    Outputs: Returns a tuple of (Number of vechicles, Route cost from all the vechicles)
+             same as eval_indvidual_fitness, but vehicles and cost are counted
+             in one pass over the route without building the subroutes
+    """
+    instance = requireInstance(instance)
+    customer_ids = numpy.asarray(individual, dtype=numpy.intp)
+    if len(customer_ids) == 0:
+        return (0, 0)
+
+    vehicle_capacity = instance.vehicle_capacity
+    demands = instance.demands[customer_ids].tolist()
+    from_depot = instance.pairDistances(0, customer_ids).tolist()
+    to_depot = instance.pairDistances(customer_ids, 0).tolist()
+    next_legs = instance.pairDistances(customer_ids[:-1], customer_ids[1:]).tolist()
+
+    # First vehicle leaves the depot to the first customer
+    vehicles = 1
+    vehicle_load = demands[0]
+    route_distance = from_depot[0]
+
+    for position in range(1, len(demands)):
+        demand = demands[position]
+        if vehicle_load + demand <= vehicle_capacity:
+            # Same vehicle drives on to the next customer
+            vehicle_load += demand
+            route_distance += next_legs[position - 1]
+        else:
+            # Vehicle returns to depot, and a new one drives out to this customer
+            route_distance += to_depot[position - 1] + from_depot[position]
+            vehicles += 1
+            vehicle_load = demand
+
+    # Last vehicle returns to the depot
+    route_distance += to_depot[-1]
+
+    return (vehicles, unit_cost*route_distance)
+
+
+# Get the fitness of a whole population at once
+def populationStarts(customer_ids, instance):
+    """
+    Inputs: customer_ids - 2-D array of routes, one row per individual
+            instance - compiled VrpInstance
+    Outputs: Boolean array of same shape, True where subrouteStarts starts a subroute
+
+    Integral demands are cut with searches on their cumulative sums as int64, which is
+    exact. Other demands are walked position by position over all the rows, adding up
+    the loads in the same order as subrouteStarts so the floats round the same way.
+    """
+    pop_size, route_len = customer_ids.shape
+    starts = numpy.zeros(customer_ids.shape, dtype=bool)
+    demands = instance.demands[customer_ids]
+    vehicle_capacity = instance.vehicle_capacity
+
+    if not numpy.array_equal(instance.demands, numpy.floor(instance.demands)):
+        vehicle_load = numpy.zeros(pop_size)
+        for position in range(route_len):
+            updated_load = vehicle_load + demands[:, position]
+            new_vehicle = updated_load > vehicle_capacity if position else numpy.ones(pop_size, dtype=bool)
+            starts[:, position] = new_vehicle
+            vehicle_load = numpy.where(new_vehicle, demands[:, position], updated_load)
+        return starts
+
+    # Integral loads fit when they are at most the integral part of the capacity. The load of
+    #   a subroute starting at position s and ending at p is cum_demand[p] - cum_demand[s - 1]
+    capacity = int(numpy.floor(vehicle_capacity))
+    cum_demand = numpy.cumsum(demands.astype(numpy.int64), axis=1)
+
+    # Every row is shifted by an offset larger than any load it can reach, so one
+    #   sorted flat array can be searched for all the individuals together
+    row_span = int(cum_demand[:, -1].max()) + capacity + 1
+    row_offsets = numpy.arange(pop_size, dtype=numpy.int64) * row_span
+    flat_cum_demand = (cum_demand + row_offsets[:, None]).ravel()
+
+    # Cutting all the individuals into subroutes, one subroute per step. A subroute ends
+    #   at the last customer whose cumulative demand still fits in the vehicle
+    rows = numpy.arange(pop_size)
+    positions = numpy.zeros(pop_size, dtype=numpy.intp)
+    while rows.size:
+        starts[rows, positions] = True
+        loaded_before = numpy.where(positions > 0, cum_demand[rows, positions - 1], 0)
+        next_flat = numpy.searchsorted(flat_cum_demand, row_offsets[rows] + loaded_before + capacity, side='right')
+        # A customer with demand above capacity still gets a vehicle of its own
+        next_positions = numpy.maximum(next_flat - rows * route_len, positions + 1)
+        remaining = next_positions < route_len
+        rows, positions = rows[remaining], next_positions[remaining]
+    return starts
+
+
+def eval_population_fitness(population, instance, unit_cost=1, time_windows=False):
+    """
+    Inputs: population as 2-D integer array (pop_size x number of customers),
+                or a list of individuals of same length
+            Compiled VrpInstance
+            unit_cost for the distance
+            time_windows - whether lateness of the time windows is the third objective
+    Outputs: Array of shape (pop_size, 2) where each row is
+             (Number of vechicles, Route cost from all the vechicles),
+             or (pop_size, 3) with the lateness of every route when time_windows is set
+    """
+    instance = requireInstance(instance)
+    customer_ids = numpy.asarray(population, dtype=numpy.intp)
+    pop_size, route_len = customer_ids.shape
+    fitnesses = numpy.zeros((pop_size, 3 if time_windows else 2))
+    if route_len == 0:
+        return fitnesses
+    starts = populationStarts(customer_ids, instance)
+
+    # A subroute ends right before the next one starts, or at the end of individual
+    ends = numpy.ones(customer_ids.shape, dtype=bool)
+    ends[:, :-1] = starts[:, 1:]
+
+    # Previous place for every customer is the depot (0) when a new subroute starts
+    previous_ids = numpy.empty_like(customer_ids)
+    previous_ids[:, 1:] = customer_ids[:, :-1]
+    previous_ids[starts] = 0
+
+    leg_distances = instance.pairDistances(previous_ids, customer_ids)
+    return_distances = numpy.where(ends, instance.pairDistances(customer_ids, 0), 0)
+
+    fitnesses[:, 0] = starts.sum(axis=1)
+    fitnesses[:, 1] = unit_cost * (leg_distances.sum(axis=1, dtype=numpy.float64) +
+                                   return_distances.sum(axis=1, dtype=numpy.float64))
+    if time_windows:
+        fitnesses[:, 2] = populationTimeWindows(customer_ids, starts, instance)[1]
+    return fitnesses
+
+
 # Crossover method with ordering
 # This method will let us escape illegal routes with multiple occurences
 #   of customers that might happen. We would never get illegal individual from this
@@ -196,16 +442,20 @@ def cxOrderedVrp(input_ind1, input_ind2):
     for i in range(a, b + 1):
         ind1[i], ind2[i] = ind2[i], ind1[i]
 
-    # Finally adding 1 again to reclaim original input
-    ind1 = [x+1 for x in ind1]
-    ind2 = [x+1 for x in ind2]
-    return ind1, ind2
+    # Finally adding 1 again to reclaim original input, written back into the
+    #   given individuals so that they are changed in place like deap operators do.
+    #   Item by item assignment works for lists, typed arrays and numpy rows alike
+    for i in range(size):
+        input_ind1[i] = ind1[i] + 1
+        input_ind2[i] = ind2[i] + 1
+    return input_ind1, input_ind2
 
 
-def mutationShuffle(individual, indpb):
+def mutationShuffle(individual, indpb, moves=None):
     """
     Inputs : Individual route
              Probability of mutation betwen (0,1)
+             Optional list, where each swap is appended as (position1, position2)
     Outputs : Mutated individual according to the probability
     """
     size = len(individual)
@@ -216,6 +466,8 @@ def mutationShuffle(individual, indpb):
                 swap_indx += 1
             individual[i], individual[swap_indx] = \
                 individual[swap_indx], individual[i]
+            if moves is not None:
+                moves.append((i, swap_indx))
 
     return individual,
 
@@ -241,20 +493,25 @@ def createStatsObjs():
     return logbook, stats
 
 
-def recordStat(invalid_ind, logbook, pop, stats, gen):
+def recordStat(invalid_ind, logbook, pop, stats, gen, reporter=None, **extra):
     """
     Inputs : invalid_ind - Number of children for which fitness is calculated
              logbook - Logbook object that logs data
              pop - population
              stats - stats object that compiles statistics
-    Outputs: None, prints the logs
+             reporter - Reporter showing the record, the logs are printed without one
+             extra - any other columns to record in this generation
+    Outputs: None, prints or reports the logs
     """
     record = stats.compile(pop)
     best_individual = tools.selBest(pop, 1)[0]
-    record["best_one"] = best_individual
+    record["best_one"] = list(best_individual)
     record["fitness_best_one"] = best_individual.fitness
-    logbook.record(Generation=gen, evals=len(invalid_ind), **record)
-    print(logbook.stream)
+    logbook.record(Generation=gen, evals=len(invalid_ind), **record, **extra)
+    if reporter is None:
+        print(logbook.stream)
+    else:
+        reporter.generation(gen, logbook)
 
 
 
@@ -275,35 +532,162 @@ def exportCsv(csv_file_name, logbook):
 
 class nsgaAlgo(object):
 
-    def __init__(self):
-        self.json_instance = load_instance('./data/json/Input_Data.json')
-        self.ind_size = self.json_instance['Number_of_customers']
-        self.pop_size = 400
-        self.cross_prob = 0.85
-        self.mut_prob = 0.02
-        self.num_gen = 150
+    def __init__(self, instance='./data/json/Input_Data.json', pop_size=400, cross_prob=0.85,
+                 mut_prob=0.02, num_gen=150, batch_eval=True, backend='serial', workers=1,
+                 cache_size=10000, cache_eviction='lru', delta_eval=False, decoder='greedy',
+                 matrix_free=False, distance_cache_rows=0, individual='list', variation='loop',
+                 selection='fast', tournament='dcd', local_search=0, neighbours=10, local_search_time=0.05,
+                 stagnation_window=0, stagnation_metric='hypervolume', stagnation_tol=1e-6, time_limit=None,
+                 target_cost=None, checkpoint=None, checkpoint_interval=10, resume=False, verbosity=VERBOSE,
+                 report_every=1, report_jsonl=None, subroute_cache=0, time_windows=False, timing=False,
+                 profile=None, profile_window=(1, 2), profile_output=None):
+        # Instance can be a path to json file, loaded json object or VrpInstance,
+        #   it is compiled only once here and shared by all the evaluations
+        if isinstance(instance, str):
+            instance = load_instance(instance)
+        self.instance = compileInstance(instance)
+        # Computing distances from coordinates instead of keeping the distance matrix
+        if matrix_free:
+            self.instance = self.instance.matrixFree(cache_rows=distance_cache_rows)
+        # Distance and load of up to subroute_cache subroutes, looked up by the one by one
+        #   evaluation instead of summing their legs again
+        if subroute_cache:
+            self.instance = self.instance.withSubrouteCache(subroute_cache, cache_eviction)
+        self.ind_size = self.instance.num_customers
+        self.pop_size = pop_size
+        self.cross_prob = cross_prob
+        self.mut_prob = mut_prob
+        self.num_gen = num_gen
+        # Decoder cutting the routes into subroutes, the batch and delta evaluations
+        #   only know the greedy one
+        if decoder not in DECODERS:
+            raise ValueError(f"Unknown decoder {decoder}, expected one of {DECODERS}")
+        if delta_eval and decoder != 'greedy':
+            raise ValueError("Delta evaluation needs the greedy decoder")
+        self.decoder = decoder
+        # Lateness at the customers' time windows as third objective, for the instances
+        #   whose ready and due times matter
+        if time_windows and (delta_eval or subroute_cache):
+            raise ValueError("Time windows need the full evaluation, without delta evaluation or subroute cache")
+        self.time_windows = time_windows
+        self.num_objectives = 3 if time_windows else 2
+        # Evaluating all the invalid individuals of a generation in one array call,
+        #   the subroute cache is used by the one by one evaluation, which is told when reporting starts
+        self.batch_eval = batch_eval and decoder == 'greedy' and not subroute_cache
+        batch_fallback = batch_eval and decoder == 'greedy' and bool(subroute_cache)
+        # Serial, thread pool or process pool evaluation of the population slices
+        self.backend = EvaluationBackend(self.instance, backend=backend, workers=workers)
+        # Fitness of already seen routes, so duplicate offspring are not evaluated again
+        self.fitness_cache = FitnessCache(cache_size, cache_eviction) if cache_size else None
+        # Evaluating mutation only offspring from their parent's subroutes and the swaps
+        self.delta_eval = delta_eval
+        # Individuals as python lists, or as typed int arrays which are cheaper to clone and hold
+        if individual not in INDIVIDUALS:
+            raise ValueError(f"Unknown individual {individual}, expected one of {INDIVIDUALS}")
+        self.individual = individual
+        # Crossover and mutation through the toolbox one by one, or on the whole offspring matrix
+        if variation not in VARIATIONS:
+            raise ValueError(f"Unknown variation {variation}, expected one of {VARIATIONS}")
+        self.variation = variation
+        # NSGA2 selection by the O(N log N) bi-objective sort, or by deap's own
+        if selection not in SELECTIONS:
+            raise ValueError(f"Unknown selection {selection}, expected one of {SELECTIONS}")
+        self.selection = selection
+        # Parents chosen by deap's selTournamentDCD, or by the crowded tournament played on the
+        #   rank and crowding arrays kept from the fast selection
+        if tournament not in TOURNAMENTS:
+            raise ValueError(f"Unknown tournament {tournament}, expected one of {TOURNAMENTS}")
+        if tournament == 'crowded' and selection != 'fast':
+            raise ValueError("Crowded tournament needs the ranks of the fast selection")
+        self.tournament = tournament
+        self.pop_ranks = self.pop_distances = None
+        # Number of best offspring improved by local search every generation, within
+        #   local_search_time seconds, trying only moves towards the nearest neighbours
+        self.local_search = LocalSearch(self.instance, neighbours) if local_search else None
+        self.local_search_k = local_search
+        self.local_search_time = local_search_time
+        self.local_search_improved = 0
+        # Stopping before num_gen generations, when the front stagnates, time runs out or the
+        #   target cost is reached. Reason is recorded in every logbook record
+        self.stopping = StoppingCriteria(stagnation_window, stagnation_metric, stagnation_tol, time_limit, target_cost)
+        self.stop_reason = ''
+        # Generations run so far, and checkpoints written to the given file every
+        #   checkpoint_interval generations, which a resumed run starts from
+        self.generation = 0
+        self.checkpointer = Checkpointer(checkpoint, checkpoint_interval) if checkpoint else None
+        self.resume = resume
+        # Output of the run from quiet to a full line per generation, shown every report_every
+        #   generations and written by a background thread, with every record also going to
+        #   the report_jsonl file as json lines
+        self.reporter = Reporter(verbosity, report_every, report_jsonl)
+        if batch_fallback:
+            self.reporter.message("Subroute cache evaluates individuals one by one, batch evaluation is off")
+        # Time spent in every phase of the generations, recorded in the logbook and summed up at
+        #   the end, and cProfile or tracemalloc run over the generations of profile_window
+        self.timer = PhaseTimer(timing)
+        self.profile_window = None
+        if profile is not None:
+            extension = 'prof' if profile == 'cprofile' else 'txt'
+            profile_output = profile_output or \
+                os.path.join(BASE_DIR, "results", f"{self.instance.instance_name}_{profile}.{extension}")
+            self.profile_window = ProfileWindow(profile, profile_window[0], profile_window[1], profile_output)
+        # Generator of the matrix operators, seeded from random so that random.seed covers it
+        self.rng = numpy.random.default_rng(random.getrandbits(64))
         self.toolbox = base.Toolbox()
         self.logbook, self.stats = createStatsObjs()
+        if self.fitness_cache is not None:
+            self.logbook.header = tuple(self.logbook.header) + ("cache_hits", "cache_misses")
+        if self.instance.subroute_cache is not None:
+            self.logbook.header = tuple(self.logbook.header) + ("subroute_hits", "subroute_hit_rate")
+        if self.local_search is not None:
+            self.logbook.header = tuple(self.logbook.header) + ("local_search",)
+        if self.stopping.tracks_hypervolume:
+            self.logbook.header = tuple(self.logbook.header) + ("hypervolume",)
+        if self.stopping.enabled:
+            self.logbook.header = tuple(self.logbook.header) + ("stop_reason",)
+        if self.timer.enabled:
+            self.logbook.header = tuple(self.logbook.header) + tuple(f"time_{phase}" for phase in PHASES) + \
+                ("evals_per_sec",) + (("cache_hit_rate",) if self.fitness_cache is not None else ())
         self.createCreators()
 
     def createCreators(self):
-        creator.create('FitnessMin', base.Fitness, weights=(-1.0, -1.0))
-        creator.create('Individual', list, fitness=creator.FitnessMin)
+        creator.create('FitnessMin', base.Fitness, weights=(-1.0,) * self.num_objectives)
+        if self.individual == 'array':
+            # Empty slots keep the individuals without __dict__, fitness is set by ArrayIndividual
+            creator.create('Individual', ArrayIndividual, __slots__=())
+        else:
+            creator.create('Individual', list, fitness=creator.FitnessMin)
+        self.individual_class = creator.Individual
 
         # Registering toolbox
         self.toolbox.register('indexes', random.sample, range(1, self.ind_size + 1), self.ind_size)
 
         # Creating individual and population from that each individual
-        self.toolbox.register('individual', tools.initIterate, creator.Individual, self.toolbox.indexes)
+        self.toolbox.register('individual', tools.initIterate, self.individual_class, self.toolbox.indexes)
         self.toolbox.register('population', tools.initRepeat, list, self.toolbox.individual)
 
         # Creating evaluate function using our custom fitness
         #   toolbox.register is partial, *args and **kwargs can be given here
         #   and the rest of args are supplied in code
-        self.toolbox.register('evaluate', eval_indvidual_fitness, instance=self.json_instance, unit_cost=1)
+        if self.time_windows:
+            self.toolbox.register('evaluate', eval_fitness_time_windows, instance=self.instance, unit_cost=1,
+                                  decoder=self.decoder)
+        elif self.instance.subroute_cache is not None:
+            self.toolbox.register('evaluate', eval_fitness_subroute_cache, instance=self.instance, unit_cost=1,
+                                  decoder=self.decoder)
+        elif self.decoder == 'optimal':
+            self.toolbox.register('evaluate', eval_fitness_optimal_split, instance=self.instance, unit_cost=1)
+        else:
+            self.toolbox.register('evaluate', eval_fitness_single_pass, instance=self.instance, unit_cost=1)
+        self.toolbox.register('evaluate_batch', eval_population_fitness, instance=self.instance, unit_cost=1,
+                              time_windows=self.time_windows)
+        self.toolbox.register('map', self.backend.map)
 
         # Selection method
-        self.toolbox.register("select", tools.selNSGA2)
+        if self.selection == 'fast':
+            self.toolbox.register("select", selNSGA2Fast)
+        else:
+            self.toolbox.register("select", tools.selNSGA2)
 
         # Crossover method
         self.toolbox.register("mate", cxOrderedVrp)
@@ -312,92 +696,444 @@ class nsgaAlgo(object):
         self.toolbox.register("mutate", mutationShuffle, indpb=self.mut_prob)
 
 
-    def generatingPopFitness(self):
-        self.pop = self.toolbox.population(n=self.pop_size)
-        self.invalid_ind = [ind for ind in self.pop if not ind.fitness.valid]
-        self.fitnesses = list(map(self.toolbox.evaluate, self.invalid_ind))
+    def evaluateIndividuals(self, individuals):
+        # Assigning fitness to the given individuals, either all at once
+        #   as one population array or one individual at a time
+        if not individuals:
+            return
+        population = populationArray(individuals)
+
+        # Only the routes that are not cached are evaluated, each of them once
+        if self.fitness_cache is not None:
+            keys = [routeKey(route) for route in population]
+            fitnesses = [self.fitness_cache.get(key) for key in keys]
+            missing = {}
+            for index, (key, fit) in enumerate(zip(keys, fitnesses)):
+                if fit is None:
+                    missing.setdefault(key, index)
+            evaluated = {}
+            if missing:
+                evaluated = dict(zip(missing, self.evaluatePopulation(population[list(missing.values())])))
+                for key, fit in evaluated.items():
+                    self.fitness_cache.put(key, fit)
+            fitnesses = [evaluated[key] if fit is None else fit for key, fit in zip(keys, fitnesses)]
+        else:
+            fitnesses = self.evaluatePopulation(population)
 
-        for ind, fit in zip(self.invalid_ind, self.fitnesses):
+        for ind, fit in zip(individuals, fitnesses):
             ind.fitness.values = fit
 
-        self.pop = self.toolbox.select(self.pop, len(self.pop))
+    def evaluatePopulation(self, population):
+        # Fitness values of a 2-D array of routes, as list of tuples. Only these count as
+        #   evaluations, routes found in the fitness cache do not
+        self.timer.countEvaluations(len(population))
+        if self.batch_eval:
+            fitnesses = self.backend.evaluate(self.toolbox.evaluate_batch, population, batch=True)
+        else:
+            fitnesses = self.backend.evaluate(self.toolbox.evaluate, population, batch=False)
+        return [tuple(fit) for fit in fitnesses.tolist()]
+
+    def cacheStats(self):
+        # Extra logbook columns for fitness cache hits and misses, and subroute cache hits
+        #   and the share of subroute lookups they were, in this generation
+        stats = {}
+        if self.fitness_cache is not None:
+            hits, misses = self.fitness_cache.takeCounters()
+            stats.update(cache_hits=hits, cache_misses=misses)
+            if self.timer.enabled:
+                stats.update(cache_hit_rate=hits / (hits + misses) if hits + misses else 0.0)
+        if self.instance.subroute_cache is not None:
+            hits, misses = self.instance.subroute_cache.takeCounters()
+            stats.update(subroute_hits=hits, subroute_hit_rate=hits / (hits + misses) if hits + misses else 0.0)
+        return stats
+
+    def localSearchStats(self):
+        # Extra logbook column for the number of offspring improved by local search in this generation
+        if self.local_search is None:
+            return {}
+        improved, self.local_search_improved = self.local_search_improved, 0
+        return {"local_search": improved}
+
+    def stopStats(self, gen):
+        # Extra logbook columns for the hypervolume and the reason to stop after generation gen. The
+        #   last generation is given its reason here, as the record is reported once it is made
+        if not self.stopping.enabled:
+            return {}
+        volume, self.stop_reason = self.stopping.update(self.pop)
+        if not self.stop_reason and gen >= self.num_gen:
+            self.stop_reason = 'num_gen'
+        if volume is None:
+            return {"stop_reason": self.stop_reason}
+        return {"hypervolume": volume, "stop_reason": self.stop_reason}
+
+    def timingStats(self):
+        # Extra logbook columns for the seconds of every phase and the evaluations per second in this
+        #   generation. Recording is timed until the record is made, so time_record is of the one before
+        if not self.timer.enabled:
+            return {}
+        times, evaluations = self.timer.takeGeneration()
+        stats = {f"time_{phase}": seconds for phase, seconds in times.items()}
+        stats["evals_per_sec"] = evaluations / times['evaluation'] if times['evaluation'] else 0.0
+        return stats
 
-        recordStat(self.invalid_ind, self.logbook, self.pop, self.stats, gen = 0)
+    def generatingPopFitness(self):
+        self.stopping.start()
+        self.stop_reason = ''
+        self.generation = 0
+        with self.timer.phase('init'):
+            self.pop = self.toolbox.population(n=self.pop_size)
+        with self.timer.phase('evaluation'):
+            self.invalid_ind = [ind for ind in self.pop if not ind.fitness.valid]
+            self.evaluateIndividuals(self.invalid_ind)
 
+        with self.timer.phase('selection'):
+            self.selectPopulation(self.pop, len(self.pop))
 
-    def runGenerations(self):
-        # Running algorithm for given number of generations
-        for gen in range(self.num_gen):
-            print(f"{20*'#'} Currently Evaluating {gen} Generation {20*'#'}")
+        with self.timer.phase('record'):
+            recordStat(self.invalid_ind, self.logbook, self.pop, self.stats, gen = 0, reporter=self.reporter,
+                       **self.cacheStats(), **self.localSearchStats(), **self.stopStats(0), **self.timingStats())
 
-            # Selecting individuals
-            # Selecting offsprings from the population, about 1/2 of them
-            self.offspring = tools.selTournamentDCD(self.pop, len(self.pop))
-            self.offspring = [self.toolbox.clone(ind) for ind in self.offspring]
 
-            # Performing , crossover and mutation operations according to their probabilities
-            for ind1, ind2 in zip(self.offspring[::2], self.offspring[1::2]):
-                # Mating will happen 80% of time if cross_prob is 0.8
-                if random.random() <= self.cross_prob:
-                    # print("Mating happened")
-                    self.toolbox.mate(ind1, ind2)
+    def runGeneration(self, gen):
+        # Running one generation, gen is the count of generations already run
+        self.reporter.message(f"{20*'#'} Currently Evaluating {gen} Generation {20*'#'}", VERBOSE)
 
-                    # If cross over happened to the individuals then we are deleting those individual
-                    #   fitness values, This operations are being done on the offspring population.
-                    del ind1.fitness.values, ind2.fitness.values
-                self.toolbox.mutate(ind1)
-                self.toolbox.mutate(ind2)
+        # Selecting individuals
+        # Selecting offsprings from the population, about 1/2 of them
+        with self.timer.phase('tournament'):
+            if self.tournament == 'crowded':
+                # Tournaments are played on the arrays, and parents are gathered by their indexes
+                parent_indexes = selTournamentCrowded(self.pop_ranks, self.pop_distances, len(self.pop), self.rng)
+                self.offspring = [self.pop[index] for index in parent_indexes.tolist()]
+            else:
+                parent_indexes = None
+                self.offspring = tools.selTournamentDCD(self.pop, len(self.pop))
+
+        if self.variation == 'matrix':
+            # Parents' routes are gathered from the population matrix in one go
+            with self.timer.phase('clone'):
+                if parent_indexes is None:
+                    matrix = numpy.array(populationArray(self.offspring))
+                else:
+                    matrix = populationArray(self.pop)[parent_indexes]
+            with self.timer.phase('variation'):
+                self.offspring = self.varyMatrix(self.offspring, matrix)
+        else:
+            self.varyLoop()
 
-            # Calculating fitness for all the invalid individuals in offspring
+        # Calculating fitness for all the invalid individuals in offspring
+        with self.timer.phase('evaluation'):
             self.invalid_ind = [ind for ind in self.offspring if not ind.fitness.valid]
-            self.fitnesses = self.toolbox.map(self.toolbox.evaluate, self.invalid_ind)
-            for ind, fit in zip(self.invalid_ind, self.fitnesses):
-                ind.fitness.values = fit
+            self.evaluateIndividuals(self.invalid_ind)
+        if self.local_search is not None:
+            with self.timer.phase('local_search'):
+                self.improveOffspring()
+
+        # Recalcuate the population with newly added offsprings and parents
+        # We are using NSGA2 selection method, We have to select same population size
+        with self.timer.phase('selection'):
+            self.selectPopulation(self.pop + self.offspring, self.pop_size)
 
-            # Recalcuate the population with newly added offsprings and parents
-            # We are using NSGA2 selection method, We have to select same population size
-            self.pop = self.toolbox.select(self.pop + self.offspring, self.pop_size)
+        # Recording stats in this generation
+        with self.timer.phase('record'):
+            recordStat(self.invalid_ind, self.logbook, self.pop, self.stats, gen + 1, reporter=self.reporter,
+                       **self.cacheStats(), **self.localSearchStats(), **self.stopStats(gen + 1),
+                       **self.timingStats())
+        self.generation = gen + 1
+
+    def improveOffspring(self):
+        # Memetic step, the best offspring are decoded into subroutes which are improved by
+        #   local search. The improved route is kept only if its fitness after decoding it
+        #   again is at least as good in all objectives and better in one
+        deadline = time.perf_counter() + self.local_search_time
+        for ind in tools.selBest(self.offspring, self.local_search_k):
+            if time.perf_counter() >= deadline:
+                break
+            routes = self.local_search.improveRoutes(routeToSubroute(ind, self.instance, self.decoder), deadline)
+            route = [customer for sub_route in routes for customer in sub_route]
+            fitness_values = tuple(self.toolbox.evaluate(route))
+            old_values = ind.fitness.values
+            if fitness_values == old_values or any(new > old for new, old in zip(fitness_values, old_values)):
+                continue
+
+            for position, customer in enumerate(route):
+                ind[position] = customer
+            ind.fitness.values = fitness_values
+            if self.delta_eval:
+                ind.split_state = None
+            self.local_search_improved += 1
+
+    def selectPopulation(self, individuals, k):
+        # NSGA2 selection of the next population, keeping the fronts and crowding
+        #   distances of the selected individuals for the crowded tournament
+        if self.tournament == 'crowded':
+            self.pop, self.pop_ranks, self.pop_distances = selNSGA2Ranked(individuals, k)
+        else:
+            self.pop = self.toolbox.select(individuals, k)
+
+    def varyLoop(self):
+        # Crossover and mutation of the selected offspring, one pair at a time
+        with self.timer.phase('clone'):
+            self.offspring = [self.toolbox.clone(ind) for ind in self.offspring]
 
-            # Recording stats in this generation
-            recordStat(self.invalid_ind, self.logbook, self.pop, self.stats, gen + 1)
+        with self.timer.phase('variation'):
+            self.varyPairs()
 
-        print(f"{20 * '#'} End of Generations {20 * '#'} ")
+    def varyPairs(self):
+        # Performing , crossover and mutation operations according to their probabilities
+        for ind1, ind2 in zip(self.offspring[::2], self.offspring[1::2]):
+            # Mating will happen 80% of time if cross_prob is 0.8
+            mated = random.random() <= self.cross_prob
+            if mated:
+                # print("Mating happened")
+                self.toolbox.mate(ind1, ind2)
+
+            for ind in (ind1, ind2):
+                if self.delta_eval and not mated:
+                    self.mutateDelta(ind)
+                    continue
+                moves = []
+                self.toolbox.mutate(ind, moves=moves)
+
+                # Cross over or mutation changed the individual, so we are deleting its fitness
+                #   values, This operations are being done on the offspring population.
+                #   Unchanged copies of their parents keep the parent's fitness.
+                if mated or moves:
+                    del ind.fitness.values
+                    if self.delta_eval:
+                        ind.split_state = None
+
+    def varyMatrix(self, parents, matrix):
+        """
+        Inputs: Selected parents, in mating pairs (0, 1), (2, 3) ...
+                Writable 2-D array of the parents' routes, varied in place
+        Outputs: New offspring individuals. Crossover and mutation are done on the
+                 whole offspring matrix at once, with the same operators and
+                 probabilities as the toolbox ones.
+        """
+        num_pairs = len(matrix) // 2
+
+        # Mating pairs are crossed over all at once
+        mated = numpy.zeros(len(matrix), dtype=bool)
+        mated_pairs = numpy.flatnonzero(self.rng.random(num_pairs) <= self.cross_prob)
+        children1, children2 = cxOrderedPopulation(matrix[2 * mated_pairs], matrix[2 * mated_pairs + 1], self.rng)
+        matrix[2 * mated_pairs], matrix[2 * mated_pairs + 1] = children1, children2
+        mated[2 * mated_pairs] = mated[2 * mated_pairs + 1] = True
+
+        swap_rows, swap_positions, swap_with = mutShufflePopulation(matrix, self.mut_prob, self.rng)
+        offspring = individualsFromArray(self.individual_class, matrix)
+        if not self.delta_eval:
+            # Unchanged copies of their parents keep the parent's fitness
+            unchanged = ~mated
+            unchanged[swap_rows] = False
+            for row in numpy.flatnonzero(unchanged).tolist():
+                offspring[row].fitness.values = parents[row].fitness.values
+            return offspring
+
+        # Offspring that were only mutated are evaluated from their parent's subroutes and the swaps
+        with self.timer.phase('evaluation'):
+            self.deltaRows(offspring, parents, mated, swap_rows, swap_positions, swap_with)
+        return offspring
+
+    def deltaRows(self, offspring, parents, mated, swap_rows, swap_positions, swap_with):
+        # Delta evaluation of the offspring rows of varyMatrix that were not crossed over
+        row_bounds = numpy.searchsorted(swap_rows, numpy.arange(len(offspring) + 1))
+        for row in numpy.flatnonzero(~mated).tolist():
+            ind, parent = offspring[row], parents[row]
+            parent_state = getattr(parent, 'split_state', None) or splitState(parent, self.instance)
+            start, end = row_bounds[row], row_bounds[row + 1]
+            if start == end:
+                ind.split_state = parent_state
+                ind.fitness.values = parent.fitness.values
+                continue
+            moves = list(zip(swap_positions[start:end].tolist(), swap_with[start:end].tolist()))
+            ind.split_state = swapDeltaState(ind, parent_state, moves, self.instance)
+            ind.fitness.values = stateFitness(ind.split_state, unit_cost=1)
+        return offspring
+
+    def mutateDelta(self, ind):
+        # Mutating an individual that still has its parent's fitness, and evaluating only
+        #   the subroutes affected by the swaps. Parent subroutes are split once and then
+        #   passed on to the descendants with the individual.
+        if getattr(ind, 'split_state', None) is None:
+            with self.timer.phase('evaluation'):
+                ind.split_state = splitState(ind, self.instance)
+        moves = []
+        self.toolbox.mutate(ind, moves=moves)
+        if moves:
+            with self.timer.phase('evaluation'):
+                ind.split_state = swapDeltaState(ind, ind.split_state, moves, self.instance)
+                ind.fitness.values = stateFitness(ind.split_state, unit_cost=1)
+            self.timer.countEvaluations(1)
+
+    def addImmigrants(self, migrants):
+        # Adding individuals coming from another population, given as (route, fitness values)
+        #   NSGA2 selection keeps population size same by dropping the worst ones
+        immigrants = []
+        for route, fitness_values in migrants:
+            immigrant = self.individual_class(route)
+            immigrant.fitness.values = fitness_values
+            immigrants.append(immigrant)
+        self.selectPopulation(self.pop + immigrants, self.pop_size)
+
+    def runGenerations(self, migrate=None):
+        # Running algorithm for given number of generations, a resumed run goes on
+        #   from the generation of its checkpoint. migrate is called with the number of
+        #   generations run after every one the run goes on from, islands exchange migrants in it
+        for gen in range(self.generation, self.num_gen):
+            if self.stop_reason:
+                break
+            if self.profile_window is not None:
+                self.profile_window.before(gen)
+            self.runGeneration(gen)
+            if self.profile_window is not None:
+                for line in self.profile_window.after(gen):
+                    self.reporter.message(line)
+            if self.stop_reason:
+                if self.stop_reason != 'num_gen':
+                    self.reporter.message(f"Stopping after {gen + 1} generations, reason is {self.stop_reason}")
+                continue
+            if migrate is not None:
+                migrate(gen + 1)
+            if self.checkpointer is not None and self.checkpointer.due(gen + 1):
+                self.saveCheckpoint()
+
+        # Only a run resumed at its last generation has no record made here to carry the reason
+        if self.stopping.enabled and not self.stop_reason:
+            self.stop_reason = 'num_gen'
+            self.logbook[-1]['stop_reason'] = self.stop_reason
+        if self.checkpointer is not None:
+            self.saveCheckpoint()
+            self.checkpointer.wait()
+
+        self.reporter.message(f"{20 * '#'} End of Generations {20 * '#'} ")
+        self.reporter.flush()
+
+    def checkpointState(self):
+        # Everything needed to go on with the run, population as arrays of routes and fitness values
+        return {
+            'instance_name': self.instance.instance_name,
+            'decoder': self.decoder,
+            'num_objectives': self.num_objectives,
+            'generation': self.generation,
+            'routes': numpy.array(populationArray(self.pop)),
+            'fitness_values': numpy.array([ind.fitness.values for ind in self.pop], dtype=numpy.float64),
+            'crowding_dist': numpy.array([getattr(ind.fitness, 'crowding_dist', 0.0) for ind in self.pop]),
+            'pop_ranks': self.pop_ranks,
+            'pop_distances': self.pop_distances,
+            'logbook': [dict(record) for record in self.logbook],
+            'random_state': random.getstate(),
+            'rng_state': self.rng.bit_generator.state,
+            'stopping': self.stopping.getState(),
+            'stop_reason': self.stop_reason,
+        }
+
+    def saveCheckpoint(self):
+        # State is taken here, and written by the checkpointer's thread
+        self.checkpointer.save(self.checkpointState())
+
+    def restoreCheckpoint(self, state):
+        """
+        Inputs: State dictionary saved by checkpointState
+        Outputs: None, population, logbook, random states and generation are set from it.
+                 ValueError is raised when the checkpoint was made on another instance, with
+                 another decoder or number of objectives
+        """
+        expected = {'instance_name': self.instance.instance_name, 'decoder': self.decoder,
+                    'num_objectives': self.num_objectives}
+        for key, value in expected.items():
+            if state.get(key, value) != value:
+                raise ValueError(f"Checkpoint {key} {state[key]!r} does not match {value!r} of this run")
+        if state['fitness_values'].shape[1:] != (self.num_objectives,):
+            raise ValueError(f"Checkpoint fitness values of shape {state['fitness_values'].shape} do not match "
+                             f"{self.num_objectives} objectives")
+        routes = state['routes']
+        if routes.shape != (self.pop_size, self.ind_size):
+            raise ValueError(f"Checkpoint population of shape {routes.shape} does not match "
+                             f"pop_size {self.pop_size} with {self.ind_size} customers")
+        self.pop = individualsFromArray(self.individual_class, routes)
+        for ind, fitness_values, crowding_dist in zip(self.pop, state['fitness_values'].tolist(),
+                                                     state['crowding_dist'].tolist()):
+            ind.fitness.values = fitness_values
+            ind.fitness.crowding_dist = crowding_dist
+        self.pop_ranks, self.pop_distances = state['pop_ranks'], state['pop_distances']
+
+        self.logbook.extend(state['logbook'])
+        # Records before the checkpoint are not printed again
+        self.logbook.buffindex = len(self.logbook)
+        random.setstate(state['random_state'])
+        self.rng.bit_generator.state = state['rng_state']
+        self.stopping.setState(state['stopping'])
+        self.stop_reason = state['stop_reason']
+        self.generation = state['generation']
+        # Running out of generations is no reason to stop, when resumed with more of them
+        if self.stop_reason == 'num_gen':
+            self.stop_reason = ''
+            self.logbook[-1]['stop_reason'] = ''
+
+    def resumeCheckpoint(self):
+        # Restoring the run from its checkpoint when resuming, True if there was one
+        if not (self.resume and self.checkpointer is not None):
+            return False
+        state = loadCheckpoint(self.checkpointer.path)
+        if state is None:
+            return False
+        self.restoreCheckpoint(state)
+        self.reporter.message(f"Resuming from {self.checkpointer.path} after {self.generation} generations")
+        return True
 
 
     def getBestInd(self):
         self.best_individual = tools.selBest(self.pop, 1)[0]
 
         # Printing the best after all generations
-        print(f"Best individual is {self.best_individual}")
-        print(f"Number of vechicles required are "
-              f"{self.best_individual.fitness.values[0]}")
-        print(f"Cost required for the transportation is "
-              f"{self.best_individual.fitness.values[1]}")
+        self.reporter.message(f"Best individual is {list(self.best_individual)}")
+        self.reporter.message(f"Number of vechicles required are "
+                              f"{self.best_individual.fitness.values[0]}")
+        self.reporter.message(f"Cost required for the transportation is "
+                              f"{self.best_individual.fitness.values[1]}")
+        if self.time_windows:
+            self.reporter.message(f"Lateness at the time windows is {self.best_individual.fitness.values[2]}")
 
         # Printing the route from the best individual
-        printRoute(routeToSubroute(self.best_individual, self.json_instance))
+        if self.reporter.shows(SUMMARY):
+            printRoute(routeToSubroute(self.best_individual, self.instance, self.decoder),
+                       output=self.reporter.message)
 
     def doExport(self):
-        csv_file_name = f"{self.json_instance['instance_name']}_" \
+        csv_file_name = f"{self.instance.instance_name}_" \
                         f"pop{self.pop_size}_crossProb{self.cross_prob}" \
                         f"_mutProb{self.mut_prob}_numGen{self.num_gen}.csv"
         exportCsv(csv_file_name, self.logbook)
 
     def runMain(self):
-        self.generatingPopFitness()
+        if not self.resumeCheckpoint():
+            self.generatingPopFitness()
         self.runGenerations()
         self.getBestInd()
         self.doExport()
+        self.closeRun()
+
+    def closeRun(self):
+        # Showing the timing summary, and closing the workers, checkpointer and reporter
+        if self.timer.enabled:
+            for line in self.timer.summary():
+                self.reporter.message(line)
+        self.backend.close()
+        if self.checkpointer is not None:
+            self.checkpointer.close()
+        self.reporter.close()
 
 
 
 def nsga2vrp():
 
-    # Loading the instance
+    # Loading the instance, and compiling it once for all the evaluations
     json_instance = load_instance('./data/json/Input_Data.json')
+    instance = compileInstance(json_instance)
     
     # Getting number of customers to get individual size
-    ind_size = json_instance['Number_of_customers']
+    ind_size = instance.num_customers
 
     # Setting variables
     pop_size = 400
@@ -423,7 +1159,7 @@ def nsga2vrp():
     # Creating evaluate function using our custom fitness
     #   toolbox.register is partial, *args and **kwargs can be given here
     #   and the rest of args are supplied in code
-    toolbox.register('evaluate', eval_indvidual_fitness, instance=json_instance, unit_cost = 1)
+    toolbox.register('evaluate', eval_fitness_single_pass, instance=instance, unit_cost = 1)
 
     # Selection method
     toolbox.register("select", tools.selNSGA2)
@@ -506,12 +1242,15 @@ def nsga2vrp():
             if random.random() <= cross_prob:
                 # print("Mating happened")
                 toolbox.mate(ind1, ind2)
-
-                # If cross over happened to the individuals then we are deleting those individual
-                #   fitness values, This operations are being done on the offspring population.
-                del ind1.fitness.values, ind2.fitness.values                 
-            toolbox.mutate(ind1)
-            toolbox.mutate(ind2)
+                del ind1.fitness.values, ind2.fitness.values
+            for ind in (ind1, ind2):
+                moves = []
+                toolbox.mutate(ind, moves=moves)
+
+                # Mutation changed the individual, so we are deleting its fitness values,
+                #   Unchanged copies of their parents keep the parent's fitness.
+                if moves and ind.fitness.valid:
+                    del ind.fitness.values
    
 
         # Print Checks
@@ -543,14 +1282,14 @@ def nsga2vrp():
     print(f"Cost required for the transportation is {best_individual.fitness.values[1]}")
 
     # Printing the route from the best individual
-    printRoute(routeToSubroute(best_individual, json_instance))
+    printRoute(routeToSubroute(best_individual, instance))
 
     # Extra
     print(f"Testing whether we can export logbook")
     print(logbook[1].keys())
 
     # Exporting csv
-    csv_file_name = f"{json_instance['instance_name']}_pop{pop_size}_crossProb{cross_prob}_mutProb{mut_prob}_numGen{num_gen}.csv"
+    csv_file_name = f"{instance.instance_name}_pop{pop_size}_crossProb{cross_prob}_mutProb{mut_prob}_numGen{num_gen}.csv"
     exportCsv(csv_file_name, logbook)
 
 
@@ -575,7 +1314,7 @@ if __name__ == "__main__":
 
 def testcosts():
     # Sample instance
-    test_instance = load_instance('./data/json/Input_Data.json')
+    test_instance = compileInstance(load_instance('./data/json/Input_Data.json'))
 
     # Sample individual
     sample_individual = [19, 5, 24, 7, 16, 23, 22, 2, 12, 8, 20, 25, 21, 18,11,15, 1, 14, 17, 6, 4, 13, 10, 3, 9]
@@ -595,7 +1334,7 @@ def testcosts():
 
 def testroutes():
     # Sample instance
-    test_instance = load_instance('./data/json/Input_Data.json')
+    test_instance = compileInstance(load_instance('./data/json/Input_Data.json'))
 
     # Sample individual
     sample_individual = [19, 5, 24, 7, 16, 23, 22, 2, 12, 8, 20, 25, 21, 18,11,15, 1, 14, 17, 6, 4, 13, 10, 3, 9]
@@ -0,0 +1,112 @@
+import numpy
+import threading
+
+from collections import OrderedDict
+
+
+EVICTIONS = ('lru', 'fifo')
+
+
+def routeKey(route):
+    """
+    Inputs: Individual route as a sequence of customer ids
+    Outputs: Bytes of the route as int32 array, hashable and cheap to compare
+    """
+    return numpy.asarray(route, dtype=numpy.int32).tobytes()
+
+
+class FitnessCache(object):
+    """
+    Bounded cache of fitness values keyed on the route bytes.
+    When full, the least recently used ('lru') or the oldest ('fifo') entry
+    is evicted. Hits and misses are counted until the counters are taken.
+    """
+
+    def __init__(self, maxsize=10000, eviction='lru'):
+        if eviction not in EVICTIONS:
+            raise ValueError(f"Unknown eviction {eviction}, expected one of {EVICTIONS}")
+        self.maxsize = maxsize
+        self.eviction = eviction
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        # Returns cached fitness values of the route key, or None if not cached
+        fitness_values = self.entries.get(key)
+        if fitness_values is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            if self.eviction == 'lru':
+                self.entries.move_to_end(key)
+        return fitness_values
+
+    def put(self, key, fitness_values):
+        self.entries[key] = fitness_values
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def takeCounters(self):
+        # Returns (hits, misses) since the last call and resets them
+        counters = (self.hits, self.misses)
+        self.hits, self.misses = 0, 0
+        return counters
+
+
+class SubrouteCache(FitnessCache):
+    """
+    Bounded cache of (distance, load) of single vehicle subroutes, keyed on the
+    customers of the subroute. Individuals of a converged population share most
+    of their subroutes, so their costs are looked up instead of summed again.
+    A subroute and its reverse are kept apart, so the distance of a subroute is
+    always summed in its own order and fitness does not depend on which worker
+    saw it first.
+    Lookups are guarded by a lock so threads can share the cache. It is not shared
+    between processes: every worker process gets an empty private cache of its own,
+    entries are not pickled along with it, and only its counters are sent back.
+    """
+
+    def __init__(self, maxsize=100000, eviction='lru'):
+        super().__init__(maxsize, eviction)
+        self.lock = threading.Lock()
+
+    def __getstate__(self):
+        return {'maxsize': self.maxsize, 'eviction': self.eviction}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def key(self, subroute):
+        """
+        Inputs: Customers of a subroute as list
+        Outputs: Tuple of the subroute. Subroutes are short, so tuples hash faster
+                 than going through a numpy array
+        """
+        return tuple(subroute)
+
+    def get(self, key):
+        with self.lock:
+            return super().get(key)
+
+    def getMany(self, keys):
+        # Cached (distance, load) of every key or None, looked up under one lock
+        with self.lock:
+            return [FitnessCache.get(self, key) for key in keys]
+
+    def put(self, key, distance_load):
+        with self.lock:
+            super().put(key, distance_load)
+
+    def addCounters(self, hits, misses):
+        # Counting the lookups made by a copy of the cache in a worker process
+        with self.lock:
+            self.hits += hits
+            self.misses += misses
+
+    def takeCounters(self):
+        with self.lock:
+            return super().takeCounters()
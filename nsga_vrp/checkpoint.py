@@ -0,0 +1,75 @@
+import os
+import pickle
+import tempfile
+
+from concurrent.futures import ThreadPoolExecutor
+
+
+def writeAtomic(path, state):
+    """
+    Inputs: path - checkpoint file to write
+            state - dictionary to save
+    Outputs: None. State is pickled to a temporary file in the same directory, which then
+             replaces the checkpoint in one step, so a crash while writing leaves the
+             previous checkpoint as it was
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    file_descriptor, temp_path = tempfile.mkstemp(dir=directory, prefix='.checkpoint_', suffix='.tmp')
+    try:
+        with os.fdopen(file_descriptor, 'wb') as file_object:
+            pickle.dump(state, file_object, protocol=pickle.HIGHEST_PROTOCOL)
+            file_object.flush()
+            os.fsync(file_object.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def loadCheckpoint(path):
+    """
+    Inputs: Path of a checkpoint written by Checkpointer
+    Outputs: Saved state dictionary, or None if there is no checkpoint yet
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, 'rb') as file_object:
+        return pickle.load(file_object)
+
+
+class Checkpointer(object):
+    """
+    Writes checkpoints in a background thread, so the generations go on while the
+    previous state is pickled and written. At most one write is in flight, a new
+    one waits for it, and close waits for the last one.
+    """
+
+    def __init__(self, path, interval=10):
+        self.path = path
+        self.interval = interval
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.pending = None
+
+    def due(self, generations):
+        # Whether a checkpoint is taken after this many generations
+        return self.interval > 0 and generations % self.interval == 0
+
+    def save(self, state):
+        """
+        Inputs: State dictionary, which must not be changed by the caller afterwards
+        Outputs: None, the state is written in the background
+        """
+        self.wait()
+        self.pending = self.executor.submit(writeAtomic, self.path, state)
+
+    def wait(self):
+        # Waiting for the write in flight, raising its error if it failed
+        if self.pending is not None:
+            pending, self.pending = self.pending, None
+            pending.result()
+
+    def close(self):
+        self.wait()
+        self.executor.shutdown()
@@ -0,0 +1,98 @@
+import bisect
+
+from collections import namedtuple
+
+
+# Subroutes of an evaluated route: position where each subroute starts in the
+#   route, distance driven by its vehicle and load carried by it
+SplitState = namedtuple('SplitState', ['starts', 'costs', 'loads'])
+
+
+def resplitFrom(individual, instance, position, state, parent_state=None, changed=()):
+    """
+    Inputs: individual - route to split
+            instance - compiled VrpInstance
+            position - position in route where the next subroute starts
+            state - SplitState of the subroutes before position, extended in place
+            parent_state - SplitState of a route that differs from this one only at changed
+            changed - sorted positions at which the route differs from the parent route
+    Outputs: SplitState of the whole route. Whenever a subroute starts at the same position
+             as one of the parent's, the parent subroutes up to the next changed position
+             are reused instead of walking them again.
+    """
+    size = len(individual)
+    vehicle_capacity = instance.vehicle_capacity
+    demands = instance.demands
+
+    while position < size:
+        if parent_state is not None:
+            parent_index = bisect.bisect_left(parent_state.starts, position)
+            if parent_index < len(parent_state.starts) and parent_state.starts[parent_index] == position:
+                # A parent subroute is same only if its customers and the customer starting the next
+                #   subroute are unchanged, so reuse stops at the subroute holding the one before
+                #   next changed position
+                changed_index = bisect.bisect_left(changed, position)
+                if changed_index == len(changed):
+                    reuse_until = len(parent_state.starts)
+                else:
+                    reuse_until = bisect.bisect_right(parent_state.starts, changed[changed_index] - 1) - 1
+                if reuse_until > parent_index:
+                    state.starts.extend(parent_state.starts[parent_index:reuse_until])
+                    state.costs.extend(parent_state.costs[parent_index:reuse_until])
+                    state.loads.extend(parent_state.loads[parent_index:reuse_until])
+                    if reuse_until == len(parent_state.starts):
+                        return state
+                    position = parent_state.starts[reuse_until]
+
+        # Walking one subroute, from depot until the next customer does not fit in vehicle
+        customer_id = individual[position]
+        vehicle_load = demands.item(customer_id)
+        sub_route_distance = instance.distance(0, customer_id)
+        end = position + 1
+        while end < size:
+            next_customer_id = individual[end]
+            demand = demands.item(next_customer_id)
+            if vehicle_load + demand > vehicle_capacity:
+                break
+            vehicle_load += demand
+            sub_route_distance += instance.distance(customer_id, next_customer_id)
+            customer_id = next_customer_id
+            end += 1
+        sub_route_distance += instance.distance(customer_id, 0)
+
+        state.starts.append(position)
+        state.costs.append(sub_route_distance)
+        state.loads.append(vehicle_load)
+        position = end
+
+    return state
+
+
+def splitState(individual, instance):
+    """
+    Inputs: Individual route, compiled VrpInstance
+    Outputs: SplitState of all the subroutes of the route
+    """
+    return resplitFrom(individual, instance, 0, SplitState([], [], []))
+
+
+def swapDeltaState(individual, parent_state, moves, instance):
+    """
+    Inputs: individual - route after the swaps were applied to it
+            parent_state - SplitState of the route before the swaps
+            moves - list of (position1, position2) swaps that were applied
+            instance - compiled VrpInstance
+    Outputs: SplitState of the individual. Only the subroutes around the swapped positions
+             are walked again, all the others are taken from the parent.
+    """
+    changed = sorted({position for move in moves for position in move})
+    return resplitFrom(individual, instance, 0, SplitState([], [], []),
+                       parent_state=parent_state, changed=changed)
+
+
+def stateFitness(state, unit_cost=1):
+    """
+    Inputs: SplitState of a route, unit cost for the distance
+    Outputs: Tuple of (Number of vechicles, Route cost from all the vechicles)
+    """
+    return (len(state.starts), unit_cost*sum(state.costs))
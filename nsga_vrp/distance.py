@@ -0,0 +1,191 @@
+import math
+import numpy
+import threading
+
+from collections import OrderedDict
+
+
+# Rounding conventions for distances, Solomon truncates to one decimal
+#   and TSPLIB EUC_2D rounds to the nearest integer
+ROUNDINGS = (None, 'solomon', 'tsplib')
+
+
+def roundDistances(distances, rounding=None):
+    """
+    Inputs: Array of euclidean distances, rounding convention from ROUNDINGS
+    Outputs: Distances rounded in place according to the convention
+    """
+    if rounding == 'solomon':
+        distances *= 10
+        numpy.floor(distances, out=distances)
+        distances /= 10
+    elif rounding == 'tsplib':
+        distances += 0.5
+        numpy.floor(distances, out=distances)
+    elif rounding is not None:
+        raise ValueError(f"Unknown rounding {rounding}, expected one of {ROUNDINGS}")
+    return distances
+
+
+def roundDistance(distance, rounding=None):
+    # Same as roundDistances, for a single distance
+    if rounding == 'solomon':
+        return math.floor(distance * 10) / 10
+    if rounding == 'tsplib':
+        return float(math.floor(distance + 0.5))
+    return distance
+
+
+def nearestInRows(rows_distances, row_ids, k):
+    """
+    Inputs: rows_distances - distances from some places (rows) to all places (columns)
+            row_ids - place id of each row
+            k - number of neighbours
+    Outputs: Array of shape (rows, k) with the k nearest customers of each row,
+             nearest first, never the place itself or the depot
+    """
+    rows_distances = numpy.array(rows_distances, dtype=numpy.float64)
+    rows_distances[:, 0] = numpy.inf
+    rows_distances[numpy.arange(len(row_ids)), row_ids] = numpy.inf
+    k = min(k, rows_distances.shape[1] - 2)
+    nearest = numpy.argpartition(rows_distances, k - 1, axis=1)[:, :k]
+    order = numpy.argsort(numpy.take_along_axis(rows_distances, nearest, axis=1), axis=1, kind='stable')
+    return numpy.take_along_axis(nearest, order, axis=1)
+
+
+class MatrixDistance(object):
+    """
+    Distances looked up in a dense (possibly memory mapped) distance matrix.
+    """
+
+    def __init__(self, distance_matrix):
+        self.distance_matrix = numpy.ascontiguousarray(distance_matrix)
+
+    def pairs(self, from_ids, to_ids):
+        # Distances from each from_id to the matching to_id, ids are broadcast against each other
+        return self.distance_matrix[from_ids, to_ids]
+
+    def one(self, from_id, to_id):
+        # Single distance as python float
+        return self.distance_matrix.item(from_id, to_id)
+
+    def row(self, place_id):
+        # Distances from one place to all the places
+        return self.distance_matrix[place_id]
+
+    def isSymmetric(self, block_rows=1024):
+        """
+        Inputs: block_rows - side of the square blocks compared at once
+        Outputs: Whether every distance is the same both ways. Each block above the diagonal
+                 is compared with its mirror block, so a memory mapped matrix is read block
+                 by block and the check stops at the first difference
+        """
+        num_places = len(self.distance_matrix)
+        for row_start in range(0, num_places, block_rows):
+            rows = slice(row_start, row_start + block_rows)
+            for column_start in range(row_start, num_places, block_rows):
+                columns = slice(column_start, column_start + block_rows)
+                if not numpy.array_equal(self.distance_matrix[rows, columns], self.distance_matrix[columns, rows].T):
+                    return False
+        return True
+
+    def nearestNeighbours(self, k, block_rows=1024):
+        """
+        Inputs: k - number of neighbours, block_rows - rows searched at once
+        Outputs: Array of shape (number of places, k) with the k nearest customers of every place
+        """
+        num_places = len(self.distance_matrix)
+        return numpy.concatenate([nearestInRows(self.distance_matrix[start:start + block_rows],
+                                                numpy.arange(start, min(start + block_rows, num_places)), k)
+                                  for start in range(0, num_places, block_rows)])
+
+
+class EuclideanDistance(object):
+    """
+    Distances computed on demand from the coordinates, so memory grows with the
+    number of places instead of its square. Rows of distances from a single place
+    to many others, like the depot's, can be kept in a bounded cache, which single
+    distances are read from when their row is there. A single distance never builds
+    a row, and the cache is guarded by a lock so threads can share it.
+    """
+
+    def __init__(self, coordinates, rounding=None, cache_rows=0):
+        if rounding not in ROUNDINGS:
+            raise ValueError(f"Unknown rounding {rounding}, expected one of {ROUNDINGS}")
+        coordinates = numpy.asarray(coordinates, dtype=numpy.float64)
+        self.x_coord = numpy.ascontiguousarray(coordinates[:, 0])
+        self.y_coord = numpy.ascontiguousarray(coordinates[:, 1])
+        self.x_list, self.y_list = self.x_coord.tolist(), self.y_coord.tolist()
+        self.rounding = rounding
+        self.cache_rows = cache_rows
+        self.rows = OrderedDict()
+        self.lock = threading.Lock()
+
+    def __getstate__(self):
+        # Worker processes start with an empty row cache of their own
+        state = self.__dict__.copy()
+        state['rows'] = OrderedDict()
+        del state['lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+    def pairs(self, from_ids, to_ids):
+        # Distances from each from_id to the matching to_id, ids are broadcast against each other.
+        #   Distances from a single place to many, like from the depot, go through its cached row
+        if self.cache_rows and numpy.ndim(from_ids) == 0 and numpy.ndim(to_ids) > 0:
+            return self.row(int(from_ids))[to_ids]
+        return self.computePairs(from_ids, to_ids)
+
+    def computePairs(self, from_ids, to_ids):
+        # Distances computed from the coordinates, without going through the row cache
+        x_delta = self.x_coord[from_ids] - self.x_coord[to_ids]
+        y_delta = self.y_coord[from_ids] - self.y_coord[to_ids]
+        distances = numpy.sqrt(x_delta * x_delta + y_delta * y_delta)
+        if self.rounding is None:
+            return distances
+        return roundDistances(numpy.asarray(distances, dtype=numpy.float64), self.rounding)
+
+    def one(self, from_id, to_id):
+        # Single distance as python float, from the row of from_id if it is cached, or else computed alone
+        if self.cache_rows:
+            with self.lock:
+                row = self.rows.get(from_id)
+                if row is not None:
+                    self.rows.move_to_end(from_id)
+                    return row.item(to_id)
+        x_delta = self.x_list[from_id] - self.x_list[to_id]
+        y_delta = self.y_list[from_id] - self.y_list[to_id]
+        return roundDistance(math.sqrt(x_delta * x_delta + y_delta * y_delta), self.rounding)
+
+    def row(self, place_id):
+        # Distances from one place to all the places, kept in the row cache if it is enabled
+        if not self.cache_rows:
+            return self.computePairs(place_id, slice(None))
+        with self.lock:
+            row = self.rows.get(place_id)
+            if row is not None:
+                self.rows.move_to_end(place_id)
+                return row
+        row = self.computePairs(place_id, slice(None))
+        with self.lock:
+            self.rows[place_id] = row
+            self.rows.move_to_end(place_id)
+            if len(self.rows) > self.cache_rows:
+                self.rows.popitem(last=False)
+        return row
+
+    def nearestNeighbours(self, k, block_rows=1024):
+        """
+        Inputs: k - number of neighbours, block_rows - rows computed at once
+        Outputs: Array of shape (number of places, k) with the k nearest customers of every place
+        """
+        num_places = len(self.x_coord)
+        neighbours = []
+        for start in range(0, num_places, block_rows):
+            row_ids = numpy.arange(start, min(start + block_rows, num_places))
+            neighbours.append(nearestInRows(self.computePairs(row_ids[:, None], numpy.arange(num_places)[None, :]),
+                                            row_ids, k))
+        return numpy.concatenate(neighbours)
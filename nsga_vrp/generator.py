@@ -0,0 +1,137 @@
+import math
+import numpy
+
+from nsga_vrp.instance import VrpInstance
+from nsga_vrp.utils import buildDistanceMatrix
+
+
+# Customer layouts like Solomon's R, C and RC sets: spread uniformly, gathered
+#   around a few cluster centres, or half of them each way
+LAYOUTS = ('random', 'clustered', 'mixed')
+
+# Depot in the centre of the grid, at its corner, or anywhere on it
+DEPOTS = ('center', 'corner', 'random')
+
+# Demands all 1, uniform in [1, 100], mostly small with a few large ones (small_large),
+#   or larger for the customers in two opposite quadrants around the depot
+DEMANDS = ('unitary', 'uniform', 'small_large', 'quadrant')
+
+
+def customerCoordinates(rng, num_customers, layout, grid_size, num_clusters, cluster_spread):
+    """
+    Inputs: rng - numpy random Generator
+            num_customers - number of customers to place
+            layout - one of LAYOUTS
+            grid_size - side of the square the customers are placed in
+            num_clusters - number of cluster centres of the clustered customers
+            cluster_spread - standard deviation around a centre, as fraction of grid_size
+    Outputs: Array of shape (num_customers, 2) with x, y of every customer
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout {layout}, expected one of {LAYOUTS}")
+    num_clustered = {'random': 0, 'clustered': num_customers, 'mixed': num_customers // 2}[layout]
+
+    coordinates = rng.uniform(0, grid_size, (num_customers, 2))
+    if num_clustered:
+        centres = rng.uniform(0, grid_size, (num_clusters, 2))
+        cluster_of = rng.integers(0, num_clusters, num_clustered)
+        clustered = centres[cluster_of] + rng.normal(0, cluster_spread * grid_size, (num_clustered, 2))
+        coordinates[:num_clustered] = numpy.clip(clustered, 0, grid_size)
+        # Clustered and random customers mixed along the customer ids
+        coordinates = coordinates[rng.permutation(num_customers)]
+    return coordinates
+
+
+def depotCoordinates(rng, depot, grid_size):
+    # Coordinates of the depot placed as given by one of DEPOTS
+    if depot == 'center':
+        return numpy.array([grid_size / 2, grid_size / 2])
+    if depot == 'corner':
+        return numpy.array([0.0, 0.0])
+    if depot == 'random':
+        return rng.uniform(0, grid_size, 2)
+    raise ValueError(f"Unknown depot {depot}, expected one of {DEPOTS}")
+
+
+def customerDemands(rng, num_customers, demand, coordinates, depot_coordinates):
+    """
+    Inputs: rng - numpy random Generator
+            num_customers - number of customers
+            demand - distribution, one of DEMANDS
+            coordinates, depot_coordinates - places, used by the quadrant distribution
+    Outputs: Integral demands of the customers as float array
+    """
+    if demand == 'unitary':
+        return numpy.ones(num_customers)
+    if demand == 'uniform':
+        return rng.integers(1, 101, num_customers).astype(numpy.float64)
+    if demand == 'small_large':
+        # About 80% of the customers ask for 1 to 10, the rest for 50 to 100
+        large = rng.random(num_customers) < 0.2
+        return numpy.where(large, rng.integers(50, 101, num_customers), rng.integers(1, 11, num_customers)) \
+            .astype(numpy.float64)
+    if demand == 'quadrant':
+        # Customers up right or down left of the depot ask for more
+        offsets = coordinates - depot_coordinates
+        high = (offsets[:, 0] >= 0) == (offsets[:, 1] >= 0)
+        return numpy.where(high, rng.integers(51, 101, num_customers), rng.integers(1, 51, num_customers)) \
+            .astype(numpy.float64)
+    raise ValueError(f"Unknown demand {demand}, expected one of {DEMANDS}")
+
+
+def generateInstance(num_customers, layout='random', depot='center', demand='uniform', tightness=0.9,
+                     route_size=10, num_clusters=None, cluster_spread=0.04, grid_size=1000, service_time=0,
+                     rounding=None, matrix=False, dtype=numpy.float64, seed=None, instance_name=None):
+    """
+    Inputs: num_customers - number of customers
+            layout - customer layout from LAYOUTS
+            depot - depot placement from DEPOTS
+            demand - demand distribution from DEMANDS
+            tightness - total demand over the capacity of the whole fleet, near 1 the
+                        vehicles are nearly full
+            route_size - average number of customers a vehicle serves, which sets the fleet
+            num_clusters - cluster centres of the clustered layouts, about one per 100 customers
+                           (at least 3) if not given
+            cluster_spread - standard deviation around a cluster centre, as fraction of grid_size
+            grid_size - side of the square the places are on
+            service_time - service time of every customer
+            rounding - rounding convention of the distances from ROUNDINGS
+            matrix - whether to build the distance matrix, or compute distances when needed
+            dtype - float type of the distance matrix
+            seed - random seed, same seed and arguments give the same instance
+            instance_name - name of the instance, made from the arguments if not given
+    Outputs: VrpInstance, whose time windows span the whole horizon so they never bind
+    """
+    if not 0 < tightness <= 1:
+        raise ValueError(f"Tightness must be in (0, 1], got {tightness}")
+    rng = numpy.random.default_rng(seed)
+    num_clusters = num_clusters or max(3, num_customers // 100)
+
+    depot_coordinates = depotCoordinates(rng, depot, grid_size)
+    customer_coordinates = customerCoordinates(rng, num_customers, layout, grid_size, num_clusters, cluster_spread)
+    coordinates = numpy.vstack([depot_coordinates, customer_coordinates])
+    demands = numpy.concatenate([[0.0], customerDemands(rng, num_customers, demand, customer_coordinates,
+                                                        depot_coordinates)])
+
+    # Fleet big enough for route_size customers per vehicle, capacity so that it is filled to tightness
+    max_vehicle_number = max(math.ceil(num_customers / route_size), 1)
+    vehicle_capacity = max(math.ceil(demands.sum() / (tightness * max_vehicle_number)), demands.max())
+
+    # Horizon long enough for a vehicle to visit every customer in turn
+    places = num_customers + 1
+    horizon = float(math.ceil(2 * grid_size * math.sqrt(2) + num_customers * (service_time + grid_size)))
+    service_times = numpy.full(places, float(service_time))
+    service_times[0] = 0
+
+    distance_matrix = buildDistanceMatrix(coordinates, dtype=dtype, rounding=rounding) if matrix else None
+    instance_name = instance_name or f"synthetic_{layout}_{num_customers}_seed{seed}"
+    return VrpInstance(instance_name=instance_name,
+                       vehicle_capacity=vehicle_capacity,
+                       max_vehicle_number=max_vehicle_number,
+                       coordinates=coordinates,
+                       demands=demands,
+                       ready_times=numpy.zeros(places),
+                       due_times=numpy.full(places, horizon),
+                       service_times=service_times,
+                       distance_matrix=distance_matrix,
+                       rounding=rounding)
@@ -0,0 +1,68 @@
+import array
+import numpy
+
+from copy import deepcopy
+from deap import creator
+
+
+# Representations of an individual, a python list of customer ids or a typed int array
+INDIVIDUALS = ('list', 'array')
+
+
+class ArrayIndividual(array.array):
+    """
+    Route held as a C int array instead of a list of python ints.
+    Slots keep the fitness and the delta evaluation state without a
+    per-individual __dict__, so an individual is one small object and
+    cloning it is a memory copy plus the fitness. Fitness is the
+    creator.FitnessMin of the algorithm, which must be created first.
+    """
+
+    __slots__ = ('fitness', 'split_state')
+
+    def __new__(cls, route=()):
+        return super(ArrayIndividual, cls).__new__(cls, 'i', route)
+
+    def __init__(self, route=()):
+        self.fitness = creator.FitnessMin()
+
+    def __deepcopy__(self, memo):
+        copy_ = self.__class__(self)
+        memo[id(self)] = copy_
+        copy_.fitness = deepcopy(self.fitness, memo)
+        # Split state is never changed in place, so the copy can share it
+        copy_.split_state = getattr(self, 'split_state', None)
+        return copy_
+
+    def __reduce_ex__(self, protocol):
+        # array.array has its own __reduce_ex__, which would drop the slots
+        return (self.__class__, (list(self),), {'fitness': self.fitness})
+
+    def __setstate__(self, state):
+        self.fitness = state['fitness']
+
+
+def populationArray(individuals):
+    """
+    Inputs: List of individuals of same length, lists or ArrayIndividual
+    Outputs: 2-D int32 array with one row per individual
+    """
+    if individuals and isinstance(individuals[0], array.array) and individuals[0].itemsize == 4:
+        # Typed arrays are joined as raw bytes, without going through python ints
+        route_len = len(individuals[0])
+        flat = numpy.frombuffer(b''.join(individuals), dtype=numpy.intc)
+        return flat.reshape(len(individuals), route_len).astype(numpy.int32, copy=False)
+    return numpy.asarray(individuals, dtype=numpy.int32)
+
+
+def individualsFromArray(individual_class, population):
+    """
+    Inputs: individual_class - class of the individuals to create
+            population - 2-D array with one route per row
+    Outputs: List of new individuals without fitness, one for each row
+    """
+    if issubclass(individual_class, array.array):
+        # Typed arrays are filled straight from the bytes of each row
+        rows = numpy.ascontiguousarray(population, dtype=numpy.intc)
+        return [individual_class(row.tobytes()) for row in rows]
+    return [individual_class(route) for route in numpy.asarray(population).tolist()]
@@ -0,0 +1,199 @@
+import os
+import io
+import copy
+import numpy
+
+from json import dump
+from nsga_vrp.distance import MatrixDistance, EuclideanDistance
+from nsga_vrp.cache import SubrouteCache
+
+
+# Value of 'format' in the metadata json of an instance saved by writeBinaryInstance
+BINARY_FORMAT = 'binary'
+
+
+class VrpInstance(object):
+    """
+    Compiled form of a loaded problem instance.
+    Every per-place attribute is a contiguous numpy array where index 0 is
+    the depot and index i is customer_i, so a customer id from an individual
+    can be used directly as an index.
+    """
+
+    def __init__(self, instance_name, vehicle_capacity, max_vehicle_number, coordinates,
+                 demands, ready_times, due_times, service_times, distance_matrix=None,
+                 rounding=None, cache_rows=0, symmetric=None):
+        self.instance_name = instance_name
+        self.vehicle_capacity = float(vehicle_capacity)
+        self.max_vehicle_number = max_vehicle_number
+        self.coordinates = numpy.ascontiguousarray(coordinates, dtype=numpy.float64)
+        self.demands = numpy.ascontiguousarray(demands, dtype=numpy.float64)
+        self.ready_times = numpy.ascontiguousarray(ready_times, dtype=numpy.float64)
+        self.due_times = numpy.ascontiguousarray(due_times, dtype=numpy.float64)
+        self.service_times = numpy.ascontiguousarray(service_times, dtype=numpy.float64)
+        self.rounding = rounding
+
+        # Distances come from the matrix when there is one, or else are
+        #   computed from the coordinates whenever they are needed
+        if distance_matrix is not None:
+            self.distances = MatrixDistance(distance_matrix)
+            self.distance_matrix = self.distances.distance_matrix
+        else:
+            self.distances = EuclideanDistance(self.coordinates, rounding=rounding, cache_rows=cache_rows)
+            self.distance_matrix = None
+        # Whether distances are the same both ways, checked on the matrix the first time it is
+        #   asked for unless already known, like from the metadata of a binary instance
+        self.symmetric_distances = True if distance_matrix is None else symmetric
+        # Cache of subroute distances and loads, only set on the copy made by withSubrouteCache
+        self.subroute_cache = None
+
+    @property
+    def num_customers(self):
+        return len(self.demands) - 1
+
+    @classmethod
+    def fromJson(cls, json_instance):
+        """
+        Inputs: json object returned by load_instance
+        Outputs: VrpInstance holding the same data as numpy arrays
+        """
+        num_customers = json_instance['Number_of_customers']
+        places = [json_instance['depart']] + \
+                 [json_instance[f'customer_{customer_id}'] for customer_id in range(1, num_customers + 1)]
+        return cls(instance_name=json_instance['instance_name'],
+                   vehicle_capacity=json_instance['vehicle_capacity'],
+                   max_vehicle_number=json_instance['max_vehicle_number'],
+                   coordinates=[(place['coordinates']['x'], place['coordinates']['y']) for place in places],
+                   demands=[place['demand'] for place in places],
+                   ready_times=[place['ready_time'] for place in places],
+                   due_times=[place['due_time'] for place in places],
+                   service_times=[place['service_time'] for place in places],
+                   distance_matrix=json_instance.get('distance_matrix'),
+                   rounding=json_instance.get('rounding'))
+
+    def matrixFree(self, cache_rows=0):
+        """
+        Inputs: Number of distance rows to keep in cache, 0 keeps none
+        Outputs: Same instance, computing distances from coordinates instead of a matrix
+        """
+        return VrpInstance(self.instance_name, self.vehicle_capacity, self.max_vehicle_number, self.coordinates,
+                           self.demands, self.ready_times, self.due_times, self.service_times,
+                           rounding=self.rounding, cache_rows=cache_rows)
+
+    @property
+    def symmetric(self):
+        # Whether every distance is the same both ways, always so when computed from coordinates
+        if self.symmetric_distances is None:
+            self.symmetric_distances = self.distances.isSymmetric()
+        return self.symmetric_distances
+
+    def withSubrouteCache(self, maxsize=100000, eviction='lru'):
+        """
+        Inputs: Number of subroutes to keep and their eviction, 'lru' or 'fifo'
+        Outputs: Copy of the instance sharing its arrays, with a subroute cache of its own
+        """
+        instance = copy.copy(self)
+        instance.subroute_cache = SubrouteCache(maxsize, eviction)
+        return instance
+
+    def pairDistances(self, from_ids, to_ids):
+        """
+        Inputs: Arrays (or scalars) of place ids, broadcast against each other
+        Outputs: Array of distances from each from_id to the matching to_id
+        """
+        return self.distances.pairs(from_ids, to_ids)
+
+    def distance(self, from_id, to_id):
+        # Single distance as python float, for walks that go one customer at a time
+        return self.distances.one(from_id, to_id)
+
+    def nearestNeighbours(self, k):
+        # k nearest customers of every place, as array of shape (number of places, k)
+        return self.distances.nearestNeighbours(k)
+
+
+def compileInstance(instance):
+    """
+    Inputs: Either a json object from load_instance or an already compiled VrpInstance
+    Outputs: VrpInstance, compiled only if it was not one already
+    """
+    if isinstance(instance, VrpInstance):
+        return instance
+    return VrpInstance.fromJson(instance)
+
+
+def requireInstance(instance):
+    """
+    Inputs: Instance given to a per route or per population helper
+    Outputs: The same VrpInstance. Json objects are refused, as compiling them on
+             every call would build the distance matrix again each time
+    """
+    if not isinstance(instance, VrpInstance):
+        raise TypeError(f"Expected a compiled VrpInstance, got {type(instance).__name__}, "
+                        f"compile it once with compileInstance")
+    return instance
+
+
+def writeBinaryInstance(instance, json_file):
+    """
+    Inputs: instance - json object or VrpInstance
+            json_file - path of the metadata json to write
+    Outputs: None. Writes the metadata json, the per place arrays next to it
+             as <name>.npz and the distance matrix as raw <name>_distance.npy,
+             which is opened memory mapped by load_instance. A matrix free
+             instance is written without the distance matrix.
+    """
+    instance = compileInstance(instance)
+    base_path = os.path.splitext(json_file)[0]
+    arrays_file = f"{base_path}.npz"
+    distance_matrix_file = f"{base_path}_distance.npy"
+
+    numpy.savez(arrays_file,
+                coordinates=instance.coordinates,
+                demands=instance.demands,
+                ready_times=instance.ready_times,
+                due_times=instance.due_times,
+                service_times=instance.service_times)
+    if instance.distance_matrix is None:
+        distance_matrix_file = None
+    else:
+        numpy.save(distance_matrix_file, instance.distance_matrix)
+
+    # Metadata keeps file names relative to itself, so the files can be moved together
+    metadata = {
+        'format': BINARY_FORMAT,
+        'instance_name': instance.instance_name,
+        'vehicle_capacity': instance.vehicle_capacity,
+        'max_vehicle_number': instance.max_vehicle_number,
+        'Number_of_customers': instance.num_customers,
+        'arrays_file': os.path.basename(arrays_file),
+        'distance_matrix_file': distance_matrix_file and os.path.basename(distance_matrix_file),
+        'rounding': instance.rounding,
+        'symmetric': instance.symmetric,
+    }
+    with io.open(json_file, 'wt', newline='') as file_object:
+        dump(metadata, file_object, sort_keys=True, indent=4, separators=(',', ': '))
+
+
+def loadBinaryInstance(json_file, metadata):
+    """
+    Inputs: json_file - path of the metadata json
+            metadata - loaded metadata json object
+    Outputs: VrpInstance whose distance matrix is memory mapped read only, so processes
+             opening the same instance share one page cached copy and nothing is parsed
+    """
+    base_dir = os.path.dirname(os.path.abspath(json_file))
+    with numpy.load(os.path.join(base_dir, metadata['arrays_file'])) as arrays:
+        places = {name: arrays[name] for name in arrays.files}
+    # Without distance matrix file, distances are computed from coordinates
+    distance_matrix = None
+    if metadata.get('distance_matrix_file'):
+        distance_matrix = numpy.load(os.path.join(base_dir, metadata['distance_matrix_file']), mmap_mode='r')
+
+    return VrpInstance(instance_name=metadata['instance_name'],
+                       vehicle_capacity=metadata['vehicle_capacity'],
+                       max_vehicle_number=metadata['max_vehicle_number'],
+                       distance_matrix=distance_matrix,
+                       rounding=metadata.get('rounding'),
+                       symmetric=metadata.get('symmetric'),
+                       **places)
@@ -0,0 +1,209 @@
+import os
+import csv
+import queue
+import random
+import traceback
+import multiprocessing
+
+from deap import tools
+from nsga_vrp.NSGA2_vrp import nsgaAlgo, BASE_DIR
+
+
+TOPOLOGIES = ('ring', 'full')
+
+
+def migrationTargets(island, num_islands, topology):
+    """
+    Inputs: index of the island, number of islands, topology name
+    Outputs: List of islands this island sends its migrants to
+    """
+    if topology not in TOPOLOGIES:
+        raise ValueError(f"Unknown topology {topology}, expected one of {TOPOLOGIES}")
+    if num_islands < 2:
+        return []
+    if topology == 'ring':
+        return [(island + 1) % num_islands]
+    return [other for other in range(num_islands) if other != island]
+
+
+def migrationSources(island, num_islands, topology):
+    """
+    Inputs: index of the island, number of islands, topology name
+    Outputs: List of islands this island receives migrants from
+    """
+    return [other for other in range(num_islands)
+            if island in migrationTargets(other, num_islands, topology)]
+
+
+def paretoFront(population, k=None):
+    """
+    Inputs: population with valid fitness, maximum number of individuals to return
+    Outputs: Non dominated individuals as list of (route, fitness values)
+    """
+    front = tools.sortNondominated(population, len(population), first_front_only=True)[0]
+    return [(list(ind), ind.fitness.values) for ind in front[:k]]
+
+
+def dominates(fitness_values1, fitness_values2):
+    # All objectives are minimized
+    return all(x <= y for x, y in zip(fitness_values1, fitness_values2)) and \
+           any(x < y for x, y in zip(fitness_values1, fitness_values2))
+
+
+def mergeFronts(fronts):
+    """
+    Inputs: List of fronts, each a list of (route, fitness values)
+    Outputs: Global non dominated front without duplicate routes,
+             sorted by fitness values
+    """
+    candidates = {}
+    for front in fronts:
+        for route, fitness_values in front:
+            candidates[tuple(route)] = tuple(fitness_values)
+
+    merged = [(list(route), fitness_values) for route, fitness_values in candidates.items()
+              if not any(dominates(other, fitness_values) for other in candidates.values())]
+    return sorted(merged, key=lambda member: member[1])
+
+
+def runIsland(island, num_islands, topology, migration_interval, num_migrants, inboxes, results,
+              algo_kwargs, seed):
+    # Evolving one island in its own process, every migration_interval generations
+    #   its non dominated individuals are sent to the target islands and the
+    #   ones from source islands are received in their place. Migrants are sent as
+    #   (island, migration round, migrants), so that ones from a source already in a
+    #   later round are kept for that round. Its front, or the traceback of what went
+    #   wrong, is put on results
+    random.seed(None if seed is None else seed + island)
+    targets = migrationTargets(island, num_islands, topology)
+    # Sources still running, one that stopped sends None instead of a round and migrants
+    running_sources = set(migrationSources(island, num_islands, topology))
+    # Migrants received ahead of their round, as {round: [(source, migrants)]}
+    pending = {}
+    algo = front = error = None
+
+    def migrate(generations):
+        if generations % migration_interval or generations >= algo.num_gen:
+            return
+        migration_round = generations // migration_interval
+        migrants = paretoFront(algo.pop, num_migrants)
+        for target in targets:
+            inboxes[target].put((island, migration_round, migrants))
+        received = set()
+        for source, immigrants in pending.pop(migration_round, []):
+            algo.addImmigrants(immigrants)
+            received.add(source)
+        while running_sources - received:
+            source, source_round, immigrants = inboxes[island].get()
+            if source_round is None:
+                running_sources.discard(source)
+            elif source_round > migration_round:
+                pending.setdefault(source_round, []).append((source, immigrants))
+            elif source_round == migration_round:
+                algo.addImmigrants(immigrants)
+                received.add(source)
+            # Migrants of a round already over are dropped
+
+    try:
+        algo = nsgaAlgo(**algo_kwargs)
+        if algo.profile_window is not None:
+            # Every island profiles into a file of its own
+            root, extension = os.path.splitext(algo.profile_window.output)
+            algo.profile_window.output = f"{root}_island{island}{extension}"
+        algo.generatingPopFitness()
+        algo.runGenerations(migrate)
+        front = paretoFront(algo.pop)
+    except Exception:
+        error = traceback.format_exc()
+    finally:
+        # Islands waiting for migrants from this one go on without them
+        for target in targets:
+            inboxes[target].put((island, None, None))
+        if algo is not None:
+            algo.closeRun()
+    results.put((island, front, error))
+
+
+def stopIslands(processes):
+    # Terminating the islands still running, after one of them failed
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+    for process in processes:
+        process.join()
+
+
+def runIslands(num_islands=4, topology='ring', migration_interval=10, num_migrants=5, seed=None,
+               poll_seconds=1.0, **algo_kwargs):
+    """
+    Inputs: num_islands - number of populations evolving in separate processes
+            topology - 'ring' or 'full', which islands exchange migrants
+            migration_interval - number of generations between migrations
+            num_migrants - maximum non dominated individuals sent by an island
+            seed - base random seed, each island adds its index to it
+            poll_seconds - how often islands are checked for having died while waiting on them
+            algo_kwargs - arguments for each island's nsgaAlgo, without checkpointing as
+                          islands can only be resumed all together
+    Outputs: Global non dominated front as list of (route, fitness values). RuntimeError
+             is raised, after terminating the other islands, when one of them fails
+    """
+    if algo_kwargs.get('checkpoint') or algo_kwargs.get('resume'):
+        raise ValueError("Islands cannot be checkpointed or resumed")
+    if 'fork' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('fork')
+    else:
+        context = multiprocessing.get_context()
+
+    inboxes = [context.Queue() for _ in range(num_islands)]
+    results = context.Queue()
+    processes = [context.Process(target=runIsland,
+                                 args=(island, num_islands, topology, migration_interval, num_migrants,
+                                       inboxes, results, algo_kwargs, seed))
+                 for island in range(num_islands)]
+    for process in processes:
+        process.start()
+
+    # Collecting the fronts before joining, so no island blocks on a full queue
+    fronts = [None] * num_islands
+    waiting = set(range(num_islands))
+    try:
+        while waiting:
+            try:
+                island, front, error = results.get(timeout=poll_seconds)
+            except queue.Empty:
+                # Island killed, or dead without reaching its results
+                for island in waiting:
+                    if processes[island].exitcode not in (None, 0):
+                        raise RuntimeError(f"Island {island} exited with code {processes[island].exitcode}")
+                continue
+            if error is not None:
+                raise RuntimeError(f"Island {island} failed\n{error}")
+            fronts[island] = front
+            waiting.discard(island)
+    except BaseException:
+        stopIslands(processes)
+        raise
+
+    for process in processes:
+        process.join()
+
+    return mergeFronts(fronts)
+
+
+## Exporting CSV files
+
+def exportFront(csv_file_name, front):
+    # Fronts are kept apart from results/*.csv, which hold logbooks
+    front_dir = os.path.join(BASE_DIR, "results", "fronts")
+    os.makedirs(front_dir, exist_ok=True)
+    csv_path = os.path.join(front_dir, csv_file_name)
+    try:
+        with open(csv_path, 'w') as csvfile:
+            writer = csv.writer(csvfile)
+            # Lateness is the third objective when time windows are evaluated
+            num_objectives = len(front[0][1]) if front else 2
+            writer.writerow(["vehicles", "cost", "lateness"][:num_objectives] + ["route"])
+            for route, fitness_values in front:
+                writer.writerow(list(fitness_values) + [route])
+    except IOError:
+        print("I/O error")
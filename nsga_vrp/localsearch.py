@@ -0,0 +1,152 @@
+import time
+import random
+
+
+# Moves smaller than this are taken as rounding noise, not as improvements
+MIN_IMPROVEMENT = 1e-9
+
+
+class LocalSearch(object):
+    """
+    Improves the subroutes of a decoded individual with intra-route 2-opt and
+    inter-route relocate and swap moves. Only moves bringing a customer next to
+    one of its nearest neighbours are tried, and every move is priced from the
+    few edges it changes. With asymmetric distances, a 2-opt move also reverses
+    the edges inside the segment, so these are priced in full.
+    """
+
+    def __init__(self, instance, num_neighbours=10):
+        self.instance = instance
+        self.symmetric = instance.symmetric
+        self.vehicle_capacity = instance.vehicle_capacity
+        self.demands = instance.demands.tolist()
+        self.neighbours = instance.nearestNeighbours(num_neighbours).tolist()
+
+    def improveRoutes(self, routes, deadline):
+        """
+        Inputs: routes - list of subroutes, each a list of customers
+                deadline - time.perf_counter() value after which the search stops
+        Outputs: List of improved subroutes, the ones left empty by relocations are dropped
+        """
+        self.routes = [list(route) for route in routes]
+        self.loads = [sum(self.demands[customer] for customer in route) for route in self.routes]
+        self.route_of = {}
+        self.position = {}
+        for route_index in range(len(self.routes)):
+            self.updatePositions(route_index)
+
+        # First improvement over the customers in random order, until no move improves
+        customers = list(self.route_of)
+        improved = True
+        while improved:
+            improved = False
+            random.shuffle(customers)
+            for customer in customers:
+                if time.perf_counter() >= deadline:
+                    return [route for route in self.routes if route]
+                if self.improveCustomer(customer):
+                    improved = True
+
+        return [route for route in self.routes if route]
+
+    def updatePositions(self, route_index):
+        for position, customer in enumerate(self.routes[route_index]):
+            self.route_of[customer] = route_index
+            self.position[customer] = position
+
+    def neighbourPlaces(self, customer):
+        # Places before and after a customer in its subroute, depot at both ends
+        route = self.routes[self.route_of[customer]]
+        position = self.position[customer]
+        before = route[position - 1] if position > 0 else 0
+        after = route[position + 1] if position + 1 < len(route) else 0
+        return before, after
+
+    def improveCustomer(self, u):
+        """
+        Inputs: Customer whose neighbours are tried
+        Outputs: True if an improving move was found and applied
+        """
+        for v in self.neighbours[u]:
+            if self.route_of[u] == self.route_of[v]:
+                if self.twoOpt(u, v):
+                    return True
+            elif self.swap(u, v):
+                return True
+            if self.relocate(u, v):
+                return True
+        return False
+
+    def twoOpt(self, u, v):
+        # Reversing the part of the subroute between u and v, so that u and v become adjacent
+        distance = self.instance.distance
+        if self.position[u] > self.position[v]:
+            u, v = v, u
+        route_index = self.route_of[u]
+        _, after_u = self.neighbourPlaces(u)
+        _, after_v = self.neighbourPlaces(v)
+        delta = distance(u, v) + distance(after_u, after_v) - distance(u, after_u) - distance(v, after_v)
+        route = self.routes[route_index]
+        start, end = self.position[u] + 1, self.position[v] + 1
+        if not self.symmetric:
+            # Edges inside the reversed segment are travelled the other way
+            for position in range(start, end - 1):
+                delta += distance(route[position + 1], route[position]) - distance(route[position], route[position + 1])
+        if delta > -MIN_IMPROVEMENT:
+            return False
+
+        route[start:end] = route[start:end][::-1]
+        self.updatePositions(route_index)
+        return True
+
+    def relocate(self, u, v):
+        # Moving u right after or right before v, in v's subroute
+        distance = self.instance.distance
+        route_u, route_v = self.route_of[u], self.route_of[v]
+        if route_u != route_v and self.loads[route_v] + self.demands[u] > self.vehicle_capacity:
+            return False
+        before_u, after_u = self.neighbourPlaces(u)
+        before_v, after_v = self.neighbourPlaces(v)
+        removal = distance(before_u, after_u) - distance(before_u, u) - distance(u, after_u)
+
+        insert_after = None
+        if v != before_u:
+            delta = removal + distance(v, u) + distance(u, after_v) - distance(v, after_v)
+            if delta <= -MIN_IMPROVEMENT:
+                insert_after = True
+        if insert_after is None and v != after_u:
+            delta = removal + distance(before_v, u) + distance(u, v) - distance(before_v, v)
+            if delta <= -MIN_IMPROVEMENT:
+                insert_after = False
+        if insert_after is None:
+            return False
+
+        self.routes[route_u].pop(self.position[u])
+        self.updatePositions(route_u)
+        self.routes[route_v].insert(self.position[v] + insert_after, u)
+        self.updatePositions(route_v)
+        self.loads[route_u] -= self.demands[u]
+        self.loads[route_v] += self.demands[u]
+        return True
+
+    def swap(self, u, v):
+        # Exchanging u and v between their subroutes
+        distance = self.instance.distance
+        route_u, route_v = self.route_of[u], self.route_of[v]
+        load_change = self.demands[v] - self.demands[u]
+        if self.loads[route_u] + load_change > self.vehicle_capacity or \
+                self.loads[route_v] - load_change > self.vehicle_capacity:
+            return False
+        before_u, after_u = self.neighbourPlaces(u)
+        before_v, after_v = self.neighbourPlaces(v)
+        delta = distance(before_u, v) + distance(v, after_u) - distance(before_u, u) - distance(u, after_u) + \
+            distance(before_v, u) + distance(u, after_v) - distance(before_v, v) - distance(v, after_v)
+        if delta > -MIN_IMPROVEMENT:
+            return False
+
+        self.routes[route_u][self.position[u]], self.routes[route_v][self.position[v]] = v, u
+        self.updatePositions(route_u)
+        self.updatePositions(route_v)
+        self.loads[route_u] += load_change
+        self.loads[route_v] -= load_change
+        return True
@@ -0,0 +1,78 @@
+import numpy
+
+
+# How the offspring are varied, one pair and one individual at a time through
+#   the toolbox, or the whole offspring matrix at once
+VARIATIONS = ('loop', 'matrix')
+
+
+def cxOrderedPopulation(parents1, parents2, rng):
+    """
+    Inputs: parents1, parents2 - 2-D arrays of routes, row i of both is one mating pair
+            rng - numpy random Generator
+    Outputs: Tuple of two 2-D arrays of children, same ordered crossover as cxOrderedVrp.
+             Child 1 takes the part between two cut points from parent 2, and the rest of
+             its customers in the order they come in parent 1, starting after the part.
+    """
+    num_pairs, size = parents1.shape
+    if num_pairs == 0 or size < 2:
+        return parents1.copy(), parents2.copy()
+    rows = numpy.arange(num_pairs)[:, None]
+    columns = numpy.arange(size)
+
+    # Two different cut points for every pair, the part between them is included
+    cut_a = rng.integers(0, size, num_pairs)
+    cut_b = rng.integers(0, size - 1, num_pairs)
+    cut_b += cut_b >= cut_a
+    cut_a, cut_b = numpy.minimum(cut_a, cut_b), numpy.maximum(cut_a, cut_b)
+    in_part = (columns >= cut_a[:, None]) & (columns <= cut_b[:, None])
+
+    # Positions after the part, wrapping around to the start of the route
+    after_part = (cut_b[:, None] + 1 + columns) % size
+
+    def orderedChild(order_parent, part_parent):
+        # Customers in the part of part_parent are marked, order_parent's customers
+        #   that are not marked keep their order, filling the positions after the part
+        in_other_part = numpy.zeros((num_pairs, size + 1), dtype=bool)
+        in_other_part[rows, part_parent] = in_part
+        rolled = order_parent[rows, after_part]
+        kept = ~in_other_part[rows, rolled]
+        kept_rows = numpy.nonzero(kept)[0]
+        fill_index = numpy.cumsum(kept, axis=1)[kept] - 1
+
+        child = numpy.where(in_part, part_parent, 0)
+        child[kept_rows, after_part[kept_rows, fill_index]] = rolled[kept]
+        return child
+
+    return orderedChild(parents1, parents2), orderedChild(parents2, parents1)
+
+
+def mutShufflePopulation(population, indpb, rng):
+    """
+    Inputs: population - 2-D array of routes, mutated in place
+            indpb - probability of every position to be swapped with another random one
+            rng - numpy random Generator
+    Outputs: Tuple of (rows, positions, swap positions) of the swaps done, in the order
+             mutationShuffle would have done them
+    """
+    pop_size, size = population.shape
+    if size < 2:
+        empty = numpy.empty(0, dtype=numpy.intp)
+        return empty, empty, empty
+
+    # Row major nonzero keeps the swaps of a row in the order of their positions
+    swap_rows, swap_positions = numpy.nonzero(rng.random((pop_size, size)) < indpb)
+    swap_with = rng.integers(0, size - 1, len(swap_rows))
+    swap_with += swap_with >= swap_positions
+
+    # Swaps of one row may touch same positions, so they are done in rounds where
+    #   every row does its next swap. Rounds are as many as the most swaps in a row
+    row_starts = numpy.searchsorted(swap_rows, swap_rows, side='left')
+    rounds = numpy.arange(len(swap_rows)) - row_starts
+    for swap_round in range(rounds.max() + 1 if len(rounds) else 0):
+        in_round = rounds == swap_round
+        rows, positions, others = swap_rows[in_round], swap_positions[in_round], swap_with[in_round]
+        population[rows, positions], population[rows, others] = \
+            population[rows, others], population[rows, positions]
+
+    return swap_rows, swap_positions, swap_with
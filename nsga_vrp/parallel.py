@@ -0,0 +1,116 @@
+import multiprocessing
+import numpy
+
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+
+BACKENDS = ('serial', 'thread', 'process')
+
+# Instance used by evaluations inside a worker process. It is set by the pool's
+#   initializer when the worker starts, so each worker gets its own backend's
+#   instance once instead of receiving a pickled copy with every task
+worker_instance = None
+
+
+def setWorkerInstance(instance):
+    """
+    Inputs: Compiled VrpInstance to be used by evaluations in this process
+    Outputs: None
+    """
+    global worker_instance
+    worker_instance = instance
+
+
+def evalChunk(evaluate, population_slice, batch, keywords, instance=None, take_counters=False):
+    """
+    Inputs: evaluate - evaluation function taking instance as keyword
+            population_slice - 2-D array of individuals to evaluate
+            batch - whether evaluate takes whole population or one individual
+            keywords - rest of the keyword arguments for evaluate
+            instance - instance to use, worker process instance if not given
+            take_counters - whether the subroute cache counters are returned too
+    Outputs: Array of fitness values, one row per individual, along with the
+             (hits, misses) of the instance's subroute cache when take_counters is set
+    """
+    if instance is None:
+        instance = worker_instance
+    if batch:
+        fitnesses = numpy.asarray(evaluate(population_slice, instance=instance, **keywords))
+    else:
+        fitnesses = numpy.asarray([evaluate(individual, instance=instance, **keywords)
+                                   for individual in population_slice])
+    if take_counters:
+        return fitnesses, instance.subroute_cache.takeCounters()
+    return fitnesses
+
+
+class EvaluationBackend(object):
+    """
+    Runs fitness evaluations either in this process, in a pool of threads or
+    in a pool of processes. Population is cut into one slice per worker and
+    each worker evaluates its whole slice in one task.
+    """
+
+    def __init__(self, instance, backend='serial', workers=1):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend {backend}, expected one of {BACKENDS}")
+        if workers <= 1:
+            backend = 'serial'
+        self.instance = instance
+        self.backend = backend
+        self.workers = max(workers, 1)
+        self.executor = None
+
+        if backend == 'thread':
+            self.executor = ThreadPoolExecutor(max_workers=self.workers)
+        elif backend == 'process':
+            # Forked workers get the initializer's instance from the parent's memory, nothing is
+            #   pickled. Without fork, the instance is sent once to each worker when it starts
+            if 'fork' in multiprocessing.get_all_start_methods():
+                context = multiprocessing.get_context('fork')
+            else:
+                context = multiprocessing.get_context()
+            self.executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context,
+                                                initializer=setWorkerInstance, initargs=(instance,))
+
+    @property
+    def parallel(self):
+        return self.executor is not None
+
+    def map(self, func, *iterables):
+        # Generic map which can be registered in the toolbox
+        if self.executor is None:
+            return map(func, *iterables)
+        return self.executor.map(func, *iterables)
+
+    def evaluate(self, evaluate, population, batch=True):
+        """
+        Inputs: evaluate - toolbox registered evaluation, a partial with instance keyword
+            population - 2-D array of individuals
+            batch - whether evaluate takes whole population or one individual
+        Outputs: Array of fitness values, one row per individual
+        """
+        if self.executor is None:
+            if batch:
+                return numpy.asarray(evaluate(population))
+            return numpy.asarray([evaluate(individual) for individual in population])
+
+        # Instance is supplied by the worker itself, only the slice and other keywords are sent
+        keywords = {key: value for key, value in evaluate.keywords.items() if key != 'instance'}
+        chunks = [chunk for chunk in numpy.array_split(population, self.workers) if len(chunk)]
+        instance = self.instance if self.backend == 'thread' else None
+        # Worker processes have subroute caches of their own, their counters are brought back here
+        take_counters = self.backend == 'process' and self.instance.subroute_cache is not None
+        results = list(self.executor.map(evalChunk, repeat(evaluate.func), chunks, repeat(batch),
+                                         repeat(keywords), repeat(instance), repeat(take_counters)))
+        if take_counters:
+            for _, (hits, misses) in results:
+                self.instance.subroute_cache.addCounters(hits, misses)
+            results = [fitnesses for fitnesses, _ in results]
+        return numpy.concatenate(results)
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
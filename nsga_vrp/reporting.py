@@ -0,0 +1,154 @@
+import sys
+import json
+import time
+import numpy
+
+from deap import tools
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Verbosity levels, every level also shows what the lower ones do
+QUIET = 0      # Nothing at all
+SUMMARY = 1    # Start, stop and the best individual at the end
+PROGRESS = 2   # One compact line every report_every generations, without the best route
+VERBOSE = 3    # Full logbook line and a banner for every generation
+VERBOSITIES = (QUIET, SUMMARY, PROGRESS, VERBOSE)
+
+
+def jsonValue(value):
+    # Logbook values as json, arrays and fitness objects become lists
+    if isinstance(value, numpy.ndarray):
+        return value.tolist()
+    if isinstance(value, numpy.generic):
+        return value.item()
+    if hasattr(value, 'values') and hasattr(value, 'wvalues'):
+        return list(value.values)
+    return str(value)
+
+
+def formatValue(value):
+    # Compact text of a logbook value, floats with two decimals or four below one, like seconds of a phase
+    if isinstance(value, numpy.ndarray):
+        value = value.tolist()
+    elif hasattr(value, 'values') and hasattr(value, 'wvalues'):
+        value = value.values
+    if isinstance(value, (list, tuple)):
+        return '[' + ' '.join(formatValue(item) for item in value) + ']'
+    if isinstance(value, float):
+        return f'{value:.4f}' if abs(value) < 1 else f'{value:.2f}'
+    return str(value)
+
+
+class Reporter(object):
+    """
+    Takes the generation records and messages of a run and shows them according to
+    verbosity. Text lines and copies of the records are kept in a buffer, which is
+    formatted and written by a background thread once it has buffer_size entries or
+    flush_seconds passed, so the generations do not wait on formatting, stdout or the disk.
+    Every record goes to the json lines file when one is given, whatever the verbosity.
+    """
+
+    def __init__(self, verbosity=VERBOSE, every=1, jsonl=None, buffer_size=20, flush_seconds=1.0):
+        if verbosity not in VERBOSITIES:
+            raise ValueError(f"Unknown verbosity {verbosity}, expected one of {VERBOSITIES}")
+        self.verbosity = verbosity
+        self.every = max(every, 1)
+        self.jsonl = jsonl
+        self.buffer_size = buffer_size
+        self.flush_seconds = flush_seconds
+        # Buffered (kind, value) entries, kind is 'text', 'stream', 'progress' or 'json'
+        self.entries = []
+        self.last_flush = time.perf_counter()
+        self.header_shown = False
+        # Logbook the writer thread streams the verbose records from, keeping deap's column widths
+        self.stream_logbook = tools.Logbook()
+        self.executor = None
+        self.jsonl_file = None
+
+    def shows(self, level):
+        return self.verbosity >= level
+
+    def message(self, text, level=SUMMARY):
+        # Text line shown at given verbosity level and above
+        if self.verbosity >= level:
+            self.entries.append(('text', text))
+            self.flushIfDue()
+
+    def generation(self, gen, logbook):
+        """
+        Inputs: gen - generation just recorded
+                logbook - logbook whose last record is of this generation
+        Outputs: None, a copy of the record is buffered to be reported according to verbosity
+        """
+        record = dict(logbook[-1])
+        if self.jsonl is not None:
+            self.entries.append(('json', record))
+        if gen % self.every == 0:
+            if self.verbosity >= VERBOSE:
+                self.entries.append(('stream', (tuple(logbook.header), record)))
+            elif self.verbosity >= PROGRESS:
+                columns = [column for column in logbook.header if column != 'best_one']
+                if not self.header_shown:
+                    self.entries.append(('text', '\t'.join(columns)))
+                    self.header_shown = True
+                self.entries.append(('progress', (columns, record)))
+        self.flushIfDue()
+
+    def flushIfDue(self):
+        if len(self.entries) >= self.buffer_size or time.perf_counter() - self.last_flush >= self.flush_seconds:
+            self.flush()
+
+    def flush(self):
+        # Handing the buffered entries to the writer thread
+        self.last_flush = time.perf_counter()
+        if not self.entries:
+            return
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=1)
+        # Stream is taken now, so output follows stdout as it was when it was reported
+        self.executor.submit(self.write, sys.stdout, self.entries)
+        self.entries = []
+
+    def formatEntry(self, kind, value):
+        # Text line of a buffered entry, made in the writer thread
+        if kind == 'text':
+            return value
+        if kind == 'progress':
+            columns, record = value
+            return '\t'.join(formatValue(record.get(column, '')) for column in columns)
+        # Records are streamed one at a time, deap prints the header along with the first one
+        header, record = value
+        self.stream_logbook.header = header
+        self.stream_logbook.record(**record)
+        text = self.stream_logbook.stream
+        self.stream_logbook.clear()
+        self.stream_logbook.buffindex = 0
+        self.stream_logbook.log_header = False
+        return text
+
+    def write(self, stream, entries):
+        lines = [self.formatEntry(kind, value) for kind, value in entries if kind != 'json']
+        records = [value for kind, value in entries if kind == 'json']
+        if lines:
+            stream.write('\n'.join(lines) + '\n')
+            stream.flush()
+        if records:
+            if self.jsonl_file is None:
+                self.jsonl_file = open(self.jsonl, 'a')
+            self.jsonl_file.write(''.join(json.dumps(record, default=jsonValue) + '\n' for record in records))
+            self.jsonl_file.flush()
+
+    def wait(self):
+        # Flushing and waiting until everything reported so far is written
+        self.flush()
+        if self.executor is not None:
+            self.executor.submit(lambda: None).result()
+
+    def close(self):
+        self.wait()
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+        if self.jsonl_file is not None:
+            self.jsonl_file.close()
+            self.jsonl_file = None
@@ -0,0 +1,162 @@
+import bisect
+import numpy
+
+from deap import tools
+
+
+# Environmental selection of the next population, deap's selNSGA2 or the
+#   bi-objective sort below
+SELECTIONS = ('fast', 'deap')
+
+# Tournament choosing the parents, deap's selTournamentDCD on the individuals or
+#   the crowded comparison on the rank and crowding arrays of the selection
+TOURNAMENTS = ('dcd', 'crowded')
+
+
+def nonDominatedRanks(values):
+    """
+    Inputs: 2-D array of objective values to minimise, one row per individual
+            and exactly two columns
+    Outputs: Array with the front of every individual, 0 for the non dominated ones
+
+    Equal rows are collapsed first, so the rest are sorted by the first objective and
+    then the second one. Walking them in that order, a point is dominated by a front
+    when the front's last point has a second objective no larger than its own. Last
+    points of the fronts stay sorted, so the front of every point is found by bisection
+    in O(N log N).
+    """
+    unique_values, inverse = numpy.unique(values, axis=0, return_inverse=True)
+    fronts_last = []
+    unique_ranks = []
+    for second in unique_values[:, 1].tolist():
+        rank = bisect.bisect_right(fronts_last, second)
+        if rank == len(fronts_last):
+            fronts_last.append(second)
+        else:
+            fronts_last[rank] = second
+        unique_ranks.append(rank)
+    return numpy.asarray(unique_ranks, dtype=numpy.intp)[inverse.ravel()]
+
+
+def crowdingDistances(values, ranks):
+    """
+    Inputs: values - 2-D array of objective values, one row per individual
+            ranks - front of every individual
+    Outputs: Array of crowding distances computed within every front, same as
+             deap's assignCrowdingDist. Ends of a front get infinity, and every other
+             point the gap between its neighbours over the number of objectives times
+             the range of the front, summed over the objectives.
+    """
+    num_individuals, num_objectives = values.shape
+    distances = numpy.zeros(num_individuals)
+    if num_individuals == 0:
+        return distances
+
+    order = numpy.arange(num_individuals)
+    for objective in range(num_objectives):
+        # Sorting every front by this objective, keeping ties in the previous order like deap
+        order = order[numpy.lexsort((values[order, objective], ranks[order]))]
+        sorted_values = values[order, objective]
+        sorted_ranks = ranks[order]
+
+        is_first = numpy.ones(num_individuals, dtype=bool)
+        is_first[1:] = sorted_ranks[1:] != sorted_ranks[:-1]
+        is_last = numpy.ones(num_individuals, dtype=bool)
+        is_last[:-1] = is_first[1:]
+        front_index = numpy.cumsum(is_first) - 1
+        front_range = (sorted_values[is_last] - sorted_values[is_first])[front_index]
+
+        distances[order[is_first | is_last]] = float('inf')
+        inner = numpy.flatnonzero(~is_first & ~is_last & (front_range != 0))
+        distances[order[inner]] += (sorted_values[inner + 1] - sorted_values[inner - 1]) / \
+                                   (num_objectives * front_range[inner])
+    return distances
+
+
+def selectIndexes(ranks, distances, k):
+    """
+    Inputs: ranks - front of every individual
+            distances - crowding distance of every individual
+            k - number of individuals to select
+    Outputs: Indexes of the k individuals with the best fronts, and within the
+             last front taken, the largest crowding distances
+    """
+    return numpy.lexsort((-distances, ranks))[:k]
+
+
+def selNSGA2Ranked(individuals, k):
+    """
+    Inputs: individuals - list of individuals to select from
+            k - number of individuals to select
+    Outputs: Tuple of (selected individuals, their fronts, their crowding distances), the
+             individuals being the same as deap's selNSGA2 selects. Crowding distance of
+             every individual is set on its fitness for selTournamentDCD.
+             Fitness with other than two objectives is left to deap's selNSGA2.
+    """
+    if not individuals:
+        return [], numpy.empty(0, dtype=numpy.intp), numpy.empty(0)
+
+    if len(individuals[0].fitness.values) != 2:
+        chosen = tools.selNSGA2(individuals, k)
+        # Every front before the last one taken is selected whole, so fronts among the
+        #   selected individuals are the same as among all of them
+        ranks = numpy.empty(len(chosen), dtype=numpy.intp)
+        chosen_index = {id(ind): index for index, ind in enumerate(chosen)}
+        for rank, front in enumerate(tools.sortNondominated(chosen, len(chosen))):
+            ranks[[chosen_index[id(ind)] for ind in front]] = rank
+        return chosen, ranks, numpy.array([ind.fitness.crowding_dist for ind in chosen])
+
+    # Weighted values are maximised, so they are negated for minimising
+    weighted_values = numpy.array([ind.fitness.wvalues for ind in individuals], dtype=numpy.float64)
+    values = numpy.array([ind.fitness.values for ind in individuals], dtype=numpy.float64)
+    ranks = nonDominatedRanks(-weighted_values)
+    distances = crowdingDistances(values, ranks)
+
+    for ind, distance in zip(individuals, distances.tolist()):
+        ind.fitness.crowding_dist = distance
+    chosen = selectIndexes(ranks, distances, k)
+    return [individuals[index] for index in chosen.tolist()], ranks[chosen], distances[chosen]
+
+
+def selNSGA2Fast(individuals, k):
+    """
+    Inputs: individuals - list of individuals to select from
+            k - number of individuals to select
+    Outputs: List of selected individuals, same as deap's selNSGA2
+    """
+    return selNSGA2Ranked(individuals, k)[0]
+
+
+def selTournamentCrowded(ranks, distances, k, rng):
+    """
+    Inputs: ranks - front of every individual of the population
+            distances - crowding distance of every individual
+            k - number of individuals to select
+            rng - numpy random Generator
+    Outputs: Array of indexes of the k selected individuals
+
+    Pairs are drawn like deap's selTournamentDCD does, every individual takes part in two
+    tournaments, but all of them are played at once with the crowded comparison: the
+    better front wins, then the larger crowding distance, and a coin decides the rest.
+    """
+    size = len(ranks)
+    if k > size:
+        raise ValueError("selTournamentCrowded: k must be less than or equal to individuals length")
+    if k == size and k % 4 != 0:
+        raise ValueError("selTournamentCrowded: k must be divisible by four if k == individuals length")
+
+    # Groups of four from two shuffles, first two and last two of every group meet
+    num_groups = -(-k // 4)
+    if 4 * num_groups > size:
+        raise ValueError("selTournamentCrowded: k rounded up to four must not exceed individuals length")
+    groups1 = rng.permutation(size)[:4 * num_groups].reshape(num_groups, 4)
+    groups2 = rng.permutation(size)[:4 * num_groups].reshape(num_groups, 4)
+    first = numpy.stack([groups1[:, 0], groups1[:, 2], groups2[:, 0], groups2[:, 2]], axis=1).ravel()[:k]
+    second = numpy.stack([groups1[:, 1], groups1[:, 3], groups2[:, 1], groups2[:, 3]], axis=1).ravel()[:k]
+
+    same_rank = ranks[first] == ranks[second]
+    same_distance = distances[first] == distances[second]
+    first_wins = (ranks[first] < ranks[second]) | \
+                 (same_rank & (distances[first] > distances[second])) | \
+                 (same_rank & same_distance & (rng.random(k) <= 0.5))
+    return numpy.where(first_wins, first, second)
@@ -0,0 +1,83 @@
+import numpy
+
+from collections import deque
+from nsga_vrp.instance import requireInstance
+
+
+DECODERS = ('greedy', 'optimal')
+
+
+def optimalSplit(individual, instance):
+    """
+    Inputs: Sequence of customers that a route has (giant tour)
+            Compiled VrpInstance
+    Outputs: Tuple of (positions where each subroute starts, total distance of the subroutes)
+             for the cheapest way of cutting the giant tour into subroutes in the given order.
+
+    This is the Bellman shortest path split over the giant tour, p[j] being the cheapest
+    way to serve the first j customers. With D the distance along the tour and Q the
+    cumulative demand, a subroute serving customers i+1..j costs
+        d(0, t[i+1]) - D[i+1] + D[j] + d(t[j], 0)
+    so p[j] = min over i of f(i) + D[j] + d(t[j], 0), where f(i) = p[i] + d(0, t[i+1]) - D[i+1],
+    for all i with Q[j] - Q[i] <= capacity. Candidates i are kept in a deque of increasing f,
+    a candidate being dominated by any later one with smaller f since the later one stays
+    within capacity for longer. Every position enters and leaves the deque once, so this is O(n).
+    """
+    instance = requireInstance(instance)
+    customer_ids = numpy.asarray(individual, dtype=numpy.intp)
+    size = len(customer_ids)
+    if size == 0:
+        return [], 0
+
+    vehicle_capacity = instance.vehicle_capacity
+    cum_demand = [0.0] + numpy.cumsum(instance.demands[customer_ids]).tolist()
+    from_depot = [0.0] + instance.pairDistances(0, customer_ids).tolist()
+    to_depot = [0.0] + instance.pairDistances(customer_ids, 0).tolist()
+    # Distance along the tour, tour_distance[j] is from first customer to j-th customer
+    tour_distance = [0.0, 0.0] + numpy.cumsum(instance.pairDistances(customer_ids[:-1], customer_ids[1:]),
+                                                     dtype=numpy.float64).tolist()
+
+    best_cost = [0.0] * (size + 1)
+    predecessor = [0] * (size + 1)
+
+    def cutValue(i):
+        return best_cost[i] + from_depot[i + 1] - tour_distance[i + 1]
+
+    candidates = deque([0])
+    for j in range(1, size + 1):
+        # Dropping candidates whose subroute up to j would exceed capacity, the last one is
+        #   always kept, so a customer with demand above capacity still gets a vehicle
+        while len(candidates) > 1 and cum_demand[j] - cum_demand[candidates[0]] > vehicle_capacity:
+            candidates.popleft()
+
+        i = candidates[0]
+        best_cost[j] = cutValue(i) + tour_distance[j] + to_depot[j]
+        predecessor[j] = i
+
+        if j < size:
+            value = cutValue(j)
+            while candidates and cutValue(candidates[-1]) >= value:
+                candidates.pop()
+            candidates.append(j)
+
+    # Walking back the cheapest path to get the subroute starts
+    starts = []
+    j = size
+    while j > 0:
+        j = predecessor[j]
+        starts.append(j)
+    starts.reverse()
+
+    return starts, best_cost[size]
+
+
+def eval_fitness_optimal_split(individual, instance, unit_cost):
+    """
+    Inputs: individual route as a sequence
+            Compiled VrpInstance
+            unit_cost for the distance
+    Outputs: Returns a tuple of (Number of vechicles, Route cost from all the vechicles)
+             when the route is cut into subroutes by the optimal split
+    """
+    starts, route_distance = optimalSplit(individual, instance)
+    return (len(starts), unit_cost*route_distance)
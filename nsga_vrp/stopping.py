@@ -0,0 +1,102 @@
+import time
+import numpy
+
+from deap import tools
+from deap.benchmarks.tools import hypervolume
+from nsga_vrp.selection import nonDominatedRanks
+
+
+# Measure of progress watched for stagnation, hypervolume of the first front or the best cost
+STAGNATION_METRICS = ('hypervolume', 'cost')
+
+
+class StoppingCriteria(object):
+    """
+    Decides after every generation whether the run can stop early:
+     - 'stagnation' when the watched measure did not improve by more than
+       tolerance (relative) over the last window generations
+     - 'time_limit' when the run took more than time_limit seconds
+     - 'target_cost' when the best cost reached target_cost
+    Hypervolume is measured against a reference point fixed from the first
+    population, so the values of different generations can be compared.
+    """
+
+    def __init__(self, window=0, metric='hypervolume', tolerance=1e-6, time_limit=None, target_cost=None):
+        if metric not in STAGNATION_METRICS:
+            raise ValueError(f"Unknown stagnation metric {metric}, expected one of {STAGNATION_METRICS}")
+        self.window = window
+        self.metric = metric
+        self.tolerance = tolerance
+        self.time_limit = time_limit
+        self.target_cost = target_cost
+        self.start()
+
+    @property
+    def enabled(self):
+        return bool(self.window) or self.time_limit is not None or self.target_cost is not None
+
+    @property
+    def tracks_hypervolume(self):
+        return bool(self.window) and self.metric == 'hypervolume'
+
+    def start(self):
+        # Starting the clock and forgetting the measures of an earlier run
+        self.start_time = time.perf_counter()
+        self.reference = None
+        self.best_measure = None
+        self.last_improved = 0
+        self.generations = 0
+
+    def getState(self):
+        # Measures so far and time taken, for checkpoints
+        return {'elapsed': time.perf_counter() - self.start_time, 'reference': self.reference,
+                'best_measure': self.best_measure, 'last_improved': self.last_improved,
+                'generations': self.generations}
+
+    def setState(self, state):
+        # Going on from a checkpoint, the time taken before it counts against the time limit
+        self.start_time = time.perf_counter() - state['elapsed']
+        self.reference = state['reference']
+        self.best_measure = state['best_measure']
+        self.last_improved = state['last_improved']
+        self.generations = state['generations']
+
+    def firstFront(self, pop):
+        # Non dominated individuals of the population, by deap's sort unless there are two objectives
+        if len(pop[0].fitness.values) != 2:
+            return tools.sortNondominated(pop, len(pop), first_front_only=True)[0]
+        weighted_values = numpy.array([ind.fitness.wvalues for ind in pop], dtype=numpy.float64)
+        ranks = nonDominatedRanks(-weighted_values)
+        return [ind for ind, rank in zip(pop, ranks.tolist()) if rank == 0]
+
+    def measureHypervolume(self, pop):
+        # Hypervolume of the first front, reference point being just worse than the first population
+        front = self.firstFront(pop)
+        if self.reference is None:
+            self.reference = numpy.max([numpy.negative(ind.fitness.wvalues) for ind in pop], axis=0) + 1
+        return float(hypervolume(front, self.reference))
+
+    def update(self, pop):
+        """
+        Inputs: Population after selection of this generation
+        Outputs: Tuple of (hypervolume or None when not tracked, stop reason or '' to go on)
+        """
+        best_cost = min(ind.fitness.values[1] for ind in pop)
+        volume = self.measureHypervolume(pop) if self.tracks_hypervolume else None
+
+        if self.window:
+            # Hypervolume grows as the front improves, cost shrinks
+            measure = volume if self.metric == 'hypervolume' else -best_cost
+            if self.best_measure is None or measure > self.best_measure + self.tolerance * abs(self.best_measure):
+                self.best_measure = measure
+                self.last_improved = self.generations
+        generations_stalled = self.generations - self.last_improved
+        self.generations += 1
+
+        if self.target_cost is not None and best_cost <= self.target_cost:
+            return volume, 'target_cost'
+        if self.time_limit is not None and time.perf_counter() - self.start_time >= self.time_limit:
+            return volume, 'time_limit'
+        if self.window and generations_stalled >= self.window:
+            return volume, 'stagnation'
+        return volume, ''
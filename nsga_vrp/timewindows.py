@@ -0,0 +1,94 @@
+import numpy
+
+
+# Time windows are soft: a vehicle arriving before a customer's ready time waits for it, and one
+#   starting service after the due time is late by the difference. Vehicles leave the depot at its
+#   ready time and are late back when they return after its due time. Travel time is the distance.
+
+
+def routeTimeWindows(customer_ids, starts, instance):
+    """
+    Inputs: customer_ids - route as int array
+            starts - positions at which the subroutes start
+            instance - compiled VrpInstance
+    Outputs: Tuple of (distance, waiting time, lateness) summed over all the subroutes
+    """
+    size = len(customer_ids)
+    if size == 0:
+        return 0.0, 0.0, 0.0
+    ready_times = instance.ready_times[customer_ids].tolist()
+    due_times = instance.due_times[customer_ids].tolist()
+    service_times = instance.service_times[customer_ids].tolist()
+    from_depot = instance.pairDistances(0, customer_ids).tolist()
+    to_depot = instance.pairDistances(customer_ids, 0).tolist()
+    next_legs = instance.pairDistances(customer_ids[:-1], customer_ids[1:]).tolist()
+    depot_ready, depot_due = float(instance.ready_times[0]), float(instance.due_times[0])
+    is_start = [False] * size
+    for start in starts:
+        is_start[start] = True
+
+    distance = waiting = lateness = 0.0
+    departure = depot_ready
+    for position in range(size):
+        if is_start[position]:
+            if position > 0:
+                # Previous vehicle goes back to the depot, and a new one leaves it
+                distance += to_depot[position - 1]
+                lateness += max(departure + to_depot[position - 1] - depot_due, 0.0)
+            distance += from_depot[position]
+            arrival = depot_ready + from_depot[position]
+        else:
+            distance += next_legs[position - 1]
+            arrival = departure + next_legs[position - 1]
+        service_start = max(arrival, ready_times[position])
+        waiting += service_start - arrival
+        lateness += max(service_start - due_times[position], 0.0)
+        departure = service_start + service_times[position]
+
+    # Last vehicle returns to the depot
+    distance += to_depot[-1]
+    lateness += max(departure + to_depot[-1] - depot_due, 0.0)
+    return distance, waiting, lateness
+
+
+def populationTimeWindows(customer_ids, starts, instance):
+    """
+    Inputs: customer_ids - 2-D array of routes, one row per individual
+            starts - boolean array of same shape, True where a subroute starts
+            instance - compiled VrpInstance
+    Outputs: Tuple of (waiting time, lateness) arrays, summed over the subroutes of every row
+
+    Arrival at a customer depends on the departure from the one before it, so the routes
+    are walked position by position, all the rows being moved one step at a time.
+    """
+    pop_size, route_len = customer_ids.shape
+    waiting = numpy.zeros(pop_size)
+    lateness = numpy.zeros(pop_size)
+    if route_len == 0:
+        return waiting, lateness
+
+    # Every time window array and travel time gathered once for the whole population
+    ready_times = instance.ready_times[customer_ids]
+    due_times = instance.due_times[customer_ids]
+    service_times = instance.service_times[customer_ids]
+    depot_ready, depot_due = float(instance.ready_times[0]), float(instance.due_times[0])
+    depot_arrivals = depot_ready + instance.pairDistances(0, customer_ids)
+    to_depot = instance.pairDistances(customer_ids, 0)
+    next_legs = instance.pairDistances(customer_ids[:, :-1], customer_ids[:, 1:])
+
+    departure = numpy.full(pop_size, depot_ready)
+    for position in range(route_len):
+        if position == 0:
+            arrival = depot_arrivals[:, 0]
+        else:
+            new_vehicle = starts[:, position]
+            returned = departure + to_depot[:, position - 1]
+            lateness += numpy.where(new_vehicle, numpy.maximum(returned - depot_due, 0.0), 0.0)
+            arrival = numpy.where(new_vehicle, depot_arrivals[:, position], departure + next_legs[:, position - 1])
+        service_start = numpy.maximum(arrival, ready_times[:, position])
+        waiting += service_start - arrival
+        lateness += numpy.maximum(service_start - due_times[:, position], 0.0)
+        departure = service_start + service_times[:, position]
+
+    lateness += numpy.maximum(departure + to_depot[:, -1] - depot_due, 0.0)
+    return waiting, lateness
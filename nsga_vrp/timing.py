@@ -0,0 +1,151 @@
+import time
+import pstats
+import cProfile
+import tracemalloc
+
+from contextlib import contextmanager, nullcontext
+
+
+# Phases of a generation, in the order they run. Initial population is created in 'init',
+#   parents are picked in 'tournament' and copied in 'clone', crossed over and mutated in
+#   'variation', and the next population is picked by NSGA2 in 'selection'
+PHASES = ('init', 'tournament', 'clone', 'variation', 'evaluation', 'local_search', 'selection', 'record')
+
+# Profilers that can be switched on for a window of generations
+PROFILERS = ('cprofile', 'tracemalloc')
+
+
+class PhaseTimer(object):
+    """
+    Adds up the time.perf_counter() time spent in every phase, for the current
+    generation and for the whole run, along with the number of evaluated individuals.
+    A phase started inside another one, like the delta evaluation inside variation,
+    pauses the outer phase so its time is only counted once.
+    When not enabled, phases are not timed at all.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.generation_times = dict.fromkeys(PHASES, 0.0)
+        self.total_times = dict.fromkeys(PHASES, 0.0)
+        self.generation_evaluations = 0
+        self.total_evaluations = 0
+        # Phases running, innermost last, as [phase, time it was last started or resumed]
+        self.running = []
+
+    @contextmanager
+    def timed(self, phase):
+        start = time.perf_counter()
+        if self.running:
+            outer = self.running[-1]
+            self.generation_times[outer[0]] += start - outer[1]
+        self.running.append([phase, start])
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self.generation_times[phase] += end - self.running.pop()[1]
+            if self.running:
+                self.running[-1][1] = end
+
+    def phase(self, phase):
+        # Context timing the code run inside it as the given phase
+        if not self.enabled:
+            return nullcontext()
+        return self.timed(phase)
+
+    def countEvaluations(self, evaluations):
+        self.generation_evaluations += evaluations
+
+    def takeGeneration(self):
+        """
+        Inputs: None
+        Outputs: Tuple of (seconds of every phase, evaluated individuals) since the last call,
+                 which are added to the totals of the run and reset
+        """
+        times, evaluations = self.generation_times, self.generation_evaluations
+        for phase, seconds in times.items():
+            self.total_times[phase] += seconds
+        self.total_evaluations += evaluations
+        self.generation_times = dict.fromkeys(PHASES, 0.0)
+        self.generation_evaluations = 0
+        return times, evaluations
+
+    def summary(self):
+        """
+        Inputs: None
+        Outputs: List of text lines with the total seconds and share of every phase, and
+                 the evaluations per second of the evaluation phase
+        """
+        # Time not yet taken, like the recording of the last generation, counts too
+        total_times = {phase: seconds + self.generation_times[phase] for phase, seconds in self.total_times.items()}
+        total_evaluations = self.total_evaluations + self.generation_evaluations
+        total = sum(total_times.values())
+        lines = [f"{'phase':>14} {'seconds':>10} {'share':>7}"]
+        for phase, seconds in total_times.items():
+            share = seconds / total if total else 0.0
+            lines.append(f"{phase:>14} {seconds:>10.3f} {share:>7.1%}")
+        evaluation_time = total_times['evaluation']
+        evals_per_sec = total_evaluations / evaluation_time if evaluation_time else 0.0
+        lines.append(f"{'total':>14} {total:>10.3f}")
+        lines.append(f"{total_evaluations} evaluations, {evals_per_sec:.1f} per second of evaluation")
+        return lines
+
+
+class ProfileWindow(object):
+    """
+    Runs cProfile or tracemalloc over the generations from start to end (end excluded)
+    and writes what it found to output, pstats data for cProfile and the lines that
+    allocated the most for tracemalloc.
+    """
+
+    def __init__(self, profiler, start, end, output, top=20):
+        if profiler not in PROFILERS:
+            raise ValueError(f"Unknown profiler {profiler}, expected one of {PROFILERS}")
+        if end <= start:
+            raise ValueError(f"Profile window must end after it starts, got {start} to {end}")
+        self.profiler = profiler
+        self.start = start
+        self.end = end
+        self.output = output
+        self.top = top
+        self.profile = None
+
+    def before(self, gen):
+        # Starting to profile before the first generation of the window
+        if gen != self.start:
+            return
+        if self.profiler == 'cprofile':
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+        else:
+            tracemalloc.start()
+
+    def after(self, gen):
+        """
+        Inputs: Generation just run
+        Outputs: List of text lines of the top findings once the window is over, or else
+                 an empty list
+        """
+        if gen + 1 != self.end or (self.profiler == 'cprofile' and self.profile is None):
+            return []
+        if self.profiler == 'cprofile':
+            self.profile.disable()
+            self.profile.dump_stats(self.output)
+            stats = pstats.Stats(self.profile).sort_stats('cumulative')
+            self.profile = None
+            lines = [f"{'calls':>10} {'cumulative':>12}  function"]
+            for function in stats.fcn_list[:self.top]:
+                calls, _, _, cumulative, _ = stats.stats[function]
+                lines.append(f"{calls:>10} {cumulative:>12.4f}  {pstats.func_std_string(function)}")
+        else:
+            if not tracemalloc.is_tracing():
+                return []
+            snapshot = tracemalloc.take_snapshot()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            lines = [f"Peak traced memory {peak / 2 ** 20:.1f} MB"] + \
+                    [str(statistic) for statistic in snapshot.statistics('lineno')[:self.top]]
+            with open(self.output, 'w') as file_object:
+                file_object.write('\n'.join(lines) + '\n')
+        return [f"Profile of generations {self.start} to {self.end - 1} written to {self.output}"] + lines
@@ -1,7 +1,12 @@
 import os
 import io
 import fnmatch
+import numpy
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
 from json import load, dump
+from nsga_vrp.instance import VrpInstance, writeBinaryInstance
+from nsga_vrp.distance import ROUNDINGS, roundDistances
 
 BASE_DIR = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
 
@@ -17,95 +22,229 @@ def calculate_distance(customer1, customer2):
             (customer1['coordinates']['y'] - customer2['coordinates']['y']) ** 2) ** 0.5
 
 
-def converttext2json():
+def buildDistanceMatrix(coordinates, dtype=numpy.float64, rounding=None, block_rows=1024):
     """
-    Inputs : None
+    Inputs: coordinates - array of shape (number of places, 2) with x, y of each place
+            dtype - float type of the matrix, float32 halves its size
+            rounding - rounding convention from ROUNDINGS, None keeps exact distances
+            block_rows - number of rows computed at once, bounds the temporary arrays
+    Outputs: Matrix of euclidean distances between every pair of places
+    """
+    coordinates = numpy.asarray(coordinates, dtype=numpy.float64)
+    x_coord, y_coord = coordinates[:, 0], coordinates[:, 1]
+    num_places = len(coordinates)
+    distance_matrix = numpy.empty((num_places, num_places), dtype=dtype)
+
+    # Broadcasting a block of rows against all the places, instead of one call per pair
+    for start in range(0, num_places, block_rows):
+        end = min(start + block_rows, num_places)
+        x_delta = x_coord[start:end, None] - x_coord[None, :]
+        y_delta = y_coord[start:end, None] - y_coord[None, :]
+        distances = numpy.sqrt(x_delta * x_delta + y_delta * y_delta)
+        distance_matrix[start:end] = roundDistances(distances, rounding)
+
+    return distance_matrix
+
+
+def parseFloats(tokens):
+    # Returns floats of all the tokens, or None if any of them is not a number
+    try:
+        return [float(token) for token in tokens]
+    except ValueError:
+        return None
+
+
+def parseTextInstance(text_file):
+    """
+    Inputs : Path of a Solomon / Homberger *.txt instance
+    Outputs: Tuple of (instance name, max vehicle number, vehicle capacity, places) where places
+             is an array with one row per place, depot first, with columns
+             customer number, x, y, demand, ready time, due time, service time.
+
+    File is read line by line. First non empty line is the instance name, the first line of
+    two numbers after the CAPACITY header is the vehicle details, and every line of seven
+    numbers is a place. Places go straight into a preallocated array which grows if needed.
+    """
+    instance_name = None
+    max_vehicle_number = None
+    vehicle_capacity = None
+    vehicle_header_seen = False
+
+    # Guessing number of places from file size, about 30 bytes a line
+    places = numpy.empty((os.path.getsize(text_file) // 30 + 1, 7))
+    num_places = 0
+
+    with io.open(text_file, 'rt', newline='') as file_object:
+        for line in file_object:
+            tokens = line.split()
+            if not tokens:
+                continue
+
+            # Instance name details, first line of the file
+            if instance_name is None:
+                instance_name = line.strip()
+                continue
+
+            values = parseFloats(tokens)
+            if values is None:
+                vehicle_header_seen = vehicle_header_seen or 'CAPACITY' in line.upper()
+
+            # Vehicle capacity and max vehicles details
+            elif len(values) == 2 and vehicle_header_seen and vehicle_capacity is None:
+                max_vehicle_number = int(values[0])
+                vehicle_capacity = values[1]
+
+            # Depot and customer details
+            elif len(values) == 7:
+                if num_places == len(places):
+                    places = numpy.concatenate([places, numpy.empty_like(places)])
+                places[num_places] = values
+                num_places += 1
+
+    places = places[:num_places]
+    if vehicle_capacity is None or num_places == 0:
+        raise ValueError(f"{text_file} has no vehicle capacity or no customers")
+    if not numpy.array_equal(places[:, 0], numpy.arange(num_places)):
+        # Customers numbered out of order are put in order of their numbers
+        places = places[numpy.argsort(places[:, 0], kind='stable')]
+        if not numpy.array_equal(places[:, 0], numpy.arange(num_places)):
+            raise ValueError(f"{text_file} customers are not numbered 0 to {num_places - 1}")
+
+    return instance_name, max_vehicle_number, vehicle_capacity, places
+
+
+def textToInstance(text_file, dtype=numpy.float64, rounding=None, matrix=True):
+    """
+    Inputs : text_file - path of a Solomon / Homberger *.txt instance
+             dtype - float type of the distances, float32 or float64
+             rounding - rounding convention of the distances from ROUNDINGS
+             matrix - whether to build the distance matrix, or compute distances when needed
+    Outputs: VrpInstance of the text file
+    """
+    instance_name, max_vehicle_number, vehicle_capacity, places = parseTextInstance(text_file)
+    coordinates = places[:, 1:3]
+    distance_matrix = buildDistanceMatrix(coordinates, dtype=dtype, rounding=rounding) if matrix else None
+    return VrpInstance(instance_name=instance_name,
+                       vehicle_capacity=vehicle_capacity,
+                       max_vehicle_number=max_vehicle_number,
+                       coordinates=coordinates,
+                       demands=places[:, 3],
+                       ready_times=places[:, 4],
+                       due_times=places[:, 5],
+                       service_times=places[:, 6],
+                       distance_matrix=distance_matrix,
+                       rounding=rounding)
+
+
+def instanceToJson(instance):
+    """
+    Inputs : VrpInstance
+    Outputs: json object in the schema load_instance reads
+    """
+    def placeJson(place_id):
+        return {
+            'coordinates': {
+                'x': x_coords[place_id],
+                'y': y_coords[place_id],
+            },
+            'demand': demands[place_id],
+            'ready_time': ready_times[place_id],
+            'due_time': due_times[place_id],
+            'service_time': service_times[place_id],
+        }
+
+    x_coords, y_coords = instance.coordinates[:, 0].tolist(), instance.coordinates[:, 1].tolist()
+    demands, ready_times = instance.demands.tolist(), instance.ready_times.tolist()
+    due_times, service_times = instance.due_times.tolist(), instance.service_times.tolist()
+
+    json_data = {
+        'instance_name': instance.instance_name,
+        'max_vehicle_number': instance.max_vehicle_number,
+        'vehicle_capacity': instance.vehicle_capacity,
+        'depart': placeJson(0),
+        'Number_of_customers': instance.num_customers,
+    }
+    for customer_id in range(1, instance.num_customers + 1):
+        json_data[f'customer_{customer_id}'] = placeJson(customer_id)
+
+    # Without distance matrix, load_instance computes distances from coordinates
+    if instance.distance_matrix is not None:
+        json_data['distance_matrix'] = instance.distance_matrix.tolist()
+    else:
+        json_data['rounding'] = instance.rounding
+    return json_data
+
+
+def converttextfile(text_file, json_dir, dtype=numpy.float64, rounding=None, indent=None, binary=False,
+                    matrix=True):
+    """
+    Inputs : text_file - path of the *.txt file to convert
+             json_dir - directory to write the converted instance to
+             rest are same as converttext2json
+    Outputs: Path of the written json file
+    """
+    instance = textToInstance(text_file, dtype=dtype, rounding=rounding, matrix=matrix)
+
+    # Giving filename as instance name, which is input text file name
+    json_file_name = f"{instance.instance_name}.json"
+    json_file = os.path.join(json_dir, json_file_name)
+    writeInstance(instance, json_file, indent=indent, binary=binary)
+    return json_file
+
+
+def writeInstance(instance, json_file, indent=None, binary=False):
+    """
+    Inputs : instance - VrpInstance to write
+             json_file - path of the json file
+             indent - indent of the json file, None writes it compact
+             binary - write metadata json with .npz arrays and .npy distance matrix instead
+    Outputs: None, the instance is written in the schema load_instance reads
+    """
+    # Binary instance keeps the arrays as they are, json only holds the metadata
+    if binary:
+        writeBinaryInstance(instance, json_file)
+        return
+
+    # Writing the json file to disk and saving it under json_customize directory
+    with io.open(json_file, 'wt', newline='') as file_object:
+        separators = (',', ':') if indent is None else (',', ': ')
+        dump(instanceToJson(instance), file_object, sort_keys=True, indent=indent, separators=separators)
+
+
+def converttext2json(dtype=numpy.float64, rounding=None, indent=None, binary=False, matrix=True, workers=1,
+                     text_dir=None, json_dir=None):
+    """
+    Inputs : dtype - float type of the distances, float32 or float64
+             rounding - rounding convention of the distances from ROUNDINGS
+             indent - indent of the json file, None writes it compact
+             binary - write metadata json with .npz arrays and .npy distance matrix instead
+             matrix - whether to write the distance matrix, or let distances be computed when needed
+             workers - number of processes converting files at the same time
+             text_dir, json_dir - input and output directories, data/text and data/json by default
     Outputs: Reads the *.txt file in text directory and converts in to
              *.json file in json directory.
     """
     print(f'base directory is {BASE_DIR}')
-    text_dir = os.path.join(BASE_DIR, 'data', 'text')
-    json_dir = os.path.join(BASE_DIR, 'data', 'json')
+    text_dir = text_dir or os.path.join(BASE_DIR, 'data', 'text')
+    json_dir = json_dir or os.path.join(BASE_DIR, 'data', 'json')
     print(f'text_dir is {text_dir}')
     print(f'json_dir is {json_dir}')
 
-    for text_file in map(lambda text_filename: os.path.join(text_dir, text_filename), \
-                         fnmatch.filter(os.listdir(text_dir), '*.txt')):
-        print(text_file)
-        json_data = {}
-        numCustomers = 0
-        with io.open(text_file, 'rt', newline='') as file_object:
-            for line_count, line in enumerate(file_object, start=1):
-                # print(f'line_count is {line_count}')
-                # print(f'line is {line}')
-
-                if line_count in [2, 3, 4, 6, 7, 8, 9]:
-                    pass
-
-                # Instance name details, input text file name
-                elif line_count == 1:
-                    json_data['instance_name'] = line.strip()
-
-                # Vehicle capacity and max vehicles details
-                elif line_count == 5:
-                    values = line.strip().split()
-                    json_data['max_vehicle_number'] = int(values[0])
-                    json_data['vehicle_capacity'] = float(values[1])
-
-                # Depot details
-                elif line_count == 10:
-                    # This is depot
-                    values = line.strip().split()
-                    json_data['depart'] = {
-                        'coordinates': {
-                            'x': float(values[1]),
-                            'y': float(values[2]),
-                        },
-                        'demand': float(values[3]),
-                        'ready_time': float(values[4]),
-                        'due_time': float(values[5]),
-                        'service_time': float(values[6]),
-                    }
-
-                # Customer details
-                else:
-                    # Rest all are customers
-                    # print(f'line_count is {line_count}')
-                    # print(f'line is {line}')
-                    # Adding customer to number of customers
-                    numCustomers += 1
-                    values = line.strip().split()
-                    json_data[f'customer_{values[0]}'] = {
-                        'coordinates': {
-                            'x': float(values[1]),
-                            'y': float(values[2]),
-                        },
-                        'demand': float(values[3]),
-                        'ready_time': float(values[4]),
-                        'due_time': float(values[5]),
-                        'service_time': float(values[6]),
-                    }
-
-        # print(f'Number of customers is {numCustomers}')
-        customers = ['depart'] + [f'customer_{x}' for x in range(1, numCustomers + 1)]
-        # print(customers)
-
-        # Writing the distance_matrix
-        json_data['distance_matrix'] = [[calculate_distance(json_data[customer1], \
-                                                            json_data[customer2]) for customer1 in customers] for
-                                        customer2 in customers]
-
-        # Writing the number of customers details
-        json_data['Number_of_customers'] = numCustomers
-
-        # Giving filename as instance name, which is input text file name
-        json_file_name = f"{json_data['instance_name']}.json"
-        json_file = os.path.join(json_dir, json_file_name)
-        print(f'Write to file: {json_file}')
-
-        # Writing the json file to disk and saving it under json_customize directory
-        with io.open(json_file, 'wt', newline='') as file_object:
-            dump(json_data, file_object, sort_keys=True, indent=4, separators=(',', ': '))
+    text_files = [os.path.join(text_dir, text_filename)
+                  for text_filename in sorted(fnmatch.filter(os.listdir(text_dir), '*.txt'))]
+    convert = partial(converttextfile, json_dir=json_dir, dtype=dtype, rounding=rounding, indent=indent,
+                      binary=binary, matrix=matrix)
+
+    # Each file is converted on its own, so a directory is spread over processes
+    if workers > 1 and len(text_files) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            json_files = list(executor.map(convert, text_files))
+    else:
+        json_files = list(map(convert, text_files))
+
+    for text_file, json_file in zip(text_files, json_files):
+        print(f'Write {text_file} to file: {json_file}')
+    return json_files
 
 
 if __name__ == "__main__":
@@ -1,7 +1,32 @@
 from nsga_vrp.utils import converttext2json
+import argparse
+import numpy
 
 def main():
-    converttext2json()
+
+    # Parsing arguments
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rounding', type=str, default=None, required=False, choices=["solomon", "tsplib"],
+                        help="Rounding of distances, Solomon one decimal or TSPLIB nearest integer")
+    parser.add_argument('--float32', action='store_true',
+                        help="Compute distances as float32 instead of float64")
+    parser.add_argument('--indent', type=int, default=None, required=False,
+                        help="Indent of the json file, written compact if not given")
+    parser.add_argument('--binary', action='store_true',
+                        help="Write metadata json with binary arrays and memory mappable distance matrix")
+    parser.add_argument('--matrixFree', action='store_true',
+                        help="Do not write the distance matrix, distances are computed from coordinates")
+    parser.add_argument('--workers', type=int, default=1, required=False,
+                        help="Number of processes converting files at the same time")
+
+    args = parser.parse_args()
+
+    converttext2json(dtype=numpy.float32 if args.float32 else numpy.float64,
+                     rounding=args.rounding,
+                     indent=args.indent,
+                     binary=args.binary,
+                     matrix=not args.matrixFree,
+                     workers=args.workers)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
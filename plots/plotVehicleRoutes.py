@@ -3,25 +3,18 @@ import matplotlib.pyplot as plt
 import pandas as pd
 import numpy as np
 from nsga_vrp.NSGA2_vrp import load_instance, routeToSubroute, eval_indvidual_fitness
+from nsga_vrp.instance import compileInstance
 
 
 # Loading locations and customers to dataframe
 
 def getCoordinatesDframe(json_instance):
-    num_of_cust = json_instance['Number_of_customers']
-    # Getting all customer coordinates
-    customer_list = [i for i in range(1, num_of_cust + 1)]
-    x_coord_cust = [json_instance[f'customer_{i}']['coordinates']['x'] for i in customer_list]
-    y_coord_cust = [json_instance[f'customer_{i}']['coordinates']['y'] for i in customer_list]
-    # Getting depot x,y coordinates
-    depot_x = [json_instance['depart']['coordinates']['x']]
-    depot_y = [json_instance['depart']['coordinates']['y']]
-    # Adding depot details
-    customer_list = [0] + customer_list
-    x_coord_cust = depot_x + x_coord_cust
-    y_coord_cust = depot_y + y_coord_cust
-    df = pd.DataFrame({"X": x_coord_cust,
-                       "Y": y_coord_cust,
+    # Instance can be json object or VrpInstance loaded from binary files
+    instance = compileInstance(json_instance)
+    # Getting depot and all customer coordinates, depot is place 0
+    customer_list = [i for i in range(0, instance.num_customers + 1)]
+    df = pd.DataFrame({"X": instance.coordinates[:, 0],
+                       "Y": instance.coordinates[:, 1],
                        "customer_list": customer_list
                        })
     return df
@@ -38,16 +31,16 @@ def plotSubroute(subroute, dfhere,color):
         totalSubroute.pop(0)
 
 
-def plotRoute(route, csv_title):
-    # Loading the instance
-    json_instance = load_instance('./data/json/Input_Data.json')
+def plotRoute(route, csv_title, decoder='greedy'):
+    # Loading the instance, and compiling it once for decoding and plotting
+    instance = compileInstance(load_instance('./data/json/Input_Data.json'))
 
-    subroutes = routeToSubroute(route, json_instance)
+    subroutes = routeToSubroute(route, instance, decoder)
     colorslist = ["blue","green","red","cyan","magenta","yellow","black","#eeefff"]
     colorindex = 0
 
     # getting df
-    dfhere = getCoordinatesDframe(json_instance)
+    dfhere = getCoordinatesDframe(instance)
 
     # Plotting scatter
     plt.figure(figsize=(10, 10))
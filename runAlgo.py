@@ -15,19 +15,114 @@ def main():
                         help="Mutation Probabilty")
     parser.add_argument('--numGen', type=int, default=200, required=False,
                         help="Number of generations to run")
+    parser.add_argument('--workers', type=int, default=1, required=False,
+                        help="Number of workers evaluating the population")
+    parser.add_argument('--backend', type=str, default="process", required=False,
+                        choices=["serial", "thread", "process"],
+                        help="Evaluation backend used when workers is more than 1")
+    parser.add_argument('--cacheSize', type=int, default=10000, required=False,
+                        help="Number of routes whose fitness is cached, 0 disables the cache")
+    parser.add_argument('--cacheEviction', type=str, default="lru", required=False, choices=["lru", "fifo"],
+                        help="Which cached fitness is dropped when the cache is full")
+    parser.add_argument('--subrouteCache', type=int, default=0, required=False,
+                        help="Number of subroute distances and loads to cache, 0 turns it off")
+    parser.add_argument('--matrixFree', action='store_true',
+                        help="Compute distances from coordinates instead of keeping the distance matrix")
+    parser.add_argument('--distanceCacheRows', type=int, default=0, required=False,
+                        help="Number of distance rows cached when running matrix free")
+    parser.add_argument('--deltaEval', action='store_true',
+                        help="Evaluate mutation only offspring from the subroutes affected by the swaps")
+    parser.add_argument('--decoder', type=str, default="greedy", required=False, choices=["greedy", "optimal"],
+                        help="How routes are cut into subroutes, greedily by capacity or for least distance")
+    parser.add_argument('--timeWindows', action='store_true',
+                        help="Minimize lateness at the customers' time windows as third objective")
+    parser.add_argument('--individual', type=str, default="list", required=False, choices=["list", "array"],
+                        help="Individuals as python lists or as typed int arrays, cheaper to clone and hold")
+    parser.add_argument('--variation', type=str, default="loop", required=False, choices=["loop", "matrix"],
+                        help="Crossover and mutation one individual at a time, or on the whole offspring matrix")
+    parser.add_argument('--selection', type=str, default="fast", required=False, choices=["fast", "deap"],
+                        help="NSGA2 selection by the O(N log N) bi-objective sort, or by deap's selNSGA2")
+    parser.add_argument('--tournament', type=str, default="dcd", required=False, choices=["dcd", "crowded"],
+                        help="Parents chosen by deap's selTournamentDCD, or by the crowded tournament on arrays")
+    parser.add_argument('--localSearch', type=int, default=0, required=False,
+                        help="Number of best offspring improved by local search every generation, 0 disables it")
+    parser.add_argument('--neighbours', type=int, default=10, required=False,
+                        help="Number of nearest neighbours local search tries to move a customer next to")
+    parser.add_argument('--localSearchTime', type=float, default=0.05, required=False,
+                        help="Seconds of local search allowed in every generation")
+    parser.add_argument('--stagnation', type=int, default=0, required=False,
+                        help="Stop when there is no improvement for this many generations, 0 disables it")
+    parser.add_argument('--stagnationMetric', type=str, default="hypervolume", required=False,
+                        choices=["hypervolume", "cost"],
+                        help="Improvement watched for stagnation, hypervolume of the front or the best cost")
+    parser.add_argument('--stagnationTol', type=float, default=1e-6, required=False,
+                        help="Relative change below which the watched measure has not improved")
+    parser.add_argument('--timeLimit', type=float, default=None, required=False,
+                        help="Stop after this many seconds")
+    parser.add_argument('--targetCost', type=float, default=None, required=False,
+                        help="Stop as soon as the best cost is at most this")
+    parser.add_argument('--checkpoint', type=str, default=None, required=False,
+                        help="File the run is checkpointed to, no checkpoints if not given")
+    parser.add_argument('--checkpointInterval', type=int, default=10, required=False,
+                        help="Number of generations between checkpoints")
+    parser.add_argument('--resume', action='store_true',
+                        help="Go on from the checkpoint file if there is one, or else start a new run")
+    parser.add_argument('--verbosity', type=int, default=3, required=False, choices=[0, 1, 2, 3],
+                        help="0 quiet, 1 start and end summary, 2 compact progress lines, 3 full logbook lines")
+    parser.add_argument('--reportEvery', type=int, default=1, required=False,
+                        help="Number of generations between progress lines")
+    parser.add_argument('--reportJsonl', type=str, default=None, required=False,
+                        help="File every logbook record is appended to as json lines")
+    parser.add_argument('--timing', action='store_true',
+                        help="Record seconds of every phase of the generations, and sum them up at the end")
+    parser.add_argument('--profile', type=str, default=None, required=False, choices=["cprofile", "tracemalloc"],
+                        help="Profiler run over the generations of --profileWindow")
+    parser.add_argument('--profileWindow', type=int, nargs=2, default=[1, 2], required=False,
+                        help="First generation profiled and the one after the last")
+    parser.add_argument('--profileOutput', type=str, default=None, required=False,
+                        help="File the profile is written to, in results directory if not given")
 
 
     args = parser.parse_args()
 
-    # Initializing instance
-    nsgaObj = nsgaAlgo()
-
-    # Setting internal variables
-    nsgaObj.json_instance = load_instance(args.instance_name)
-    nsgaObj.pop_size = args.popSize
-    nsgaObj.cross_prob = args.crossProb
-    nsgaObj.mut_prob = args.mutProb
-    nsgaObj.num_gen = args.numGen
+    # Initializing instance with internal variables
+    nsgaObj = nsgaAlgo(instance=args.instance_name,
+                       pop_size=args.popSize,
+                       cross_prob=args.crossProb,
+                       mut_prob=args.mutProb,
+                       num_gen=args.numGen,
+                       backend=args.backend,
+                       workers=args.workers,
+                       cache_size=args.cacheSize,
+                       cache_eviction=args.cacheEviction,
+                       subroute_cache=args.subrouteCache,
+                       delta_eval=args.deltaEval,
+                       decoder=args.decoder,
+                       time_windows=args.timeWindows,
+                       matrix_free=args.matrixFree,
+                       distance_cache_rows=args.distanceCacheRows,
+                       individual=args.individual,
+                       variation=args.variation,
+                       selection=args.selection,
+                       tournament=args.tournament,
+                       local_search=args.localSearch,
+                       neighbours=args.neighbours,
+                       local_search_time=args.localSearchTime,
+                       stagnation_window=args.stagnation,
+                       stagnation_metric=args.stagnationMetric,
+                       stagnation_tol=args.stagnationTol,
+                       time_limit=args.timeLimit,
+                       target_cost=args.targetCost,
+                       checkpoint=args.checkpoint,
+                       checkpoint_interval=args.checkpointInterval,
+                       resume=args.resume,
+                       verbosity=args.verbosity,
+                       report_every=args.reportEvery,
+                       report_jsonl=args.reportJsonl,
+                       timing=args.timing,
+                       profile=args.profile,
+                       profile_window=args.profileWindow,
+                       profile_output=args.profileOutput)
 
     # Running Algorithm
     nsgaObj.runMain()
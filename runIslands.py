@@ -0,0 +1,94 @@
+from nsga_vrp.NSGA2_vrp import load_instance, printRoute, routeToSubroute
+from nsga_vrp.instance import compileInstance
+from nsga_vrp.islands import runIslands, exportFront
+import argparse
+
+def main():
+
+    # Parsing arguments
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--instance_name', type=str, default="./data/json/Input_Data.json", required=False,
+                        help="Enter the input Json file name")
+    parser.add_argument('--popSize', type=int, default=400, required=False,
+                        help="Enter the population size of each island")
+    parser.add_argument('--crossProb', type=float, default=0.85, required=False,
+                        help="Crossover Probability")
+    parser.add_argument('--mutProb', type=float, default=0.02, required=False,
+                        help="Mutation Probabilty")
+    parser.add_argument('--numGen', type=int, default=200, required=False,
+                        help="Number of generations to run")
+    parser.add_argument('--decoder', type=str, default="greedy", required=False, choices=["greedy", "optimal"],
+                        help="How routes are cut into subroutes, greedily by capacity or for least distance")
+    parser.add_argument('--timeWindows', action='store_true',
+                        help="Minimize lateness at the customers' time windows as third objective")
+    parser.add_argument('--individual', type=str, default="list", required=False, choices=["list", "array"],
+                        help="Individuals as python lists or as typed int arrays, cheaper to clone and hold")
+    parser.add_argument('--variation', type=str, default="loop", required=False, choices=["loop", "matrix"],
+                        help="Crossover and mutation one individual at a time, or on the whole offspring matrix")
+    parser.add_argument('--selection', type=str, default="fast", required=False, choices=["fast", "deap"],
+                        help="NSGA2 selection by the O(N log N) bi-objective sort, or by deap's selNSGA2")
+    parser.add_argument('--tournament', type=str, default="dcd", required=False, choices=["dcd", "crowded"],
+                        help="Parents chosen by deap's selTournamentDCD, or by the crowded tournament on arrays")
+    parser.add_argument('--localSearch', type=int, default=0, required=False,
+                        help="Number of best offspring improved by local search every generation, 0 disables it")
+    parser.add_argument('--neighbours', type=int, default=10, required=False,
+                        help="Number of nearest neighbours local search tries to move a customer next to")
+    parser.add_argument('--localSearchTime', type=float, default=0.05, required=False,
+                        help="Seconds of local search allowed in every generation")
+    parser.add_argument('--islands', type=int, default=4, required=False,
+                        help="Number of islands, each evolving in its own process")
+    parser.add_argument('--topology', type=str, default="ring", required=False, choices=["ring", "full"],
+                        help="Which islands exchange migrants")
+    parser.add_argument('--migrationInterval', type=int, default=10, required=False,
+                        help="Number of generations between migrations")
+    parser.add_argument('--migrants', type=int, default=5, required=False,
+                        help="Number of non dominated individuals sent by each island")
+    parser.add_argument('--seed', type=int, default=None, required=False,
+                        help="Base random seed, each island adds its index to it")
+    parser.add_argument('--verbosity', type=int, default=0, required=False, choices=[0, 1, 2, 3],
+                        help="Output of every island, 0 quiet up to 3 full logbook lines")
+    parser.add_argument('--reportEvery', type=int, default=1, required=False,
+                        help="Number of generations between progress lines of every island")
+
+    args = parser.parse_args()
+
+    # Compiling the instance once, islands share it
+    instance = compileInstance(load_instance(args.instance_name))
+
+    # Running Algorithm
+    front = runIslands(num_islands=args.islands,
+                       topology=args.topology,
+                       migration_interval=args.migrationInterval,
+                       num_migrants=args.migrants,
+                       seed=args.seed,
+                       instance=instance,
+                       pop_size=args.popSize,
+                       cross_prob=args.crossProb,
+                       mut_prob=args.mutProb,
+                       num_gen=args.numGen,
+                       decoder=args.decoder,
+                       time_windows=args.timeWindows,
+                       individual=args.individual,
+                       variation=args.variation,
+                       selection=args.selection,
+                       tournament=args.tournament,
+                       local_search=args.localSearch,
+                       neighbours=args.neighbours,
+                       local_search_time=args.localSearchTime,
+                       verbosity=args.verbosity,
+                       report_every=args.reportEvery)
+
+    # Printing the global pareto front
+    print(f"{20 * '#'} Global Pareto front from {args.islands} islands {20 * '#'}")
+    for route, fitness_values in front:
+        print(f"Vehicles {fitness_values[0]}, Cost {fitness_values[1]}" +
+              (f", Lateness {fitness_values[2]}" if args.timeWindows else ""))
+        printRoute(routeToSubroute(route, instance, args.decoder))
+
+    csv_file_name = f"{instance.instance_name}_islands{args.islands}_{args.topology}_" \
+                    f"pop{args.popSize}_crossProb{args.crossProb}_mutProb{args.mutProb}_numGen{args.numGen}.csv"
+    exportFront(csv_file_name, front)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,10 @@
 import unittest
 import math
+import pickle
+import random
 from nsga_vrp.utils import calculate_distance
-from nsga_vrp.NSGA2_vrp import load_instance
+from nsga_vrp.NSGA2_vrp import load_instance, cxOrderedVrp, mutationShuffle, nsgaAlgo
+from nsga_vrp.individual import populationArray
 
 
 class TestAlgoMethods(unittest.TestCase):
@@ -9,12 +12,70 @@ class TestAlgoMethods(unittest.TestCase):
 
     def test_crossover(self):
         # To test if given crossover producing correct crossover behaviour
-        pass
+        random.seed(3)
+        ind1 = [3, 2, 5, 1, 6, 9, 8, 7, 4]
+        ind2 = [7, 3, 6, 1, 9, 2, 4, 5, 8]
+        child1, child2 = cxOrderedVrp(ind1, ind2)
+        # Children are the given individuals changed in place, still visiting every customer once
+        self.assertIs(child1, ind1)
+        self.assertIs(child2, ind2)
+        self.assertEqual(sorted(child1), list(range(1, 10)))
+        self.assertEqual(sorted(child2), list(range(1, 10)))
+        self.assertNotEqual((child1, child2), ([3, 2, 5, 1, 6, 9, 8, 7, 4], [7, 3, 6, 1, 9, 2, 4, 5, 8]))
+
+    def test_array_individual(self):
+        # To test if array individuals are cloned, pickled and mated like the list ones
+        algo = nsgaAlgo(pop_size=10, num_gen=1, individual='array')
+        random.seed(3)
+        ind1, ind2 = algo.toolbox.individual(), algo.toolbox.individual()
+        list1, list2 = list(ind1), list(ind2)
+        ind1.fitness.values = (7, 500.0)
+        clone = algo.toolbox.clone(ind1)
+        self.assertEqual((list(clone), clone.fitness.values), (list1, (7, 500.0)))
+        self.assertFalse(hasattr(clone, '__dict__'))
+        unpickled = pickle.loads(pickle.dumps(ind1))
+        self.assertEqual((list(unpickled), unpickled.fitness.values), (list1, (7, 500.0)))
+
+        random.seed(5)
+        algo.toolbox.mate(ind1, ind2)
+        random.seed(5)
+        cxOrderedVrp(list1, list2)
+        self.assertEqual((list(ind1), list(ind2)), (list1, list2))
+        self.assertEqual(populationArray([ind1, ind2]).tolist(), [list1, list2])
 
     def test_mutation(self):
         # To test if given mutation producing correct behaviour
-        pass
+        random.seed(4)
+        ind = list(range(1, 31))
+        moves = []
+        mutant, = mutationShuffle(ind, 0.2, moves)
+        # Individual is swapped in place, still visiting every customer once
+        self.assertIs(mutant, ind)
+        self.assertEqual(sorted(mutant), list(range(1, 31)))
+        self.assertTrue(moves)
+        replayed = list(range(1, 31))
+        for position1, position2 in moves:
+            self.assertNotEqual(position1, position2)
+            replayed[position1], replayed[position2] = replayed[position2], replayed[position1]
+        self.assertEqual(replayed, mutant)
+        self.assertEqual(mutationShuffle(list(range(1, 31)), 0.0), (list(range(1, 31)),))
+
+    def test_unchanged_offspring(self):
+        # To test if offspring neither crossed over nor mutated keep their fitness, and only
+        #   the changed ones are evaluated, without fitness cache
+        for variation in ('loop', 'matrix'):
+            random.seed(6)
+            algo = nsgaAlgo(pop_size=40, num_gen=1, cross_prob=0.0, mut_prob=0.0, cache_size=0,
+                            variation=variation, verbosity=0)
+            algo.generatingPopFitness()
+            algo.runGeneration(0)
+            self.assertEqual(algo.logbook[-1]['evals'], 0)
 
+            algo = nsgaAlgo(pop_size=40, num_gen=1, cross_prob=0.0, mut_prob=0.01, cache_size=0,
+                            variation=variation, verbosity=0)
+            algo.generatingPopFitness()
+            algo.runGeneration(0)
+            self.assertTrue(0 < algo.logbook[-1]['evals'] < 40)
 
 
 if __name__ == '__main__':
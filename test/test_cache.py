@@ -0,0 +1,125 @@
+import io
+import random
+import unittest
+import numpy
+from functools import partial
+from contextlib import redirect_stdout
+from nsga_vrp.cache import FitnessCache, SubrouteCache, routeKey
+from nsga_vrp.instance import compileInstance
+from nsga_vrp.generator import generateInstance
+from nsga_vrp.parallel import EvaluationBackend
+from nsga_vrp.NSGA2_vrp import load_instance, eval_indvidual_fitness, eval_fitness_subroute_cache, \
+    subrouteStarts, nsgaAlgo
+
+
+class TestCache(unittest.TestCase):
+
+    def test_route_key(self):
+        # To test if same routes give same key whatever their container is
+        self.assertEqual(routeKey([3, 1, 2]), routeKey((3, 1, 2)))
+        self.assertNotEqual(routeKey([3, 1, 2]), routeKey([1, 3, 2]))
+
+    def test_lru_eviction(self):
+        # To test if least recently used route is evicted and counters are taken
+        cache = FitnessCache(maxsize=2, eviction='lru')
+        cache.put(routeKey([1, 2]), (1, 10.0))
+        cache.put(routeKey([2, 1]), (1, 12.0))
+        self.assertEqual(cache.get(routeKey([1, 2])), (1, 10.0))
+        cache.put(routeKey([1, 3]), (2, 20.0))
+        self.assertIsNone(cache.get(routeKey([2, 1])))
+        self.assertEqual(cache.get(routeKey([1, 2])), (1, 10.0))
+        self.assertEqual(cache.takeCounters(), (2, 1))
+        self.assertEqual(cache.takeCounters(), (0, 0))
+
+    def test_fifo_eviction(self):
+        # To test if oldest route is evicted even when it was used recently
+        cache = FitnessCache(maxsize=2, eviction='fifo')
+        cache.put(routeKey([1, 2]), (1, 10.0))
+        cache.put(routeKey([2, 1]), (1, 12.0))
+        cache.get(routeKey([1, 2]))
+        cache.put(routeKey([1, 3]), (2, 20.0))
+        self.assertIsNone(cache.get(routeKey([1, 2])))
+        self.assertEqual(len(cache), 2)
+
+    def test_subroute_key(self):
+        # To test if a subroute and its reverse are kept apart, their distances being summed in another order
+        cache = SubrouteCache()
+        self.assertEqual(cache.key([4, 2, 7]), (4, 2, 7))
+        self.assertNotEqual(cache.key([4, 2, 7]), cache.key([7, 2, 4]))
+
+    def test_subroute_cache_fitness(self):
+        # To test if cached subroutes give the same fitness, also when evaluated by worker processes
+        instance = compileInstance(load_instance('./data/json/Input_Data.json'))
+        cached_instance = instance.withSubrouteCache(1000)
+        self.assertIsNone(instance.subroute_cache)
+        random.seed(2)
+        population = numpy.array([random.sample(range(1, 26), 25) for _ in range(20)])
+        for decoder in ('greedy', 'optimal'):
+            for individual in population:
+                numpy.testing.assert_allclose(
+                    eval_fitness_subroute_cache(individual, cached_instance, 1, decoder),
+                    eval_indvidual_fitness(individual, instance, 1, decoder))
+        hits, misses = cached_instance.subroute_cache.takeCounters()
+        self.assertEqual(misses, len(cached_instance.subroute_cache))
+
+        # Lookups made by the worker processes are counted in the parent's cache
+        num_subroutes = sum(len(subrouteStarts(individual, instance)) for individual in population)
+        cached_instance = instance.withSubrouteCache(1000)
+        evaluation_backend = EvaluationBackend(cached_instance, backend='process', workers=2)
+        try:
+            fitnesses = evaluation_backend.evaluate(
+                partial(eval_fitness_subroute_cache, instance=cached_instance, unit_cost=1), population, batch=False)
+        finally:
+            evaluation_backend.close()
+        numpy.testing.assert_allclose(fitnesses, [eval_indvidual_fitness(individual, instance, 1)
+                                                  for individual in population])
+        self.assertEqual(sum(cached_instance.subroute_cache.takeCounters()), num_subroutes)
+        # Entries stay in the private caches of the workers
+        self.assertEqual(len(cached_instance.subroute_cache), 0)
+
+    def test_subroute_cache_order(self):
+        # To test if the fitness of a route does not depend on its reverse having been cached before
+        instance = generateInstance(30, demand='unitary', route_size=30, seed=0, matrix=True)
+        cached_instance = instance.withSubrouteCache(1000)
+        random.seed(5)
+        for _ in range(20):
+            route = random.sample(range(1, 31), 30)
+            expected = eval_fitness_subroute_cache(route[::-1], instance.withSubrouteCache(1000), 1)
+            eval_fitness_subroute_cache(route, cached_instance, 1)
+            self.assertEqual(eval_fitness_subroute_cache(route[::-1], cached_instance, 1), expected)
+
+    def test_subroute_cache_backends(self):
+        # To test if a run with the subroute cache ends the same with one process or a pool of them
+        def runAlgo(backend):
+            random.seed(4)
+            algo = nsgaAlgo(pop_size=40, num_gen=15, subroute_cache=10000, backend=backend, workers=2,
+                            verbosity=0)
+            algo.generatingPopFitness()
+            algo.runGenerations()
+            algo.backend.close()
+            return [ind.fitness.values for ind in algo.pop]
+
+        self.assertEqual(runAlgo('serial'), runAlgo('process'))
+
+    def test_subroute_hit_rate(self):
+        # To test if the hit rate of every generation is recorded, and grows as the population converges
+        random.seed(3)
+        algo = nsgaAlgo(pop_size=40, num_gen=30, subroute_cache=10000, verbosity=0)
+        algo.generatingPopFitness()
+        algo.runGenerations()
+        hit_rates = [record['subroute_hit_rate'] for record in algo.logbook]
+        self.assertEqual(len(hit_rates), 31)
+        self.assertGreater(hit_rates[-1], max(0.5, hit_rates[0]))
+
+    def test_subroute_cache_batch_fallback(self):
+        # To test if turning batch evaluation off for the subroute cache is announced
+        output = io.StringIO()
+        with redirect_stdout(output):
+            algo = nsgaAlgo(pop_size=40, num_gen=1, subroute_cache=100, verbosity=1)
+            algo.reporter.close()
+        self.assertFalse(algo.batch_eval)
+        self.assertIn('batch evaluation is off', output.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import os
+import random
+import tempfile
+import unittest
+from nsga_vrp.NSGA2_vrp import nsgaAlgo
+from nsga_vrp.checkpoint import loadCheckpoint
+
+
+class TestCheckpoint(unittest.TestCase):
+
+    def runAlgo(self, checkpoint, num_gen, resume=False):
+        random.seed(3)
+        algo = nsgaAlgo(pop_size=40, num_gen=num_gen, checkpoint=checkpoint, checkpoint_interval=5, resume=resume)
+        if not algo.resumeCheckpoint():
+            algo.generatingPopFitness()
+        algo.runGenerations()
+        algo.checkpointer.close()
+        return algo
+
+    def test_resume(self):
+        # To test if a run resumed from its checkpoint ends the same as one run without stopping
+        with tempfile.TemporaryDirectory() as temp_dir:
+            checkpoint = os.path.join(temp_dir, 'run.ckpt')
+            full_run = self.runAlgo(checkpoint, 12)
+            os.remove(checkpoint)
+
+            self.runAlgo(checkpoint, 6)
+            self.assertEqual(loadCheckpoint(checkpoint)['generation'], 6)
+            resumed_run = self.runAlgo(checkpoint, 12, resume=True)
+            self.assertEqual(os.listdir(temp_dir), ['run.ckpt'])
+
+        self.assertEqual(resumed_run.generation, 12)
+        self.assertEqual([list(ind) for ind in resumed_run.pop], [list(ind) for ind in full_run.pop])
+        self.assertEqual([record['min'].tolist() for record in resumed_run.logbook],
+                         [record['min'].tolist() for record in full_run.logbook])
+
+    def test_resume_mismatch(self):
+        # To test if a checkpoint of another configuration is refused instead of being mixed in
+        with tempfile.TemporaryDirectory() as temp_dir:
+            checkpoint = os.path.join(temp_dir, 'run.ckpt')
+            self.runAlgo(checkpoint, 5)
+            state = loadCheckpoint(checkpoint)
+            for algo_kwargs in ({'time_windows': True}, {'decoder': 'optimal'}):
+                algo = nsgaAlgo(pop_size=40, num_gen=10, verbosity=0, **algo_kwargs)
+                with self.assertRaises(ValueError):
+                    algo.restoreCheckpoint(state)
+            state['instance_name'] = 'other_instance'
+            with self.assertRaises(ValueError):
+                nsgaAlgo(pop_size=40, num_gen=10, verbosity=0).restoreCheckpoint(state)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+import random
+from nsga_vrp.instance import compileInstance
+from nsga_vrp.delta import splitState, swapDeltaState, stateFitness
+from nsga_vrp.NSGA2_vrp import load_instance, routeToSubroute, eval_indvidual_fitness, mutationShuffle
+
+
+class TestDelta(unittest.TestCase):
+
+    def setUp(self):
+        self.instance = compileInstance(load_instance('./data/json/Input_Data.json'))
+
+    def test_split_state(self):
+        # To test if subroute starts match the subroutes of routeToSubroute
+        sample_individual = [19, 5, 24, 7, 16, 23, 22, 2, 12, 8, 20, 25, 21, 18, 11, 15, 1, 14, 17, 6, 4, 13, 10, 3, 9]
+        state = splitState(sample_individual, self.instance)
+        self.assertEqual(state.starts, [0, 4, 7, 10, 13, 16, 21])
+        self.assertEqual(len(routeToSubroute(sample_individual, self.instance)), len(state.starts))
+        vehicles, route_cost = stateFitness(state)
+        self.assertEqual(vehicles, 7)
+        self.assertAlmostEqual(route_cost, eval_indvidual_fitness(sample_individual, self.instance, 1)[1])
+
+    def test_swap_delta(self):
+        # To test if evaluating only the affected subroutes after swaps gives the same
+        #   subroutes and fitness as evaluating the mutated route from scratch
+        for _ in range(200):
+            parent = random.sample(range(1, 26), 25)
+            parent_state = splitState(parent, self.instance)
+            child, moves = list(parent), []
+            mutationShuffle(child, 0.1, moves=moves)
+            if not moves:
+                continue
+            delta_state = swapDeltaState(child, parent_state, moves, self.instance)
+            full_state = splitState(child, self.instance)
+            self.assertEqual(delta_state.starts, full_state.starts)
+            self.assertEqual(delta_state.loads, full_state.loads)
+            self.assertAlmostEqual(stateFitness(delta_state)[1], stateFitness(full_state)[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,7 @@
 import unittest
 import math
-from nsga_vrp.utils import calculate_distance
+import numpy
+from nsga_vrp.utils import calculate_distance, buildDistanceMatrix
 from nsga_vrp.NSGA2_vrp import load_instance
 
 
@@ -16,5 +17,23 @@ class TestDistance(unittest.TestCase):
         math_result = math.sqrt((40-38)**2 + (66-68)**2)
         self.assertEqual(calculated_result, math_result)
 
+    def test_distance_matrix(self):
+        # To test if vectorized distance matrix is same as distance of each pair of customers
+        loaded_instance = load_instance("./data/json/Input_Data.json")
+        places = [loaded_instance['depart']] + [loaded_instance[f'customer_{i}'] for i in range(1, 26)]
+        coordinates = [(place['coordinates']['x'], place['coordinates']['y']) for place in places]
+        distance_matrix = buildDistanceMatrix(coordinates, block_rows=7)
+        self.assertEqual(distance_matrix.tolist(),
+                         [[calculate_distance(place1, place2) for place2 in places] for place1 in places])
+
+    def test_distance_rounding(self):
+        # To test Solomon and TSPLIB rounding of distances and float32 output
+        coordinates = [(0, 0), (1, 1), (3, 4)]
+        solomon_matrix = buildDistanceMatrix(coordinates, rounding='solomon')
+        self.assertEqual(solomon_matrix[0][1], 1.4)
+        tsplib_matrix = buildDistanceMatrix(coordinates, dtype=numpy.float32, rounding='tsplib')
+        self.assertEqual(tsplib_matrix.dtype, numpy.float32)
+        self.assertEqual(tsplib_matrix.tolist(), [[0, 1, 5], [1, 0, 4], [5, 4, 0]])
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,91 @@
+import unittest
+import random
+import numpy
+from nsga_vrp.instance import compileInstance
+from nsga_vrp.distance import MatrixDistance, EuclideanDistance
+from nsga_vrp.utils import buildDistanceMatrix
+from nsga_vrp.split import optimalSplit
+from nsga_vrp.delta import splitState
+from nsga_vrp.NSGA2_vrp import load_instance, eval_fitness_single_pass, eval_population_fitness, \
+    nsgaAlgo
+
+
+class TestDistanceProvider(unittest.TestCase):
+
+    def setUp(self):
+        self.instance = compileInstance(load_instance('./data/json/Input_Data.json'))
+        self.matrix_free_instance = self.instance.matrixFree(cache_rows=4)
+
+    def test_matrix_free_distances(self):
+        # To test if distances computed on demand are same as the distance matrix
+        self.assertIsNone(self.matrix_free_instance.distance_matrix)
+        all_ids = numpy.arange(26)
+        numpy.testing.assert_array_equal(self.matrix_free_instance.pairDistances(all_ids[:, None], all_ids[None, :]),
+                                         self.instance.distance_matrix)
+        self.assertEqual(self.matrix_free_instance.distance(7, 8), self.instance.distance(7, 8))
+        self.matrix_free_instance.distances.row(7)
+        self.assertEqual(self.matrix_free_instance.distance(7, 8), self.instance.distance(7, 8))
+
+    def test_matrix_free_evaluation(self):
+        # To test if all evaluators give the same fitness without distance matrix
+        population = [random.sample(range(1, 26), 25) for _ in range(20)]
+        numpy.testing.assert_allclose(eval_population_fitness(population, self.matrix_free_instance, 1),
+                                      eval_population_fitness(population, self.instance, 1))
+        for individual in population:
+            self.assertEqual(eval_fitness_single_pass(individual, self.matrix_free_instance, 1),
+                             eval_fitness_single_pass(individual, self.instance, 1))
+            self.assertEqual(optimalSplit(individual, self.matrix_free_instance),
+                             optimalSplit(individual, self.instance))
+            self.assertEqual(splitState(individual, self.matrix_free_instance),
+                             splitState(individual, self.instance))
+
+    def test_row_cache_in_run(self):
+        # To test if a matrix free run fills the row cache, bounded and the depot row kept as most used
+        random.seed(1)
+        algo = nsgaAlgo(pop_size=40, num_gen=3, verbosity=0, matrix_free=True, distance_cache_rows=6,
+                        local_search=5)
+        algo.generatingPopFitness()
+        algo.runGenerations()
+        rows = algo.instance.distances.rows
+        self.assertTrue(0 < len(rows) <= 6)
+        self.assertIn(0, rows)
+        numpy.testing.assert_array_equal(rows[0], self.instance.distance_matrix[0])
+
+    def test_single_distance_builds_no_row(self):
+        # To test if single distances are computed alone on a miss, and read from a row already cached
+        euclidean_distance = EuclideanDistance(self.instance.coordinates, cache_rows=2)
+        for from_id, to_id in [(3, 9), (4, 11), (5, 2)]:
+            self.assertEqual(euclidean_distance.one(from_id, to_id), self.instance.distance(from_id, to_id))
+        self.assertEqual(len(euclidean_distance.rows), 0)
+        splitState(list(range(1, 26)), self.matrix_free_instance)
+        self.assertEqual(len(self.matrix_free_instance.distances.rows), 0)
+        euclidean_distance.pairs(3, numpy.arange(26))
+        euclidean_distance.pairs(4, 7)
+        self.assertEqual(list(euclidean_distance.rows), [3])
+        self.assertEqual(euclidean_distance.one(3, 9), self.instance.distance(3, 9))
+
+    def test_rounded_matrix_free(self):
+        # To test if rounding is applied the same way as when building the matrix
+        coordinates = numpy.random.rand(30, 2) * 100
+        for rounding in ('solomon', 'tsplib'):
+            matrix_distance = MatrixDistance(buildDistanceMatrix(coordinates, rounding=rounding))
+            euclidean_distance = EuclideanDistance(coordinates, rounding=rounding)
+            numpy.testing.assert_array_equal(euclidean_distance.row(3), matrix_distance.row(3))
+            self.assertEqual(euclidean_distance.one(4, 9), matrix_distance.one(4, 9))
+
+    def test_nearest_neighbours(self):
+        # To test if both providers give the same nearest customers, nearest first
+        matrix_neighbours = self.instance.nearestNeighbours(5)
+        numpy.testing.assert_array_equal(self.matrix_free_instance.nearestNeighbours(5), matrix_neighbours)
+        self.assertEqual(matrix_neighbours.shape, (26, 5))
+        for place_id, neighbours in enumerate(matrix_neighbours):
+            self.assertNotIn(place_id, neighbours)
+            self.assertNotIn(0, neighbours)
+            distances = self.instance.distance_matrix[place_id][neighbours]
+            self.assertTrue(numpy.all(numpy.diff(distances) >= 0))
+            others = numpy.setdiff1d(numpy.arange(1, 26), numpy.append(neighbours, place_id))
+            self.assertLessEqual(distances[-1], self.instance.distance_matrix[place_id][others].min())
+
+
+if __name__ == '__main__':
+    unittest.main()
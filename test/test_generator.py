@@ -0,0 +1,57 @@
+import os
+import tempfile
+import unittest
+import numpy
+from nsga_vrp.generator import LAYOUTS, DEMANDS, generateInstance
+from nsga_vrp.instance import compileInstance
+from nsga_vrp.utils import writeInstance, buildDistanceMatrix
+from nsga_vrp.NSGA2_vrp import load_instance
+
+
+class TestGenerator(unittest.TestCase):
+
+    def test_seed(self):
+        # To test if the same seed gives the same instance, and every layout and demand gives a valid one
+        for layout in LAYOUTS:
+            for demand in DEMANDS:
+                instance = generateInstance(300, layout=layout, demand=demand, seed=3)
+                again = generateInstance(300, layout=layout, demand=demand, seed=3)
+                numpy.testing.assert_array_equal(instance.coordinates, again.coordinates)
+                numpy.testing.assert_array_equal(instance.demands, again.demands)
+                self.assertEqual(instance.num_customers, 300)
+                self.assertEqual(instance.demands[0], 0)
+                self.assertTrue(numpy.all(instance.demands[1:] >= 1))
+                self.assertTrue(numpy.all((instance.coordinates >= 0) & (instance.coordinates <= 1000)))
+        self.assertFalse(numpy.array_equal(generateInstance(300, seed=3).coordinates,
+                                           generateInstance(300, seed=4).coordinates))
+
+    def test_tightness(self):
+        # To test if the fleet is filled to the given tightness
+        for tightness in (0.5, 0.9, 1.0):
+            instance = generateInstance(1000, tightness=tightness, route_size=20, seed=1)
+            self.assertEqual(instance.max_vehicle_number, 50)
+            fleet_capacity = instance.max_vehicle_number * instance.vehicle_capacity
+            self.assertAlmostEqual(instance.demands.sum() / fleet_capacity, tightness, places=2)
+            self.assertGreaterEqual(instance.vehicle_capacity, instance.demands.max())
+
+    def test_write(self):
+        # To test if written instances load back the same, with or without distance matrix
+        instance = generateInstance(50, layout='mixed', depot='corner', seed=2, rounding='solomon', matrix=True)
+        numpy.testing.assert_allclose(instance.distance_matrix,
+                                      buildDistanceMatrix(instance.coordinates, rounding='solomon'))
+        matrix_free = generateInstance(50, layout='mixed', depot='corner', seed=2, rounding='solomon')
+        self.assertIsNone(matrix_free.distance_matrix)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for written, binary in ((instance, False), (matrix_free, False), (instance, True)):
+                json_file = os.path.join(temp_dir, f'instance_{binary}.json')
+                writeInstance(written, json_file, binary=binary)
+                loaded = compileInstance(load_instance(json_file))
+                numpy.testing.assert_allclose(loaded.coordinates, instance.coordinates)
+                numpy.testing.assert_allclose(loaded.demands, instance.demands)
+                self.assertEqual(loaded.vehicle_capacity, instance.vehicle_capacity)
+                numpy.testing.assert_allclose(loaded.pairDistances(0, numpy.arange(1, 51)),
+                                              instance.distance_matrix[0, 1:])
+
+
+if __name__ == '__main__':
+    unittest.main()
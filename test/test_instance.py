@@ -0,0 +1,73 @@
+import os
+import unittest
+import tempfile
+import numpy
+from nsga_vrp.instance import VrpInstance, compileInstance, writeBinaryInstance
+from nsga_vrp.NSGA2_vrp import load_instance, routeToSubroute, getRouteCost, eval_indvidual_fitness
+
+
+class TestInstance(unittest.TestCase):
+
+    def test_compiled_arrays(self):
+        # To test if the compiled instance holds the same data as the json object
+        loaded_instance = load_instance('./data/json/Input_Data.json')
+        compiled_instance = compileInstance(loaded_instance)
+        self.assertEqual(compiled_instance.num_customers, loaded_instance['Number_of_customers'])
+        self.assertEqual(compiled_instance.demands[7], loaded_instance['customer_7']['demand'])
+        self.assertEqual(tuple(compiled_instance.coordinates[0]), (40, 50))
+        self.assertEqual(compiled_instance.distance_matrix[7][8], loaded_instance['distance_matrix'][7][8])
+        self.assertIs(compileInstance(compiled_instance), compiled_instance)
+
+    def test_compiled_evaluation(self):
+        # To test if the helpers evaluate the compiled instance, and refuse the json object
+        #   instead of compiling it again on every call
+        loaded_instance = load_instance('./data/json/Input_Data.json')
+        compiled_instance = VrpInstance.fromJson(loaded_instance)
+        sample_individual = [19, 5, 24, 7, 16, 23, 22, 2, 12, 8, 20, 25, 21, 18, 11, 15, 1, 14, 17, 6, 4, 13, 10, 3, 9]
+        self.assertEqual(len(routeToSubroute(sample_individual, compiled_instance)), 7)
+        self.assertEqual(eval_indvidual_fitness(sample_individual, compiled_instance, 1),
+                         (7, getRouteCost(sample_individual, compiled_instance, 1)))
+        with self.assertRaises(TypeError):
+            routeToSubroute(sample_individual, loaded_instance)
+        with self.assertRaises(TypeError):
+            getRouteCost(sample_individual, loaded_instance, 1)
+        with self.assertRaises(TypeError):
+            eval_indvidual_fitness(sample_individual, loaded_instance, 1)
+
+    def test_binary_instance(self):
+        # To test if binary instance is loaded back with memory mapped distance matrix
+        loaded_instance = load_instance('./data/json/Input_Data.json')
+        compiled_instance = compileInstance(loaded_instance)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            json_file = os.path.join(temp_dir, 'Input_Data.json')
+            writeBinaryInstance(loaded_instance, json_file)
+            binary_instance = load_instance(json_file)
+            self.assertIsInstance(binary_instance, VrpInstance)
+            self.assertIsInstance(binary_instance.distance_matrix.base, numpy.memmap)
+            self.assertEqual(binary_instance.instance_name, 'Input_Data')
+            self.assertEqual(binary_instance.vehicle_capacity, compiled_instance.vehicle_capacity)
+            numpy.testing.assert_array_equal(binary_instance.demands, compiled_instance.demands)
+            numpy.testing.assert_array_equal(binary_instance.due_times, compiled_instance.due_times)
+            numpy.testing.assert_array_equal(binary_instance.distance_matrix, compiled_instance.distance_matrix)
+            # Symmetry comes with the metadata, the memory mapped matrix is not read for it
+            self.assertIs(binary_instance.symmetric_distances, True)
+            del binary_instance
+
+    def test_symmetric_blocks(self):
+        # To test if symmetry is checked block by block, also with a difference off the diagonal blocks
+        compiled_instance = compileInstance(load_instance('./data/json/Input_Data.json'))
+        self.assertIsNone(compiled_instance.symmetric_distances)
+        self.assertTrue(compiled_instance.distances.isSymmetric(block_rows=4))
+        self.assertTrue(compiled_instance.symmetric)
+        distance_matrix = compiled_instance.distance_matrix.copy()
+        distance_matrix[3, 21] += 1
+        asymmetric_instance = VrpInstance('asymmetric', 200, 8, compiled_instance.coordinates,
+                                          compiled_instance.demands, compiled_instance.ready_times,
+                                          compiled_instance.due_times, compiled_instance.service_times,
+                                          distance_matrix=distance_matrix)
+        self.assertFalse(asymmetric_instance.distances.isSymmetric(block_rows=4))
+        self.assertFalse(asymmetric_instance.symmetric)
+
+
+if __name__ == '__main__':
+    unittest.main()
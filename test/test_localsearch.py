@@ -0,0 +1,62 @@
+import time
+import random
+import unittest
+import numpy
+from nsga_vrp.NSGA2_vrp import load_instance, routeToSubroute, getRouteCost, nsgaAlgo
+from nsga_vrp.instance import VrpInstance, compileInstance
+from nsga_vrp.localsearch import LocalSearch
+
+
+class TestLocalSearch(unittest.TestCase):
+
+    def test_improve_routes(self):
+        # To test if local search keeps every customer once, within capacity, at lower cost
+        random.seed(2)
+        instance = compileInstance(load_instance('./data/json/Input_Data.json'))
+        sample_individual = [19, 5, 24, 7, 16, 23, 22, 2, 12, 8, 20, 25, 21, 18, 11, 15, 1, 14, 17, 6, 4, 13, 10, 3, 9]
+        routes = routeToSubroute(sample_individual, instance)
+        improved = LocalSearch(instance, 8).improveRoutes(routes, time.perf_counter() + 5)
+
+        self.assertEqual(sorted(customer for route in improved for customer in route), list(range(1, 26)))
+        for route in improved:
+            self.assertLessEqual(sum(instance.demands[route]), instance.vehicle_capacity)
+        cost = sum(getRouteCost(route, instance) for route in improved)
+        self.assertLess(cost, sum(getRouteCost(route, instance) for route in routes))
+
+    def test_asymmetric_two_opt(self):
+        # To test if 2-opt moves on an asymmetric matrix only lower the cost, taking into account
+        #   the edges of the reversed segment that are travelled the other way
+        random.seed(2)
+        compiled_instance = compileInstance(load_instance('./data/json/Input_Data.json'))
+        distance_matrix = compiled_instance.distance_matrix.copy()
+        distance_matrix += numpy.triu(numpy.random.RandomState(0).uniform(0, 30, distance_matrix.shape), 1)
+        instance = VrpInstance('asymmetric', 1000, 8, compiled_instance.coordinates,
+                               compiled_instance.demands, compiled_instance.ready_times,
+                               compiled_instance.due_times, compiled_instance.service_times,
+                               distance_matrix=distance_matrix)
+        self.assertFalse(instance.symmetric)
+
+        local_search = LocalSearch(instance, 8)
+        for _ in range(20):
+            route = random.sample(range(1, 26), 25)
+            for u in route:
+                for v in local_search.neighbours[u]:
+                    local_search.improveRoutes([route], deadline=0)
+                    cost = getRouteCost(local_search.routes[0], instance)
+                    if local_search.twoOpt(u, v):
+                        self.assertLess(getRouteCost(local_search.routes[0], instance), cost)
+
+    def test_memetic_generation(self):
+        # To test if improved offspring keep fitness values matching their routes
+        random.seed(2)
+        algo = nsgaAlgo(pop_size=40, num_gen=3, local_search=4)
+        algo.generatingPopFitness()
+        algo.runGenerations()
+        self.assertTrue(any(record['local_search'] for record in algo.logbook))
+        for ind in algo.pop:
+            self.assertEqual(sorted(ind), list(range(1, 26)))
+            self.assertAlmostEqual(algo.toolbox.evaluate(ind)[1], ind.fitness.values[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
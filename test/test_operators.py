@@ -0,0 +1,39 @@
+import unittest
+import numpy
+from unittest import mock
+from nsga_vrp.NSGA2_vrp import cxOrderedVrp
+from nsga_vrp.operators import cxOrderedPopulation, mutShufflePopulation
+
+
+class TestOperators(unittest.TestCase):
+
+    def test_crossover_population(self):
+        # To test if every pair of the matrix crossover gets the children of cxOrderedVrp with same cuts
+        parents1 = numpy.array([numpy.random.permutation(9) + 1 for _ in range(50)])
+        parents2 = numpy.array([numpy.random.permutation(9) + 1 for _ in range(50)])
+        children1, children2 = cxOrderedPopulation(parents1, parents2, numpy.random.default_rng(7))
+
+        # Same cut points as drawn by cxOrderedPopulation
+        rng = numpy.random.default_rng(7)
+        cut_a, cut_b = rng.integers(0, 9, 50), rng.integers(0, 8, 50)
+        cut_b += cut_b >= cut_a
+        for row in range(50):
+            ind1, ind2 = parents1[row].tolist(), parents2[row].tolist()
+            cuts = sorted((cut_a[row], cut_b[row]))
+            with mock.patch('random.sample', return_value=cuts):
+                cxOrderedVrp(ind1, ind2)
+            self.assertEqual((children1[row].tolist(), children2[row].tolist()), (ind1, ind2))
+
+    def test_mutation_population(self):
+        # To test if the swaps done in rounds give the same routes as doing them one after another
+        population = numpy.array([numpy.random.permutation(30) + 1 for _ in range(40)])
+        mutated = population.copy()
+        swap_rows, swap_positions, swap_with = mutShufflePopulation(mutated, 0.1, numpy.random.default_rng(3))
+        self.assertTrue(len(swap_rows) > 0)
+        for row, position, other in zip(swap_rows, swap_positions, swap_with):
+            population[row, position], population[row, other] = population[row, other], population[row, position]
+        numpy.testing.assert_array_equal(mutated, population)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import unittest
+import random
+import queue
+import numpy
+from functools import partial
+from nsga_vrp.instance import compileInstance
+from nsga_vrp.parallel import EvaluationBackend
+from nsga_vrp.islands import migrationTargets, migrationSources, mergeFronts, runIslands, \
+    runIsland
+from nsga_vrp.NSGA2_vrp import load_instance, eval_population_fitness, eval_fitness_single_pass
+
+
+class TestParallel(unittest.TestCase):
+
+    def setUp(self):
+        self.instance = compileInstance(load_instance('./data/json/Input_Data.json'))
+        self.population = numpy.array([random.sample(range(1, 26), 25) for _ in range(37)])
+        self.expected = eval_population_fitness(self.population, self.instance, unit_cost=1)
+
+    def check_backend(self, backend):
+        # To test if population slices evaluated by workers come back in the same order
+        evaluation_backend = EvaluationBackend(self.instance, backend=backend, workers=3)
+        try:
+            batch_fitness = evaluation_backend.evaluate(
+                partial(eval_population_fitness, instance=self.instance, unit_cost=1), self.population, batch=True)
+            single_fitness = evaluation_backend.evaluate(
+                partial(eval_fitness_single_pass, instance=self.instance, unit_cost=1), self.population, batch=False)
+        finally:
+            evaluation_backend.close()
+        numpy.testing.assert_allclose(batch_fitness, self.expected)
+        numpy.testing.assert_allclose(single_fitness, self.expected)
+
+    def test_serial_backend(self):
+        self.check_backend('serial')
+
+    def test_thread_backend(self):
+        self.check_backend('thread')
+
+    def test_process_backend(self):
+        self.check_backend('process')
+
+    def test_process_backends_own_instances(self):
+        # To test if a backend built before another one starts its workers still evaluates its own instance
+        other_instance = compileInstance(load_instance('./data/json/Input_Data.json'))
+        other_instance.demands = other_instance.demands * 2
+        first = EvaluationBackend(self.instance, backend='process', workers=2)
+        second = EvaluationBackend(other_instance, backend='process', workers=2)
+        try:
+            first_fitness = first.evaluate(partial(eval_population_fitness, instance=self.instance, unit_cost=1),
+                                           self.population, batch=True)
+            second_fitness = second.evaluate(partial(eval_population_fitness, instance=other_instance, unit_cost=1),
+                                             self.population, batch=True)
+        finally:
+            first.close()
+            second.close()
+        numpy.testing.assert_allclose(first_fitness, self.expected)
+        numpy.testing.assert_allclose(second_fitness,
+                                      eval_population_fitness(self.population, other_instance, unit_cost=1))
+
+    def test_migration_topology(self):
+        # To test which islands send migrants to which
+        self.assertEqual(migrationTargets(3, 4, 'ring'), [0])
+        self.assertEqual(migrationSources(0, 4, 'ring'), [3])
+        self.assertEqual(migrationTargets(1, 3, 'full'), [0, 2])
+        self.assertEqual(migrationSources(1, 3, 'full'), [0, 2])
+        self.assertEqual(migrationTargets(0, 1, 'ring'), [])
+
+    def test_merge_fronts(self):
+        # To test if merged front keeps only non dominated and unique routes
+        front1 = [([1, 2, 3], (2, 10.0)), ([3, 2, 1], (3, 8.0))]
+        front2 = [([2, 1, 3], (2, 9.0)), ([1, 2, 3], (2, 10.0)), ([1, 3, 2], (4, 7.0))]
+        merged = mergeFronts([front1, front2])
+        self.assertEqual(merged, [([2, 1, 3], (2, 9.0)), ([3, 2, 1], (3, 8.0)), ([1, 3, 2], (4, 7.0))])
+
+    def test_run_islands(self):
+        # To test if islands exchange migrants and give back one global front
+        front = runIslands(num_islands=2, topology='ring', migration_interval=1, num_migrants=2, seed=0,
+                           instance=self.instance, pop_size=8, num_gen=2)
+        self.assertTrue(front)
+        for route, fitness_values in front:
+            self.assertEqual(sorted(route), list(range(1, 26)))
+
+    def test_islands_stopping_early(self):
+        # To test if islands stopping before num_gen do not leave the others waiting for migrants
+        front = runIslands(num_islands=3, topology='full', migration_interval=1, num_migrants=2, seed=0,
+                           instance=self.instance, pop_size=8, num_gen=4, target_cost=1e9, verbosity=0)
+        self.assertTrue(front)
+
+        # Source island that stopped at once, this one goes on to num_gen without its migrants
+        inboxes, results = [queue.Queue(), queue.Queue()], queue.Queue()
+        inboxes[0].put((1, None, None))
+        runIsland(0, 2, 'ring', 1, 2, inboxes, results, {'instance': self.instance, 'pop_size': 8, 'num_gen': 4,
+                                                         'verbosity': 0}, 0)
+        island, front, error = results.get_nowait()
+        self.assertIsNone(error)
+        self.assertTrue(front)
+        self.assertEqual(inboxes[1].qsize(), 4)
+
+    def test_migration_rounds(self):
+        # To test if migrants from a later round wait for that round, and ones from a round
+        #   already over are dropped. Either of these migrants would be the only one in the front
+        stale_route, future_route = list(range(1, 26)), list(range(25, 0, -1))
+        inboxes, results = [queue.Queue(), queue.Queue()], queue.Queue()
+        inboxes[0].put((1, 0, [(stale_route, (0, 0.0))]))
+        inboxes[0].put((1, 2, [(future_route, (0, 1.0))]))
+        inboxes[0].put((1, 1, []))
+        inboxes[0].put((1, None, None))
+        runIsland(0, 2, 'ring', 1, 2, inboxes, results, {'instance': self.instance, 'pop_size': 8, 'num_gen': 4,
+                                                         'verbosity': 0}, 0)
+        island, front, error = results.get_nowait()
+        self.assertIsNone(error)
+        self.assertEqual(front, [(future_route, (0.0, 1.0))])
+        rounds = [inboxes[1].get_nowait()[1] for _ in range(4)]
+        self.assertEqual(rounds, [1, 2, 3, None])
+
+    def test_island_failure(self):
+        # To test if a failing island is reported instead of leaving the run waiting
+        with self.assertRaises(RuntimeError) as context:
+            runIslands(num_islands=2, topology='ring', migration_interval=1, seed=0, poll_seconds=0.1,
+                       instance=self.instance, pop_size=6, num_gen=3, verbosity=0)
+        self.assertIn('divisible by four', str(context.exception))
+        with self.assertRaises(ValueError):
+            runIslands(num_islands=2, instance=self.instance, checkpoint='islands.pkl')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+import os
+import unittest
+import tempfile
+import numpy
+from nsga_vrp.utils import parseTextInstance, textToInstance, instanceToJson
+from nsga_vrp.NSGA2_vrp import load_instance
+
+
+class TestParse(unittest.TestCase):
+
+    def test_text_instance(self):
+        # To test if the parsed text file gives the same json object as the converted one
+        loaded_instance = load_instance('./data/json/Input_Data.json')
+        text_instance = textToInstance('./data/text/Input_Data.txt')
+        self.assertEqual(instanceToJson(text_instance), loaded_instance)
+
+    def test_header_layout(self):
+        # To test if places are found without fixed line numbers and out of order customers are sorted
+        text = ("C_TEST\n\nVEHICLE\nNUMBER     CAPACITY\n  5         50\n\nCUSTOMER\n"
+                "CUST NO.  XCOORD.   YCOORD.    DEMAND   READY TIME  DUE DATE   SERVICE TIME\n\n"
+                "    0      10         10          0          0       100          0\n"
+                "    2      13         14          7          5        50         10\n"
+                "    1      10         20          5          0        40         10\n")
+        with tempfile.TemporaryDirectory() as temp_dir:
+            text_file = os.path.join(temp_dir, 'C_TEST.txt')
+            with open(text_file, 'w') as file_object:
+                file_object.write(text)
+            instance_name, max_vehicle_number, vehicle_capacity, places = parseTextInstance(text_file)
+        self.assertEqual((instance_name, max_vehicle_number, vehicle_capacity), ('C_TEST', 5, 50.0))
+        numpy.testing.assert_array_equal(places[:, 0], [0, 1, 2])
+        numpy.testing.assert_array_equal(places[:, 3], [0, 5, 7])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import io
+import os
+import json
+import random
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from nsga_vrp.NSGA2_vrp import nsgaAlgo
+from deap import tools
+from nsga_vrp.reporting import QUIET, PROGRESS, VERBOSE, Reporter
+
+
+class TestReporting(unittest.TestCase):
+
+    def runAlgo(self, **algo_kwargs):
+        random.seed(1)
+        output = io.StringIO()
+        with redirect_stdout(output):
+            algo = nsgaAlgo(pop_size=40, num_gen=6, **algo_kwargs)
+            algo.generatingPopFitness()
+            algo.runGenerations()
+            algo.getBestInd()
+            algo.reporter.close()
+        return algo, output.getvalue()
+
+    def test_quiet(self):
+        # To test if nothing is printed in quiet mode, while the logbook is still recorded
+        algo, output = self.runAlgo(verbosity=QUIET)
+        self.assertEqual(output, '')
+        self.assertEqual(len(algo.logbook), 7)
+
+    def test_progress_jsonl(self):
+        # To test if progress lines come every few generations, and every record goes to the json lines
+        with tempfile.TemporaryDirectory() as temp_dir:
+            jsonl = os.path.join(temp_dir, 'run.jsonl')
+            algo, output = self.runAlgo(verbosity=PROGRESS, report_every=3, report_jsonl=jsonl, stagnation_window=20)
+            with open(jsonl) as jsonl_file:
+                records = [json.loads(line) for line in jsonl_file]
+
+        lines = output.splitlines()
+        self.assertEqual(lines[0].split('\t')[:2], ['Generation', 'evals'])
+        self.assertEqual([line.split('\t')[0] for line in lines[1:4]], ['0', '3', '6'])
+        self.assertNotIn('best_one', lines[0].split('\t'))
+        self.assertIn('Cost required for the transportation is', output)
+
+        self.assertEqual([record['Generation'] for record in records], list(range(7)))
+        self.assertEqual(records[-1]['best_one'], algo.logbook[-1]['best_one'])
+        self.assertEqual(records[-1]['fitness_best_one'], list(algo.logbook[-1]['fitness_best_one'].values))
+        self.assertEqual(records[-1]['stop_reason'], 'num_gen')
+        self.assertEqual([record['stop_reason'] for record in records[:-1]], [''] * 6)
+
+    def test_buffered_copy(self):
+        # To test if a record changed after it was reported is written as it was, and formatted in the writer
+        reporter = Reporter(verbosity=VERBOSE, jsonl=None, buffer_size=100, flush_seconds=100)
+        logbook = tools.Logbook()
+        logbook.header = ('Generation', 'stop_reason')
+        logbook.record(Generation=0, stop_reason='')
+        reporter.generation(0, logbook)
+        logbook[-1]['stop_reason'] = 'changed'
+        output = io.StringIO()
+        with redirect_stdout(output):
+            reporter.close()
+        lines = output.getvalue().splitlines()
+        self.assertEqual(lines[0].split(), ['Generation', 'stop_reason'])
+        self.assertEqual(lines[1].split(), ['0'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,12 @@
 import unittest
 import math
 from nsga_vrp.utils import calculate_distance
-from nsga_vrp.NSGA2_vrp import load_instance, routeToSubroute, getRouteCost
+import random
+import numpy
+from nsga_vrp.generator import generateInstance
+from nsga_vrp.instance import compileInstance
+from nsga_vrp.NSGA2_vrp import load_instance, routeToSubroute, getRouteCost, eval_indvidual_fitness, \
+    eval_fitness_single_pass, eval_population_fitness
 
 
 class TestRoute(unittest.TestCase):
@@ -11,7 +16,7 @@ class TestRoute(unittest.TestCase):
 
     def test_route(self):
         # To test if the route given is being divided into correct subroutes
-        loaded_instance = load_instance('./data/json/Input_Data.json')
+        loaded_instance = compileInstance(load_instance('./data/json/Input_Data.json'))
         sample_individual = [19, 5, 24, 7, 16, 23, 22, 2, 12, 8, 20, 25, 21, 18, 11, 15, 1, 14, 17, 6, 4, 13, 10, 3, 9]
         # Route of sample_individual should be like this
         sample_individual_subroutes = [[19, 5, 24, 7], [16, 23, 22], [2, 12, 8], [20, 25, 21], [18, 11, 15], [1, 14, 17, 6, 4], [13, 10, 3, 9]]
@@ -22,7 +27,7 @@ class TestRoute(unittest.TestCase):
 
     def test_subroute_distance(self):
         # To test if for given sub route distance is being calculated correctly
-        loaded_instance = load_instance('./data/json/Input_Data.json')
+        loaded_instance = compileInstance(load_instance('./data/json/Input_Data.json'))
         sample_individual = [19, 5, 24, 7, 16, 23, 22, 2, 12, 8, 20, 25, 21, 18, 11, 15, 1, 14, 17, 6, 4, 13, 10, 3, 9]
         sample_individual_subroutes = routeToSubroute(sample_individual, loaded_instance)
         # Getting the first subroute divided by routeToSubroute
@@ -43,7 +48,7 @@ class TestRoute(unittest.TestCase):
     def test_route_distance(self):
         # To test if given route distance is being calculated correctly
         # Now to test multiple subroutes
-        loaded_instance = load_instance('./data/json/Input_Data.json')
+        loaded_instance = compileInstance(load_instance('./data/json/Input_Data.json'))
         sample_individual = [19, 5, 24, 7, 16, 23, 22, 2, 12, 8, 20, 25, 21, 18, 11, 15, 1, 14, 17, 6, 4, 13, 10, 3, 9]
         sample_individual_subroutes = routeToSubroute(sample_individual, loaded_instance)
         # Getting the first subroute divided by routeToSubroute
@@ -71,6 +76,45 @@ class TestRoute(unittest.TestCase):
         self.assertEqual(Total_manual_dist, calculated_distance)
 
 
+    def test_single_pass_fitness(self):
+        # To test if single pass fitness gives the same vehicles and cost as
+        #   splitting the route into subroutes first
+        loaded_instance = compileInstance(load_instance('./data/json/Input_Data.json'))
+        for _ in range(50):
+            individual = random.sample(range(1, 26), 25)
+            vehicles, route_cost = eval_indvidual_fitness(individual, loaded_instance, 1)
+            single_pass_vehicles, single_pass_cost = eval_fitness_single_pass(individual, loaded_instance, 1)
+            self.assertEqual(vehicles, single_pass_vehicles)
+            self.assertAlmostEqual(route_cost, single_pass_cost)
+
+    def test_population_fitness(self):
+        # To test if evaluating whole population at once gives the same fitness
+        #   as evaluating each individual on its own
+        loaded_instance = compileInstance(load_instance('./data/json/Input_Data.json'))
+        population = [random.sample(range(1, 26), 25) for _ in range(50)]
+        population_fitness = eval_population_fitness(population, loaded_instance, unit_cost=1)
+        for individual, fitness in zip(population, population_fitness):
+            vehicles, route_cost = eval_indvidual_fitness(individual, loaded_instance, 1)
+            self.assertEqual(vehicles, fitness[0])
+            self.assertAlmostEqual(route_cost, fitness[1])
+
+    def test_population_fitness_fractional_demands(self):
+        # To test if the population is cut into the same subroutes as one by one, when demands
+        #   are fractional or the capacity is not integral
+        instance = generateInstance(1000, seed=0, matrix=True)
+        integral_demands = instance.demands.copy()
+        numpy.random.seed(0)
+        population = numpy.array([numpy.random.permutation(numpy.arange(1, 1001)) for _ in range(300)])
+        for demands, vehicle_capacity in [(numpy.round(integral_demands * 0.37, 1), 100.3),
+                                          (integral_demands, 480.5)]:
+            instance.demands = demands
+            instance.vehicle_capacity = vehicle_capacity
+            population_fitness = eval_population_fitness(population, instance, unit_cost=1)
+            for individual, fitness in zip(population.tolist(), population_fitness):
+                vehicles, route_cost = eval_indvidual_fitness(individual, instance, 1)
+                self.assertEqual(vehicles, fitness[0])
+                self.assertAlmostEqual(route_cost, fitness[1])
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,62 @@
+import random
+import unittest
+import numpy
+from deap import base, creator, tools
+from nsga_vrp.selection import nonDominatedRanks, crowdingDistances, selNSGA2Fast, selNSGA2Ranked, \
+    selTournamentCrowded
+
+
+class TestSelection(unittest.TestCase):
+
+    def makePopulation(self, size, decimals):
+        if not hasattr(creator, 'SelectionIndividual'):
+            creator.create('SelectionFitness', base.Fitness, weights=(-1.0, -1.0))
+            creator.create('SelectionIndividual', list, fitness=creator.SelectionFitness)
+        population = []
+        for index in range(size):
+            individual = creator.SelectionIndividual([index])
+            individual.fitness.values = (random.randint(5, 12), round(random.uniform(100, 900), decimals))
+            population.append(individual)
+        return population
+
+    def test_ranks(self):
+        # To test if fronts are the same as deap's, with duplicate fitness values too
+        random.seed(4)
+        population = self.makePopulation(300, 0)
+        deap_ranks = {id(ind): rank for rank, front in enumerate(tools.sortNondominated(population, len(population)))
+                      for ind in front}
+        ranks = nonDominatedRanks(numpy.array([ind.fitness.values for ind in population]))
+        self.assertEqual(ranks.tolist(), [deap_ranks[id(ind)] for ind in population])
+
+    def test_select(self):
+        # To test if crowding distances and selected individuals are the same as deap's
+        random.seed(5)
+        population = self.makePopulation(300, 6)
+        deap_chosen = {id(ind) for ind in tools.selNSGA2(population, 150)}
+        values = numpy.array([ind.fitness.values for ind in population])
+        ranks = nonDominatedRanks(values)
+        distances = crowdingDistances(values, ranks)
+        for front in tools.sortNondominated(population, len(population)):
+            tools.emo.assignCrowdingDist(front)
+        self.assertEqual(distances.tolist(), [ind.fitness.crowding_dist for ind in population])
+        self.assertEqual({id(ind) for ind in selNSGA2Fast(population, 150)}, deap_chosen)
+
+    def test_tournament(self):
+        # To test if every individual plays two tournaments and the winners are never worse
+        random.seed(6)
+        population = self.makePopulation(200, 6)
+        chosen, ranks, distances = selNSGA2Ranked(population, 100)
+        self.assertEqual(ranks.tolist(), sorted(ranks.tolist()))
+        self.assertEqual(distances.tolist(), [ind.fitness.crowding_dist for ind in chosen])
+
+        rng = numpy.random.default_rng(2)
+        winners = selTournamentCrowded(ranks, distances, 100, rng)
+        self.assertEqual(len(winners), 100)
+        self.assertLessEqual(numpy.bincount(winners).max(), 2)
+        self.assertLessEqual(ranks[winners].mean(), ranks.mean())
+        with self.assertRaises(ValueError):
+            selTournamentCrowded(ranks[:98], distances[:98], 98, rng)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+import random
+from nsga_vrp.instance import compileInstance
+from nsga_vrp.split import optimalSplit, eval_fitness_optimal_split
+from nsga_vrp.NSGA2_vrp import load_instance, routeToSubroute, getRouteCost, eval_indvidual_fitness
+
+
+def bellmanSplit(individual, instance):
+    # Quadratic Bellman split over every feasible subroute, used as reference
+    size = len(individual)
+    best_cost = [0.0] + [float('inf')] * size
+    for i in range(size):
+        load, distance = 0, 0
+        for j in range(i, size):
+            load += instance.demands[individual[j]]
+            if load > instance.vehicle_capacity:
+                break
+            if j == i:
+                distance = instance.distance(0, individual[j])
+            else:
+                distance += instance.distance(individual[j - 1], individual[j])
+            best_cost[j + 1] = min(best_cost[j + 1], best_cost[i] + distance + instance.distance(individual[j], 0))
+    return best_cost[size]
+
+
+class TestSplit(unittest.TestCase):
+
+    def setUp(self):
+        self.instance = compileInstance(load_instance('./data/json/Input_Data.json'))
+
+    def test_optimal_split_cost(self):
+        # To test if linear split finds the same cost as quadratic Bellman split,
+        #   and is never worse than cutting greedily
+        for _ in range(100):
+            individual = random.sample(range(1, 26), 25)
+            starts, route_distance = optimalSplit(individual, self.instance)
+            self.assertAlmostEqual(route_distance, bellmanSplit(individual, self.instance))
+            self.assertLessEqual(route_distance, getRouteCost(individual, self.instance, 1) + 1e-9)
+            self.assertEqual(starts[0], 0)
+
+    def test_optimal_decoder(self):
+        # To test if optimal decoder subroutes respect capacity and match their fitness
+        for _ in range(20):
+            individual = random.sample(range(1, 26), 25)
+            subroutes = routeToSubroute(individual, self.instance, decoder='optimal')
+            self.assertEqual(sum(subroutes, []), individual)
+            for sub_route in subroutes:
+                self.assertLessEqual(sum(self.instance.demands[sub_route]), self.instance.vehicle_capacity)
+            vehicles, route_cost = eval_fitness_optimal_split(individual, self.instance, 1)
+            self.assertEqual(vehicles, len(subroutes))
+            self.assertAlmostEqual(route_cost, eval_indvidual_fitness(individual, self.instance, 1, decoder='optimal')[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+import random
+import unittest
+from nsga_vrp.NSGA2_vrp import nsgaAlgo
+
+
+class TestStopping(unittest.TestCase):
+
+    def runAlgo(self, **algo_kwargs):
+        random.seed(1)
+        algo = nsgaAlgo(pop_size=40, **algo_kwargs)
+        algo.generatingPopFitness()
+        algo.runGenerations()
+        return algo
+
+    def test_stagnation(self):
+        # To test if the run stops once hypervolume does not grow for the window of generations
+        algo = self.runAlgo(num_gen=500, stagnation_window=10)
+        self.assertEqual(algo.stop_reason, 'stagnation')
+        self.assertLess(len(algo.logbook), 501)
+        volumes = [record['hypervolume'] for record in algo.logbook]
+        self.assertEqual(volumes[-11:], [volumes[-11]] * 11)
+        self.assertEqual([record['stop_reason'] for record in algo.logbook[-2:]], ['', 'stagnation'])
+
+    def test_target_cost(self):
+        # To test if the run stops at the target cost, and records finishing all generations otherwise
+        algo = self.runAlgo(num_gen=300, target_cost=520)
+        self.assertEqual(algo.stop_reason, 'target_cost')
+        self.assertLessEqual(min(ind.fitness.values[1] for ind in algo.pop), 520)
+        algo = self.runAlgo(num_gen=3, target_cost=1)
+        self.assertEqual((len(algo.logbook), algo.logbook[-1]['stop_reason']), (4, 'num_gen'))
+
+
+if __name__ == '__main__':
+    unittest.main()
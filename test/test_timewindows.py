@@ -0,0 +1,62 @@
+import random
+import unittest
+import numpy
+from nsga_vrp.instance import compileInstance
+from nsga_vrp.NSGA2_vrp import load_instance, routeToSubroute, eval_population_fitness, \
+    eval_fitness_time_windows, eval_indvidual_fitness, nsgaAlgo
+
+
+class TestTimeWindows(unittest.TestCase):
+
+    def setUp(self):
+        self.instance = compileInstance(load_instance('./data/json/Input_Data.json'))
+        # Tightening the due times, so that some customers are served late
+        self.instance.due_times = self.instance.due_times / 4
+        random.seed(4)
+        self.population = numpy.array([random.sample(range(1, 26), 25) for _ in range(30)])
+
+    def checkRoute(self, individual, decoder='greedy'):
+        # Lateness walked one subroute at a time, the way a separate checker would
+        instance = self.instance
+        lateness = 0.0
+        for sub_route in routeToSubroute(individual, instance, decoder):
+            time_now = instance.ready_times[0]
+            place = 0
+            for customer in sub_route:
+                time_now = max(time_now + instance.distance(place, customer), instance.ready_times[customer])
+                lateness += max(time_now - instance.due_times[customer], 0)
+                time_now += instance.service_times[customer]
+                place = customer
+            lateness += max(time_now + instance.distance(place, 0) - instance.due_times[0], 0)
+        return lateness
+
+    def test_lateness(self):
+        # To test if batch and one by one evaluations give the checker's lateness and the usual fitness
+        batch_fitness = eval_population_fitness(self.population, self.instance, 1, time_windows=True)
+        expected_lateness = [self.checkRoute(individual) for individual in self.population]
+        self.assertGreater(max(expected_lateness), 0)
+        numpy.testing.assert_allclose(batch_fitness[:, 2], expected_lateness)
+        numpy.testing.assert_allclose(batch_fitness[:, :2], eval_population_fitness(self.population, self.instance))
+        for decoder in ('greedy', 'optimal'):
+            for individual in self.population:
+                fitness_values = eval_fitness_time_windows(individual, self.instance, 1, decoder)
+                numpy.testing.assert_allclose(fitness_values[:2],
+                                              eval_indvidual_fitness(individual, self.instance, 1, decoder))
+                self.assertAlmostEqual(fitness_values[2], self.checkRoute(individual, decoder))
+
+    def test_third_objective(self):
+        # To test if a run with time windows keeps three objectives, with batch or one by one evaluation
+        for batch_eval, tournament in ((True, 'dcd'), (False, 'crowded')):
+            random.seed(5)
+            algo = nsgaAlgo(self.instance, pop_size=40, num_gen=5, time_windows=True, batch_eval=batch_eval,
+                            tournament=tournament, local_search=2, stagnation_window=10, verbosity=0)
+            algo.generatingPopFitness()
+            algo.runGenerations()
+            for ind in algo.pop:
+                self.assertEqual(len(ind.fitness.values), 3)
+                self.assertAlmostEqual(ind.fitness.values[2], self.checkRoute(ind))
+            self.assertEqual(len(algo.logbook[-1]['min']), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import random
+import pstats
+import tempfile
+import time
+import unittest
+from nsga_vrp.NSGA2_vrp import nsgaAlgo
+from nsga_vrp.timing import PHASES, PhaseTimer, ProfileWindow
+
+
+class TestTiming(unittest.TestCase):
+
+    def runAlgo(self, **algo_kwargs):
+        random.seed(1)
+        algo = nsgaAlgo(pop_size=40, num_gen=4, verbosity=0, **algo_kwargs)
+        algo.generatingPopFitness()
+        algo.runGenerations()
+        algo.reporter.close()
+        return algo
+
+    def test_timing_columns(self):
+        # To test if every phase gets its column of seconds, along with the evaluation speed
+        algo = self.runAlgo(timing=True, cache_size=500)
+        for phase in PHASES:
+            self.assertIn(f'time_{phase}', algo.logbook.header)
+        self.assertIn('cache_hit_rate', algo.logbook.header)
+        self.assertGreater(algo.logbook[0]['time_init'], 0)
+        self.assertGreater(algo.logbook[-1]['time_evaluation'], 0)
+        self.assertGreater(algo.logbook[-1]['evals_per_sec'], 0)
+        self.assertEqual(algo.logbook[-1]['time_init'], 0)
+
+        lines = algo.timer.summary()
+        self.assertEqual(len(lines), len(PHASES) + 3)
+        self.assertTrue(lines[-1].startswith(f"{algo.timer.total_evaluations} evaluations"))
+
+    def test_counted_evaluations(self):
+        # To test if routes found in the fitness cache are not counted as evaluations
+        algo = nsgaAlgo(pop_size=40, num_gen=1, verbosity=0, timing=True, cache_size=500)
+        algo.generatingPopFitness()
+        algo.timer.takeGeneration()
+        for ind in algo.pop:
+            del ind.fitness.values
+        algo.evaluateIndividuals(algo.pop)
+        self.assertEqual(algo.timer.takeGeneration()[1], 0)
+
+    def test_nested_phases(self):
+        # To test if time spent in a phase started inside another one is only counted once,
+        #   for the inner phase
+        timer = PhaseTimer(enabled=True)
+        with timer.phase('variation'):
+            with timer.phase('evaluation'):
+                time.sleep(0.05)
+        self.assertGreaterEqual(timer.generation_times['evaluation'], 0.05)
+        self.assertLess(timer.generation_times['variation'], 0.05)
+
+    def test_delta_evaluation_timing(self):
+        # To test if delta evaluated offspring are timed and counted as evaluations, without
+        #   crossover every offspring is only mutated and so delta evaluated
+        algo = self.runAlgo(timing=True, delta_eval=True, cross_prob=0, mut_prob=0.2, cache_size=0)
+        self.assertGreater(algo.logbook[-1]['time_evaluation'], 0)
+        self.assertGreater(algo.logbook[-1]['evals_per_sec'], 0)
+
+    def test_timing_off(self):
+        # To test if nothing is timed or added to the logbook by default
+        algo = self.runAlgo()
+        self.assertNotIn('time_evaluation', algo.logbook.header)
+        self.assertEqual(sum(algo.timer.total_times.values()), 0)
+        self.assertEqual(PhaseTimer().phase('evaluation').__class__.__name__, 'nullcontext')
+
+    def test_profile_window(self):
+        # To test if both profilers write their findings once the window is over
+        with tempfile.TemporaryDirectory() as temp_dir:
+            prof_file = os.path.join(temp_dir, 'run.prof')
+            self.runAlgo(profile='cprofile', profile_window=(1, 3), profile_output=prof_file)
+            stats = pstats.Stats(prof_file)
+            self.assertTrue(any(function[2] == 'runGeneration' for function in stats.stats))
+
+            txt_file = os.path.join(temp_dir, 'run.txt')
+            self.runAlgo(profile='tracemalloc', profile_window=(2, 3), profile_output=txt_file)
+            with open(txt_file) as profile_file:
+                self.assertTrue(profile_file.readline().startswith('Peak traced memory'))
+
+        with self.assertRaises(ValueError):
+            ProfileWindow('cprofile', 2, 2, 'unused.prof')
+
+
+if __name__ == '__main__':
+    unittest.main()